@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cliente contra o simulador local do WhatsApp Web
+
+Sobe o simulador (``benchmarks/simulator``), conecta um WhatsAppClient real
+(Chrome + chromedriver) e mede:
+
+- inicialização (``connect`` até a sessão pronta, com ``startup_report``);
+- envios por segundo e idas e voltas ao chromedriver por envio (tracing);
+- latência de entrega de mensagens recebidas (página -> ``_get_new_messages``);
+- memória residente (RSS) ao longo da execução.
+
+O resultado é gravado em ``benchmarks/results/<rótulo>-<data>.json`` para
+comparação entre versões com ``benchmarks/compare.py``.
+
+Uso (com o pacote instalado, ex.: ``pip install -e .``, e Chrome disponível):
+    python benchmarks/bench_client.py [--sends 200] [--chats 10] [--inbound 100]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from simulator import SimulatorServer
+
+import pywhatsweb
+from pywhatsweb import Config, WhatsAppClient
+from pywhatsweb.tracing import CallbackExporter
+
+try:
+    import psutil  # opcional: inclui os processos do Chrome no RSS
+except ImportError:
+    psutil = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+STATM = "/proc/self/statm"
+
+
+class RSSSampler:
+    """Amostra o RSS (MB) do processo e, com psutil, dos processos filhos
+
+    Sem psutil, lê o RSS atual em /proc/self/statm (Linux); sem /proc, usa o
+    pico do processo (ru_maxrss), indicado em ``source``.
+    """
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        if psutil is not None:
+            self.source = "psutil (processo + Chrome)"
+        elif os.path.exists(STATM):
+            self.source = "/proc/self/statm (processo)"
+        else:
+            self.source = "ru_maxrss (pico do processo)"
+        self.samples = []
+        self.phase = "startup"
+        self._start = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def rss(self):
+        if psutil is None:
+            if self.source.startswith(STATM):
+                # Segundo campo: páginas residentes
+                with open(STATM) as f:
+                    pages = int(f.read().split()[1])
+                return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+            import resource
+
+            # Pico do próprio processo (KB; bytes no macOS)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.samples.append(
+                (
+                    round(time.monotonic() - self._start, 2),
+                    self.phase,
+                    round(self.rss(), 1),
+                )
+            )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values, fraction):
+    """Percentil por interpolação simples (lista não vazia)"""
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * fraction
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def git_revision():
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                timeout=5,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def bench_startup(client):
+    start = time.perf_counter()
+    client.connect()
+    if not client.is_connected:
+        raise RuntimeError("O simulador deveria iniciar autenticado (caminho warm)")
+    return {
+        "total_s": time.perf_counter() - start,
+        "report": dict(client.startup_report),
+    }
+
+
+def bench_sends(client, spans, sends, chats):
+    phones = [f"55119{index:08d}" for index in range(chats)]
+    sent_before = client.driver.execute_script("return window.__sim.stats().sent")
+    del spans[:]
+
+    start = time.perf_counter()
+    for index in range(sends):
+        client.send_message(phones[index % chats], f"mensagem {index}")
+    elapsed = time.perf_counter() - start
+
+    # Reabrir o chat recarrega a página: o contador do simulador fica no localStorage
+    delivered = (
+        client.driver.execute_script("return window.__sim.stats().sent") - sent_before
+    )
+    # Totais inclusivos: o open_chat (e o deep link) conta no envio
+    round_trips = [
+        span.total_round_trips for span in spans if span.name == "send_message"
+    ]
+    return {
+        "count": sends,
+        "chats": chats,
+        "delivered": delivered,
+        "elapsed_s": elapsed,
+        "per_sec": sends / elapsed,
+        "round_trips": {
+            "mean": statistics.mean(round_trips),
+            "min": min(round_trips),
+            "max": max(round_trips),
+            # primeiro envio a cada chat (deep link) x envios seguintes
+            "first": statistics.mean(round_trips[:chats]),
+            "steady": statistics.mean(round_trips[chats:]) if sends > chats else None,
+        },
+    }
+
+
+def bench_inbound(client, count, interval_ms, timeout=60):
+    client.send_message("5511999990000", "abrindo chat")
+    client._get_new_messages()  # reinstala o observer após a navegação
+    client.driver.execute_script(
+        "window.__sim.schedule(arguments[0], arguments[1], null)", count, interval_ms
+    )
+
+    latencies = []
+    deadline = time.monotonic() + timeout
+    while len(latencies) < count and time.monotonic() < deadline:
+        for message in client._get_new_messages():
+            received_ms = time.time() * 1000
+            parts = message.content.split()
+            if len(parts) == 3 and parts[0] == "bench":
+                latencies.append(received_ms - float(parts[2]))
+
+    if not latencies:
+        raise RuntimeError("Nenhuma mensagem recebida do simulador")
+    return {
+        "count": count,
+        "received": len(latencies),
+        "interval_ms": interval_ms,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "max": max(latencies),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sends", type=int, default=200)
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--inbound", type=int, default=100)
+    parser.add_argument(
+        "--interval", type=int, default=20, help="intervalo entre recebidas (ms)"
+    )
+    parser.add_argument("--navigation", default="search", choices=["search", "reload"])
+    parser.add_argument("--show", action="store_true", help="não usar modo headless")
+    parser.add_argument(
+        "--label", default=pywhatsweb.__version__, help="rótulo do resultado"
+    )
+    parser.add_argument("--output", default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    spans = []
+    sampler = RSSSampler().start()
+    with SimulatorServer() as server, tempfile.TemporaryDirectory() as profile:
+        config = Config(
+            base_url=server.url,
+            headless=not args.show,
+            user_data_dir=profile,
+            chrome_options=["--no-sandbox", "--disable-dev-shm-usage"],
+            navigation_mode=args.navigation,
+            qr_output="none",
+            receive_interval=0.5,
+            dispatch_workers=0,
+            trace=True,
+            log_level="WARNING",
+        )
+        client = WhatsAppClient(config)
+        client.tracer.add_exporter(CallbackExporter(spans.append))
+        try:
+            startup = bench_startup(client)
+            sampler.phase = "sends"
+            sends = bench_sends(client, spans, args.sends, args.chats)
+            sampler.phase = "inbound"
+            inbound = bench_inbound(client, args.inbound, args.interval)
+        finally:
+            client.disconnect()
+            sampler.stop()
+
+    result = {
+        "label": args.label,
+        "version": pywhatsweb.__version__,
+        "git": git_revision(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "navigation_mode": args.navigation,
+        "startup": startup,
+        "sends": sends,
+        "inbound": inbound,
+        "rss_mb": {
+            "source": sampler.source,
+            "peak": max((sample[2] for sample in sampler.samples), default=None),
+            "samples": sampler.samples,
+        },
+        "spans": client.tracer.summary(),
+    }
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(
+        args.output, f"{args.label}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(
+        f"inicialização:      {startup['total_s']:.2f} s ({startup['report'].get('path')})"
+    )
+    print(
+        f"envios:             {sends['per_sec']:.1f}/s ({sends['delivered']}/{sends['count']} entregues)"
+    )
+    print(f"idas e voltas:      {sends['round_trips']['mean']:.1f} por envio")
+    print(
+        f"latência recebidas: p50 {inbound['latency_ms']['p50']:.0f} ms, p95 {inbound['latency_ms']['p95']:.0f} ms"
+    )
+    print(f"RSS pico:           {result['rss_mb']['peak']} MB")
+    print(f"resultado:          {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
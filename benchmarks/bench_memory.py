@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória: bytes por mensagem recebida mantida em memória
+
+Compara Message (dataclass, Contacts próprios, metadata sempre alocado) com
+CompactMessage (__slots__, Contacts compartilhados pela ContactTable,
+metadata sob demanda).
+
+Uso (com o pacote instalado, ex.: ``pip install -e .``):
+    python benchmarks/bench_memory.py [quantidade] [remetentes]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime
+
+from pywhatsweb.models import CompactMessage, Contact, ContactTable, Message
+
+
+def build_messages(count, senders):
+    """Mensagens como eram criadas antes: Contacts novos por mensagem"""
+    own = "5511900000000"
+    return [
+        Message(
+            id=f"false_55119{i % senders:08d}@c.us_{i:016X}",
+            content="ok",
+            sender=Contact(phone=f"55119{i % senders:08d}"),
+            recipient=Contact(phone=own),
+            timestamp=datetime(2026, 10, 18, 10, 15),
+        )
+        for i in range(count)
+    ]
+
+
+def build_compact(count, senders):
+    """Mensagens compactas com Contacts compartilhados"""
+    table = ContactTable()
+    own = table.get("5511900000000@c.us")
+    messages = [
+        CompactMessage(
+            id=f"false_55119{i % senders:08d}@c.us_{i:016X}",
+            content="ok",
+            sender=table.get(f"55119{i % senders:08d}@c.us"),
+            recipient=own,
+            timestamp=datetime(2026, 10, 18, 10, 15),
+        )
+        for i in range(count)
+    ]
+    return messages, table
+
+
+def measure(builder, count, senders):
+    """Bytes alocados e mantidos por mensagem"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = builder(count, senders)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return total / count
+
+
+def main():
+    """Executa o benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    senders = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    baseline = measure(build_messages, count, senders)
+    compact = measure(build_compact, count, senders)
+
+    print(f"{count} mensagens, {senders} remetentes")
+    print(f"Message:        {baseline:8.1f} bytes/mensagem")
+    print(f"CompactMessage: {compact:8.1f} bytes/mensagem")
+    print(f"Redução:        {100 * (1 - compact / baseline):8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
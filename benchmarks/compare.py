@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compara dois resultados de ``bench_client.py``
+
+Mostra cada métrica lado a lado com a variação percentual e marca como
+regressão as pioras acima do limite (``--threshold``, em %).
+
+Uso:
+    python benchmarks/compare.py results/antes.json results/depois.json [--threshold 10] [--fail]
+"""
+
+import argparse
+import json
+import sys
+
+# nome -> (caminho no JSON, maior é melhor)
+METRICS = {
+    "inicialização (s)": (("startup", "total_s"), False),
+    "envios/s": (("sends", "per_sec"), True),
+    "idas e voltas/envio": (("sends", "round_trips", "mean"), False),
+    "idas e voltas/envio (chat aberto)": (("sends", "round_trips", "steady"), False),
+    "latência recebidas p50 (ms)": (("inbound", "latency_ms", "p50"), False),
+    "latência recebidas p95 (ms)": (("inbound", "latency_ms", "p95"), False),
+    "RSS pico (MB)": (("rss_mb", "peak"), False),
+}
+
+
+def lookup(result, path):
+    value = result
+    for key in path:
+        if not isinstance(value, dict) or value.get(key) is None:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(before, after, threshold):
+    """Linhas (métrica, antes, depois, variação %, regressão)"""
+    rows = []
+    for name, (path, higher_is_better) in METRICS.items():
+        old, new = lookup(before, path), lookup(after, path)
+        if old is None or new is None:
+            rows.append((name, old, new, None, False))
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        worse = -change if higher_is_better else change
+        rows.append((name, old, new, change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    parser.add_argument(
+        "--fail", action="store_true", help="código de saída 1 se houver regressão"
+    )
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    print(
+        f"{'':36} {before.get('label', 'antes'):>12} {after.get('label', 'depois'):>12} {'variação':>10}"
+    )
+    rows = compare(before, after, args.threshold)
+    for name, old, new, change, regression in rows:
+        old_text = "-" if old is None else f"{old:.2f}"
+        new_text = "-" if new is None else f"{new:.2f}"
+        change_text = "" if change is None else f"{change:+.1f}%"
+        flag = "  REGRESSÃO" if regression else ""
+        print(f"{name:36} {old_text:>12} {new_text:>12} {change_text:>10}{flag}")
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"\n{regressions} regressão(ões) acima de {args.threshold:g}%")
+    return 1 if regressions and args.fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Servidor local do simulador do WhatsApp Web
+
+Serve ``benchmarks/simulator/`` e responde qualquer outro caminho (ex.: o deep
+link ``/send?phone=...``) com a página do simulador. Use com
+``Config(base_url=server.url)``.
+
+Uso (servidor avulso, para inspecionar a página no navegador):
+    python benchmarks/simulator.py [porta]
+"""
+
+import os
+import sys
+import threading
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "simulator")
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Arquivos estáticos; caminhos desconhecidos recebem o index.html"""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.path = "/index.html"
+        return super().send_head()
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class SimulatorServer:
+    """Servidor HTTP do simulador em uma thread de fundo"""
+
+    def __init__(self, port=0, host="127.0.0.1"):
+        self._server = _ThreadingHTTPServer(
+            (host, port), partial(_Handler, directory=STATIC_DIR)
+        )
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with SimulatorServer(port) as server:
+        print(f"Simulador em {server.url} (Ctrl+C para sair)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,259 @@
+/*
+ * Simulador do WhatsApp Web para os benchmarks do PyWhatsWeb
+ *
+ * Reproduz apenas os elementos (data-testid, data-id, data-icon...) que o
+ * cliente usa: lista de chats, busca, chat aberto, campo de texto, envio,
+ * anexo com prévia e indicador de upload, e o QR Code. O estado fica no
+ * localStorage para sobreviver à navegação por deep link (/send?phone=...).
+ *
+ * Controle pelo benchmark (execute_script): window.__sim.receive,
+ * schedule, stats, configure, logout e scan.
+ */
+(function () {
+    'use strict';
+
+    var OWN = '5511900000000';
+    var store = window.localStorage;
+    var chats = JSON.parse(store.getItem('sim-chats') || '{}');  // jid -> {name, unread, preview}
+    var options = {uploadMs: 300, qrRotateMs: 20000};
+    var counters = JSON.parse(store.getItem('sim-counters') || '{"sent": 0, "received": 0}');
+    var seq = 0;
+    var current = null;
+
+    var app = document.getElementById('app');
+    var list, main, messages, footer;
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (name) { node.setAttribute(name, attrs[name]); });
+        if (typeof children === 'string') {
+            node.textContent = children;
+        } else {
+            (children || []).forEach(function (child) { node.appendChild(child); });
+        }
+        return node;
+    }
+
+    function nextKey() {
+        seq += 1;
+        return '3EB0' + Date.now().toString(16).toUpperCase() + seq;
+    }
+
+    function pad(value) { return value < 10 ? '0' + value : String(value); }
+
+    function prePlain(name) {
+        var now = new Date();
+        return '[' + now.getHours() + ':' + pad(now.getMinutes()) + ', ' + pad(now.getDate()) + '/' +
+            pad(now.getMonth() + 1) + '/' + now.getFullYear() + '] ' + name + ': ';
+    }
+
+    function bubble(id, name, text, outgoing) {
+        return el('div', {'data-id': id, 'class': outgoing ? 'message-out' : 'message-in'}, [
+            el('div', {'class': 'copyable-text', 'data-pre-plain-text': prePlain(name)}, [
+                el('span', {'class': 'selectable-text'}, text)
+            ])
+        ]);
+    }
+
+    function saveChats() {
+        store.setItem('sim-chats', JSON.stringify(chats));
+        store.setItem('sim-counters', JSON.stringify(counters));
+    }
+
+    function ensureChat(phone) {
+        var jid = phone + '@c.us';
+        if (!chats[jid]) {
+            chats[jid] = {name: 'Contato ' + phone.slice(-4), unread: 0, preview: ''};
+            saveChats();
+        }
+        return jid;
+    }
+
+    // Lista de chats
+
+    function chatRow(jid) {
+        var chat = chats[jid];
+        var row = el('div', {'data-testid': 'cell-frame-container'}, [
+            el('span', {'data-id': 'false_' + jid + '_ROW', hidden: ''}),
+            el('span', {title: chat.name}, chat.name),
+            el('div', {'data-testid': 'cell-frame-secondary'}, [
+                el('span', {title: chat.preview}, chat.preview)
+            ])
+        ]);
+        if (chat.unread) {
+            row.appendChild(el('span', {'data-testid': 'icon-unread-count'}, String(chat.unread)));
+        }
+        row.addEventListener('click', function () { openChat(jid.split('@')[0]); });
+        return row;
+    }
+
+    function renderChatList() {
+        list.textContent = '';
+        Object.keys(chats).forEach(function (jid) { list.appendChild(chatRow(jid)); });
+    }
+
+    // Chat aberto
+
+    function appendOutgoing(text, upload) {
+        counters.sent += 1;
+        var node = bubble('true_' + current + '_' + nextKey(), 'Eu', text, true);
+        if (upload) {
+            var pending = el('span', {'data-icon': 'msg-time'});
+            node.appendChild(pending);
+            setTimeout(function () { pending.remove(); }, options.uploadMs);
+        }
+        messages.appendChild(node);
+        chats[current].preview = text;
+        saveChats();
+        renderChatList();
+    }
+
+    function sendText(composer) {
+        var text = composer.innerText.trim();
+        if (!text) { return; }
+        composer.textContent = '';
+        appendOutgoing(text, false);
+    }
+
+    function showPreview(input) {
+        var file = input.files[0];
+        if (!file) { return; }
+        var caption = el('div', {contenteditable: 'true', 'data-testid': 'media-caption'});
+        var send = el('div', {'data-testid': 'send', role: 'button'}, [el('span', {'data-icon': 'send'})]);
+        var preview = el('div', {id: 'preview'}, [el('span', {}, file.name), caption, send]);
+        send.addEventListener('click', function () {
+            var text = caption.innerText.trim() || file.name;
+            preview.remove();
+            input.remove();
+            footer.style.display = '';
+            appendOutgoing(text, true);
+        });
+        footer.style.display = 'none';
+        main.appendChild(preview);
+    }
+
+    function attachFile() {
+        // O input é recriado a cada anexo, como no WhatsApp Web
+        var old = footer.querySelector('input[type="file"]');
+        if (old) { old.remove(); }
+        var input = el('input', {type: 'file'});
+        input.addEventListener('change', function () { showPreview(input); });
+        footer.appendChild(input);
+    }
+
+    function openChat(phone) {
+        var jid = ensureChat(phone);
+        current = jid;
+        chats[jid].unread = 0;
+        saveChats();
+
+        messages = el('div', {id: 'messages'});
+        // Mensagem já existente do chat (enviada: o observer do cliente ignora)
+        messages.appendChild(bubble('true_' + jid + '_' + nextKey(), 'Eu', 'Conversa com ' + phone, true));
+
+        var composer = el('div', {
+            contenteditable: 'true', 'data-tab': '10', 'data-testid': 'conversation-compose-box-input'
+        });
+        composer.addEventListener('keydown', function (event) {
+            if (event.key === 'Enter') { event.preventDefault(); sendText(composer); }
+        });
+        var send = el('button', {'data-testid': 'send', 'aria-label': 'Send'}, [el('span', {'data-icon': 'send'})]);
+        send.addEventListener('click', function () { sendText(composer); });
+        var attach = el('span', {'data-testid': 'attach-button', 'data-icon': 'clip', role: 'button'}, '+');
+        attach.addEventListener('click', attachFile);
+        footer = el('footer', {}, [attach, composer, send]);
+
+        main.textContent = '';
+        main.appendChild(el('header', {}, [el('span', {title: chats[jid].name}, chats[jid].name)]));
+        main.appendChild(messages);
+        main.appendChild(footer);
+        renderChatList();
+    }
+
+    // Telas
+
+    function renderApp() {
+        store.setItem('last-wid-md', '"' + OWN + ':1@c.us"');
+        app.textContent = '';
+        app.style.cssText = 'display: flex; flex: 1;';
+
+        var search = el('div', {contenteditable: 'true', 'data-tab': '3', 'data-testid': 'chat-list-search'});
+        search.addEventListener('keydown', function (event) {
+            if (event.key !== 'Enter') { return; }
+            event.preventDefault();
+            var phone = search.innerText.replace(/\D/g, '');
+            search.textContent = '';
+            if (phone) { openChat(phone); }
+        });
+        list = el('div', {'data-testid': 'chat-list', role: 'grid'});
+        main = el('div', {id: 'main'});
+        app.appendChild(el('div', {id: 'side'}, [search, el('div', {id: 'pane-side'}, [list])]));
+        app.appendChild(main);
+        renderChatList();
+
+        var phone = new URLSearchParams(window.location.search).get('phone');
+        if (phone) { openChat(phone.replace(/\D/g, '')); }
+    }
+
+    function renderQR() {
+        app.textContent = '';
+        var holder = el('div', {id: 'qr', 'data-ref': '2@' + nextKey()}, [el('canvas', {width: 264, height: 264})]);
+        app.appendChild(holder);
+        var timer = setInterval(function () {
+            if (!holder.isConnected) { clearInterval(timer); return; }
+            holder.setAttribute('data-ref', '2@' + nextKey());
+        }, options.qrRotateMs);
+    }
+
+    // Controle pelo benchmark
+
+    function receive(phone, text) {
+        var jid = phone ? ensureChat(phone) : current;
+        if (!jid) { return false; }
+        counters.received += 1;
+        if (jid === current) {
+            messages.appendChild(bubble('false_' + jid + '_' + nextKey(), chats[jid].name, text, false));
+        } else {
+            chats[jid].unread += 1;
+        }
+        chats[jid].preview = text;
+        saveChats();
+        renderChatList();
+        return true;
+    }
+
+    window.__sim = {
+        receive: receive,
+        // Mensagens "bench <n> <epoch_ms>" a cada intervalMs (no chat aberto se phone for null)
+        schedule: function (count, intervalMs, phone) {
+            var sentCount = 0;
+            var timer = setInterval(function () {
+                sentCount += 1;
+                receive(phone, 'bench ' + sentCount + ' ' + Date.now());
+                if (sentCount >= count) { clearInterval(timer); }
+            }, intervalMs);
+        },
+        stats: function () {
+            return {sent: counters.sent, received: counters.received, current: current,
+                    chats: Object.keys(chats).length};
+        },
+        configure: function (values) {
+            Object.keys(values).forEach(function (name) { options[name] = values[name]; });
+        },
+        logout: function () {
+            store.setItem('sim-logged-out', '1');
+            store.removeItem('last-wid-md');
+            window.location.assign('/');
+        },
+        scan: function () {
+            store.removeItem('sim-logged-out');
+            renderApp();
+        }
+    };
+
+    if (store.getItem('sim-logged-out') === '1') {
+        renderQR();
+    } else {
+        renderApp();
+    }
+}());
@@ -32,11 +32,12 @@ def main():
         print("📱 Conectando ao WhatsApp Web...")
         client.connect()
         
-        # Aguardar QR Code
-        print("🔍 Aguardando QR Code...")
-        qr_code = client.wait_for_qr()
-        print(f"📋 QR Code gerado: {qr_code[:20]}...")
-        print("📱 Escaneie o QR Code com seu WhatsApp!")
+        # Aguardar QR Code (perfis já autenticados conectam direto)
+        if not client.is_connected:
+            print("🔍 Aguardando QR Code...")
+            qr_code = client.wait_for_qr()
+            print(f"📋 QR Code gerado: {qr_code[:20]}...")
+            print("📱 Escaneie o QR Code com seu WhatsApp!")
         
         # Aguardar conexão
         print("⏳ Aguardando conexão...")
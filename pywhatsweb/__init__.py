@@ -9,18 +9,61 @@
 __author__ = "TI Léo Team"
 __email__ = "ti.leo@example.com"
 
-from .client import WhatsAppClient
+from typing import TYPE_CHECKING, Any, List
+
+# Leves: não dependem do Selenium
 from .config import Config
-from .models import Message, Contact, Group, MediaMessage
+from .models import Message, CompactMessage, Contact, Group, MediaMessage, SendResult
 from .exceptions import WhatsAppError, ConnectionError, MessageError
 
+# Carregados sob demanda (PEP 562): o cliente traz Selenium e dependências
+_LAZY = {
+    "WhatsAppClient": ".client",
+    "AsyncWhatsAppClient": ".async_client",
+    "ClientPool": ".pool",
+    "OutboundScheduler": ".scheduler",
+    "Priority": ".scheduler",
+    "Outbox": ".outbox",
+}
+
+if TYPE_CHECKING:
+    from .client import WhatsAppClient
+    from .async_client import AsyncWhatsAppClient
+    from .pool import ClientPool
+    from .scheduler import OutboundScheduler, Priority
+    from .outbox import Outbox
+
+
+def __getattr__(name: str) -> Any:
+    """Importa os atributos pesados no primeiro acesso"""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
 __all__ = [
     "WhatsAppClient",
+    "AsyncWhatsAppClient",
+    "ClientPool",
+    "OutboundScheduler",
+    "Priority",
+    "Outbox",
     "Config", 
     "Message",
+    "CompactMessage",
     "Contact",
     "Group",
     "MediaMessage",
+    "SendResult",
     "WhatsAppError",
     "ConnectionError",
     "MessageError",
@@ -0,0 +1,170 @@
+"""
+Cliente assíncrono (asyncio) para o PyWhatsWeb
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from .client import BatchItem, WhatsAppClient
+from .config import Config
+from .exceptions import ConnectionError, TimeoutError
+from .models import MediaMessage, Message, SendResult
+
+MessageHandler = Callable[[Message], Union[None, Awaitable[None]]]
+
+
+class AsyncWhatsAppClient:
+    """Cliente assíncrono que expõe o WhatsAppClient como corrotinas
+
+    Todo acesso ao driver de uma sessão passa por uma única thread dedicada,
+    então os comandos do Selenium são serializados sem bloquear o event loop.
+    As esperas são feitas com ``asyncio.sleep`` entre verificações curtas.
+    """
+
+    def __init__(
+        self, config: Optional[Config] = None, client: Optional[WhatsAppClient] = None
+    ):
+        """Inicializa o cliente assíncrono"""
+        self.client = client or WhatsAppClient(config=config)
+        self.config = self.client.config
+        self.on_message: Optional[MessageHandler] = None
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pywhatsweb"
+        )
+
+    @property
+    def is_connected(self) -> bool:
+        """Status da conexão"""
+        return self.client.is_connected
+
+    @property
+    def qr_code(self) -> Optional[str]:
+        """QR Code atual (se disponível)"""
+        return self.client.qr_code
+
+    @property
+    def phone_number(self) -> Optional[str]:
+        """Número do WhatsApp conectado"""
+        return self.client.phone_number
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Executa uma chamada síncrona na thread da sessão"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def connect(self) -> None:
+        """Conecta ao WhatsApp Web"""
+        await self._call(self.client.connect)
+
+    async def wait_for_qr(self, timeout: Optional[int] = None) -> str:
+        """Aguarda e retorna o QR Code"""
+        if not self.client.driver:
+            raise ConnectionError("Driver não inicializado")
+
+        if self.client.is_connected:
+            return self.client.qr_code or ""
+
+        timeout = timeout or self.config.qr_timeout
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            qr_data = await self._call(self.client._poll_qr)
+            if qr_data:
+                await self._call(self.client._handle_qr, qr_data)
+                return qr_data
+            await asyncio.sleep(self.config.poll_interval)
+
+        raise TimeoutError("Timeout aguardando QR Code")
+
+    async def wait_for_connection(self, timeout: Optional[int] = None) -> bool:
+        """Aguarda a conexão ser estabelecida"""
+        if not self.client.driver:
+            raise ConnectionError("Driver não inicializado")
+
+        if self.client.is_connected:
+            return True
+
+        timeout = timeout or self.config.wait_timeout
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            if await self._call(self.client._check_connection):
+                await self._call(self.client._mark_connected)
+                return True
+            await asyncio.sleep(self.config.poll_interval)
+
+        raise TimeoutError("Timeout aguardando conexão")
+
+    async def send_message(self, phone: str, text: str) -> bool:
+        """Envia mensagem de texto"""
+        return await self._call(self.client.send_message, phone, text)
+
+    async def send_media(
+        self, phone: str, file_path: Union[str, MediaMessage], caption: str = ""
+    ) -> bool:
+        """Envia arquivo de mídia (caminho ou MediaMessage já preparado)"""
+        return await self._call(self.client.send_media, phone, file_path, caption)
+
+    async def prepare_media(
+        self, media: Union[str, MediaMessage], caption: Optional[str] = None
+    ) -> MediaMessage:
+        """Prepara uma mídia para envio (reduz imagens; reutiliza o cache)"""
+        future = await self._call(self.client.prepare_media, media, caption)
+        return await asyncio.wrap_future(future)
+
+    async def send_messages(self, batch: Iterable[BatchItem]) -> List[SendResult]:
+        """Envia mensagens em lote, abrindo cada chat uma única vez"""
+        return await self._call(self.client.send_messages, list(batch))
+
+    async def messages(self) -> AsyncIterator[Message]:
+        """Itera sobre as mensagens recebidas enquanto conectado"""
+        if not self.client.is_connected:
+            raise ConnectionError("Cliente não está conectado")
+
+        while self.client.is_connected:
+            # Leitura sem espera do buffer da página; o intervalo entre leituras
+            # fica no event loop para não ocupar a thread da sessão (envios)
+            batch = await self._call(self.client._get_new_messages, 0)
+            for message in batch:
+                yield message
+            if not batch:
+                await asyncio.sleep(self.config.poll_interval)
+
+    async def wait_forever(self) -> None:
+        """Mantém a conexão ativa e entrega mensagens ao on_message"""
+        async for message in self.messages():
+            if self.on_message:
+                result = self.on_message(message)
+                if inspect.isawaitable(result):
+                    await result
+
+    async def disconnect(self) -> None:
+        """Desconecta, fecha o navegador e libera a thread da sessão"""
+        try:
+            await self._call(self.client.disconnect)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncWhatsAppClient":
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit"""
+        await self.disconnect()
@@ -8,7 +8,7 @@
 import time
 from typing import Optional
 
-from . import WhatsAppClient, Config
+from .config import Config
 
 
 def main():
@@ -64,6 +64,13 @@ def main():
         help="Apenas gerar QR Code e sair"
     )
     
+    parser.add_argument(
+        "--qr-output",
+        choices=["terminal", "file", "png", "none"],
+        default="terminal",
+        help="Saída do QR Code (padrão: terminal)"
+    )
+    
     parser.add_argument(
         "--version",
         action="version",
@@ -77,12 +84,16 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    # Importado só depois dos argumentos: --help não carrega o Selenium
+    from .client import WhatsAppClient
+    
     try:
         # Configurar cliente
         config = Config(
             headless=args.headless,
             timeout=args.timeout,
-            debug=args.debug
+            debug=args.debug,
+            qr_output=args.qr_output
         )
         
         client = WhatsAppClient(config=config)
@@ -91,11 +102,12 @@ def main():
         print("📱 Conectando ao WhatsApp Web...")
         client.connect()
         
-        # Aguardar QR Code
-        print("🔍 Aguardando QR Code...")
-        qr_code = client.wait_for_qr()
-        print(f"📋 QR Code gerado: {qr_code[:20]}...")
-        print("📱 Escaneie o QR Code com seu WhatsApp!")
+        # Aguardar QR Code (perfis já autenticados conectam direto)
+        if not client.is_connected:
+            print("🔍 Aguardando QR Code...")
+            qr_code = client.wait_for_qr()
+            print(f"📋 QR Code gerado: {qr_code[:20]}...")
+            print("📱 Escaneie o QR Code com seu WhatsApp!")
         
         # Aguardar conexão
         print("⏳ Aguardando conexão...")
@@ -125,7 +137,7 @@ def on_message(msg):
             
             elif args.qr_only:
                 print("✅ QR Code gerado com sucesso!")
-                print(f"🔑 Código: {qr_code}")
+                print(f"🔑 Código: {client.qr_code}")
         
         else:
             print("❌ Falha na conexão")
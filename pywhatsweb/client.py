@@ -2,38 +2,84 @@
 Cliente principal do PyWhatsWeb
 """
 
+import os
+import threading
 import time
 import logging
-import qrcode
-from typing import Optional, Callable, List, Union
+from concurrent.futures import Future
+from collections import OrderedDict
+from typing import Any, Optional, Callable, Dict, Iterable, List, Tuple, Union
 from selenium import webdriver
-from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
 
 from .config import Config
-from .models import Message, Contact, Group, MediaMessage, MessageType, Location
+from .driver import resolve_driver
+from . import extraction, phones, readiness, scripts
+from .readiness import ReadinessWaiter
+from .selector_registry import SelectorRegistry, CHAT, PAGE
+from .dispatcher import MessageDispatcher
+from .dedup import SeenSet
+from .store import MessageStore
+from .media import MediaPipeline
+from .download import DOWNLOADABLE, MediaDownloader
+from .metrics import Metrics, MetricsServer, NullMetrics, timed
+from .tracing import Exporter, JsonLinesExporter, NullTracer, Tracer
+from .qr import QRRenderer, QRWatcher
+from .models import (
+    Message, Contact, Chat, Group, MediaMessage, MessageType, MessageStatus, SendResult
+)
 from .exceptions import (
     ConnectionError, AuthenticationError, MessageError, 
     TimeoutError, ElementNotFoundError, InvalidPhoneError
 )
 
 
+# Item de envio em lote: (telefone, texto ou mídia)
+BatchItem = Tuple[str, Union[str, MediaMessage]]
+
+
 class WhatsAppClient:
     """Cliente principal para automação do WhatsApp Web"""
     
     def __init__(self, config: Optional[Config] = None):
         """Inicializa o cliente"""
         self.config = config or Config.from_env()
+        self._metrics = Metrics() if self.config.metrics_enabled else NullMetrics()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.tracer: Union[Tracer, NullTracer] = NullTracer()
+        if self.config.trace:
+            exporters: List[Exporter] = []
+            if self.config.trace_file:
+                exporters.append(JsonLinesExporter(self.config.trace_file))
+            self.tracer = Tracer(exporters)
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
+        self.waiter: Optional[ReadinessWaiter] = None
+        self.selectors: Optional[SelectorRegistry] = None
+        self.dispatcher: Optional[MessageDispatcher] = None
         self.is_connected = False
         self.phone_number: Optional[str] = None
         self.qr_code: Optional[str] = None
+        self.qr_watcher = QRWatcher(QRRenderer.from_config(self.config))
+        self._next_qr_check = 0.0
+        self.startup_report: Dict[str, Any] = {}
+        self.seen = SeenSet(self.config.seen_capacity)
+        self.store: Optional[MessageStore] = None
+        self._open_store()
+        self._media_pipeline: Optional[MediaPipeline] = None
+        self._downloader: Optional[MediaDownloader] = None
+        
+        # Serializa o driver entre o laço de recepção, os downloads de mídia e os
+        # envios (handlers de on_message rodam em várias threads do despacho)
+        self._driver_lock = threading.RLock()
+        
+        # Cache de chats já abertos nesta sessão (LRU) e chat atual
+        self._known_chats: "OrderedDict[str, None]" = OrderedDict()
+        self._current_chat: Optional[str] = None
         
         # Callbacks de eventos
         self.on_message: Optional[Callable[[Message], None]] = None
@@ -41,17 +87,32 @@ def __init__(self, config: Optional[Config] = None):
         self.on_disconnection: Optional[Callable[[], None]] = None
         self.on_qr: Optional[Callable[[str], None]] = None
         self.on_ready: Optional[Callable[[], None]] = None
+        self.on_chat_update: Optional[Callable[[Chat], None]] = None
+        self.on_media: Optional[Callable[[Message], None]] = None
+        
+        # Estado da lista de chats (JID -> Chat), atualizado a cada dreno
+        self.chats: Dict[str, Chat] = {}
         
         # Configurar logging
         logging.basicConfig(level=getattr(logging, self.config.log_level))
         self.logger = logging.getLogger(__name__)
         
-        # URLs
-        self.whatsapp_url = "https://web.whatsapp.com/"
-        self.api_url = "https://web.whatsapp.com/api/"
+        # URLs (base_url permite apontar para um simulador local)
+        self.whatsapp_url = self.config.base_url.rstrip("/") + "/"
+        self.api_url = f"{self.whatsapp_url}api/"
     
+    @timed("connect")
     def connect(self) -> None:
-        """Conecta ao WhatsApp Web"""
+        """Conecta ao WhatsApp Web
+        
+        Com ``warm_start`` ativo, aguarda a página decidir entre a lista de
+        chats (perfil já autenticado) e o QR Code. No primeiro caso a sessão
+        fica pronta aqui mesmo, sem passar por ``wait_for_qr``. O caminho
+        tomado e os tempos ficam em ``startup_report``.
+        """
+        start = time.monotonic()
+        self._open_store()
+        self._start_metrics_server()
         try:
             self.logger.info("Iniciando conexão com WhatsApp Web...")
             
@@ -59,58 +120,90 @@ def connect(self) -> None:
             chrome_options = Options()
             for option in self.config.get_chrome_options():
                 chrome_options.add_argument(option)
+            # Mesmo binário usado para escolher o chromedriver em cache
+            if self.config.chrome_binary:
+                chrome_options.binary_location = self.config.chrome_binary
             
             # Inicializar driver
-            service = Service(ChromeDriverManager().install())
+            resolution = resolve_driver(self.config)
+            self.logger.info(
+                f"chromedriver ({resolution.source}) "
+                f"resolvido em {resolution.elapsed:.2f}s"
+            )
+            service = Service(resolution.path)
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.tracer.install(self.driver)
             self.driver.get(self.whatsapp_url)
             
             # Configurar wait
             self.wait = WebDriverWait(self.driver, self.config.timeout)
-            
+            self.waiter = ReadinessWaiter(
+                self.driver,
+                poll_interval=self.config.poll_interval,
+                report=self.config.report_waits,
+                logger=self.logger,
+            )
+            self.selectors = SelectorRegistry(self.driver)
+            
+            self.startup_report = {
+                "path": None,
+                "driver_source": resolution.source,
+                "chrome_version": resolution.chrome_version,
+                "driver": resolution.elapsed,
+                "browser": time.monotonic() - start,
+            }
             self.logger.info("Navegador iniciado com sucesso")
             
         except Exception as e:
             self.logger.error(f"Erro ao conectar: {e}")
             raise ConnectionError(f"Falha ao conectar: {e}")
+        
+        if self.config.warm_start:
+            self._detect_session()
+        
+        self.startup_report["total"] = time.monotonic() - start
+        self.logger.info(
+            f"Inicialização pelo caminho '{self.startup_report['path']}' "
+            f"em {self.startup_report['total']:.2f}s"
+        )
+    
+    def _detect_session(self) -> None:
+        """Disputa lista de chats x QR Code para saber se o perfil está autenticado"""
+        start = time.monotonic()
+        try:
+            state = self.waiter.until(
+                readiness.session_state, "session_state", self.config.wait_timeout
+            )
+        except TimeoutException:
+            self.logger.warning("Não foi possível detectar o estado da sessão")
+            return
+        finally:
+            self.startup_report["session"] = time.monotonic() - start
+        
+        if state == readiness.SESSION_AUTHENTICATED:
+            self.startup_report["path"] = "warm"
+            self._mark_connected()
+        else:
+            self.startup_report["path"] = "qr"
     
+    @timed("wait_for_qr")
     def wait_for_qr(self, timeout: Optional[int] = None) -> str:
         """Aguarda e retorna o QR Code"""
         if not self.driver:
             raise ConnectionError("Driver não inicializado")
         
+        if self.is_connected:
+            self.logger.info("Sessão já autenticada, QR Code não é necessário")
+            return self.qr_code or ""
+        
         timeout = timeout or self.config.qr_timeout
         self.logger.info("Aguardando QR Code...")
         
         try:
-            # Aguardar elemento do QR Code
-            qr_element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "canvas"))
-            )
-            
-            # Aguardar QR Code ser carregado
-            time.sleep(2)
-            
-            # Capturar QR Code
-            qr_data = qr_element.get_attribute("data-ref")
+            # Aguardar canvas do QR Code com data-ref preenchido
+            qr_data = self.waiter.until(readiness.qr_data_ref(), "qr_code", timeout)
             if qr_data:
-                self.qr_code = qr_data
-                
-                # Gerar QR Code visual
-                qr = qrcode.QRCode(version=1, box_size=10, border=5)
-                qr.add_data(qr_data)
-                qr.make(fit=True)
-                
-                # Salvar QR Code
-                qr_image = qr.make_image(fill_color="black", back_color="white")
-                qr_image.save("whatsapp_qr.png")
-                
-                self.logger.info("QR Code gerado e salvo como 'whatsapp_qr.png'")
-                
-                # Chamar callback
-                if self.on_qr:
-                    self.on_qr(qr_data)
-                
+                self._handle_qr(qr_data)
                 return qr_data
             
             raise AuthenticationError("QR Code não foi gerado")
@@ -120,33 +213,25 @@ def wait_for_qr(self, timeout: Optional[int] = None) -> str:
         except Exception as e:
             raise AuthenticationError(f"Erro ao gerar QR Code: {e}")
     
+    @timed("wait_for_connection")
     def wait_for_connection(self, timeout: Optional[int] = None) -> bool:
         """Aguarda a conexão ser estabelecida"""
         if not self.driver:
             raise ConnectionError("Driver não inicializado")
         
+        if self.is_connected:
+            return True
+        
         timeout = timeout or self.config.wait_timeout
         self.logger.info("Aguardando conexão...")
         
         try:
-            # Aguardar página principal carregar
-            main_element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='chat-list']"))
-            )
+            # Aguardar página principal carregar (acompanhando a troca do QR Code)
+            self.waiter.until(self._check_connection, "chat_list", timeout)
             
             # Verificar se está conectado
             if self._is_authenticated():
-                self.is_connected = True
-                self.phone_number = self._get_phone_number()
-                
-                self.logger.info(f"Conectado com sucesso! Número: {self.phone_number}")
-                
-                # Chamar callbacks
-                if self.on_connection:
-                    self.on_connection()
-                if self.on_ready:
-                    self.on_ready()
-                
+                self._mark_connected()
                 return True
             
             return False
@@ -163,46 +248,58 @@ def wait_forever(self) -> None:
         
         self.logger.info("Iniciando escuta de mensagens...")
         
+        # Handlers rodam no pool de despacho, fora do laço de recepção
+        if self.config.dispatch_workers > 0:
+            self.dispatcher = MessageDispatcher(
+                self._handle_message,
+                workers=self.config.dispatch_workers,
+                queue_size=self.config.dispatch_queue_size,
+                policy=self.config.dispatch_policy,
+            )
+            deliver = self.dispatcher.submit
+        else:
+            deliver = self._handle_message
+        
         try:
             while self.is_connected:
-                # Verificar novas mensagens
+                # Aguardar novas mensagens (long-poll no buffer da página)
                 messages = self._get_new_messages()
                 for message in messages:
-                    if self.on_message:
-                        self.on_message(message)
-                
-                time.sleep(1)
+                    deliver(message)
                 
         except KeyboardInterrupt:
             self.logger.info("Interrupção do usuário")
         except Exception as e:
             self.logger.error(f"Erro na escuta: {e}")
             raise
+        finally:
+            if self.dispatcher:
+                self.dispatcher.close(timeout=self.config.timeout)
     
+    @timed("dispatch")
+    def _handle_message(self, message: Message) -> None:
+        """Entrega uma mensagem ao callback on_message"""
+        if self.on_message:
+            self.on_message(message)
+    
+    def _handle_media(self, message: Message) -> None:
+        """Entrega uma mensagem com mídia baixada ao callback on_media"""
+        if self.on_media:
+            self.on_media(message)
+    
+    @timed("send_message")
     def send_message(self, phone: str, text: str) -> bool:
         """Envia mensagem de texto"""
         if not self.is_connected:
             raise ConnectionError("Cliente não está conectado")
         
         try:
-            # Formatar telefone
-            contact = Contact(phone=phone)
-            
-            # Abrir chat
-            self._open_chat(contact.phone)
-            
-            # Encontrar campo de texto
-            text_box = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='conversation-compose-box-input']"))
-            )
-            
-            # Digitar mensagem
-            text_box.clear()
-            text_box.send_keys(text)
-            
-            # Enviar
-            send_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='send']")
-            send_button.click()
+            # Abrir chat (telefone em E.164 sem o "+") e enviar
+            number = phones.to_whatsapp(phone, self.config.default_country)
+            with self._driver_lock:
+                self._open_chat(number)
+                self._send_text_in_chat(text)
+            self._record_sent(number, text)
             
             self.logger.info(f"Mensagem enviada para {phone}: {text}")
             return True
@@ -211,111 +308,180 @@ def send_message(self, phone: str, text: str) -> bool:
             self.logger.error(f"Erro ao enviar mensagem: {e}")
             raise MessageError(f"Falha ao enviar mensagem: {e}")
     
-    def send_media(self, phone: str, file_path: str, caption: str = "") -> bool:
-        """Envia arquivo de mídia"""
+    @timed("send_media")
+    def send_media(
+        self, phone: str, file_path: Union[str, MediaMessage], caption: str = ""
+    ) -> bool:
+        """Envia arquivo de mídia (caminho ou MediaMessage já preparado)"""
         if not self.is_connected:
             raise ConnectionError("Cliente não está conectado")
         
         try:
-            # Formatar telefone
-            contact = Contact(phone=phone)
-            
-            # Abrir chat
-            self._open_chat(contact.phone)
-            
-            # Clicar no botão de anexo
-            attach_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='attach-button']")
-            attach_button.click()
-            
-            # Selecionar arquivo
-            file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file']")
-            file_input.send_keys(file_path)
-            
-            # Aguardar upload
-            time.sleep(2)
-            
-            # Adicionar legenda se houver
-            if caption:
-                caption_box = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='media-caption']")
-                caption_box.send_keys(caption)
-            
-            # Enviar
-            send_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='send']")
-            send_button.click()
-            
-            self.logger.info(f"Mídia enviada para {phone}: {file_path}")
+            # Abrir chat (telefone em E.164 sem o "+") e enviar
+            number = phones.to_whatsapp(phone, self.config.default_country)
+            media = self._resolve_media(file_path, caption)
+            with self._driver_lock:
+                self._open_chat(number)
+                self._send_media_in_chat(media.file_path, media.caption or "")
+            self._record_sent(number, media.caption or "", media.file_path)
+            
+            self.logger.info(f"Mídia enviada para {phone}: {media.file_path}")
             return True
             
         except Exception as e:
             self.logger.error(f"Erro ao enviar mídia: {e}")
             raise MessageError(f"Falha ao enviar mídia: {e}")
     
+    @timed("send_messages")
+    def send_messages(self, batch: Iterable[BatchItem]) -> List[SendResult]:
+        """Envia mensagens em lote, abrindo cada chat uma única vez
+        
+        Cada item é ``(telefone, conteúdo)``, onde o conteúdo é um texto ou um
+        ``MediaMessage``. Os itens são agrupados pelo telefone normalizado e
+        enviados em sequência dentro do mesmo chat. Retorna um ``SendResult``
+        por item, na ordem de entrada, sem interromper o lote em caso de erro.
+        """
+        if not self.is_connected:
+            raise ConnectionError("Cliente não está conectado")
+        
+        results: List[Optional[SendResult]] = []
+        chats: "OrderedDict[str, List[int]]" = OrderedDict()
+        items = list(batch)
+        
+        # Agrupar por telefone normalizado, preservando a ordem de chegada
+        for index, (phone, _content) in enumerate(items):
+            try:
+                normalized = phones.to_whatsapp(phone, self.config.default_country)
+            except ValueError as e:
+                results.append(
+                    SendResult(index=index, phone=phone, success=False, error=e)
+                )
+                continue
+            results.append(None)
+            chats.setdefault(normalized, []).append(index)
+        
+        # Preparar todas as mídias do lote antes de abrir os chats
+        # (em paralelo com media_processes > 0)
+        prepared: Dict[int, Future] = {}
+        for indexes in chats.values():
+            for index in indexes:
+                if isinstance(items[index][1], MediaMessage):
+                    try:
+                        prepared[index] = self.prepare_media(items[index][1])
+                    except Exception as e:
+                        prepared[index] = Future()
+                        prepared[index].set_exception(e)
+        
+        for phone, indexes in chats.items():
+            # O driver fica reservado enquanto o chat está aberto para o lote
+            with self._driver_lock:
+                try:
+                    self._open_chat(phone)
+                except MessageError as e:
+                    for index in indexes:
+                        results[index] = SendResult(
+                            index=index, phone=phone, success=False, error=e
+                        )
+                    continue
+                
+                for index in indexes:
+                    content = items[index][1]
+                    try:
+                        if isinstance(content, MediaMessage):
+                            content = prepared[index].result()
+                            caption = content.caption or ""
+                            self._send_media_in_chat(content.file_path, caption)
+                            self._record_sent(phone, caption, content.file_path)
+                        else:
+                            self._send_text_in_chat(content)
+                            self._record_sent(phone, content)
+                        results[index] = SendResult(
+                            index=index, phone=phone, success=True
+                        )
+                    except Exception as e:
+                        self.logger.error(
+                            f"Erro ao enviar item {index} para {phone}: {e}"
+                        )
+                        error = MessageError(f"Falha ao enviar mensagem: {e}")
+                        results[index] = SendResult(
+                            index=index, phone=phone, success=False, error=error
+                        )
+        
+        sent = sum(1 for result in results if result.success)
+        self.logger.info(
+            f"Lote enviado: {sent}/{len(results)} itens em {len(chats)} chats"
+        )
+        return results
+    
     def send_document(self, phone: str, file_path: str, caption: str = "") -> bool:
         """Envia documento"""
         return self.send_media(phone, file_path, caption)
     
-    def send_location(self, phone: str, latitude: float, longitude: float, name: str = "") -> bool:
+    @timed("send_location")
+    def send_location(
+        self, phone: str, latitude: float, longitude: float, name: str = ""
+    ) -> bool:
         """Envia localização"""
         if not self.is_connected:
             raise ConnectionError("Cliente não está conectado")
         
         try:
-            # Formatar telefone
-            contact = Contact(phone=phone)
-            
-            # Abrir chat
-            self._open_chat(contact.phone)
-            
-            # Clicar no botão de anexo
-            attach_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='attach-button']")
-            attach_button.click()
-            
-            # Selecionar localização
-            location_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='location']")
-            location_button.click()
-            
-            # Aguardar mapa carregar
-            time.sleep(2)
-            
-            # Inserir coordenadas (implementar lógica específica)
-            # Esta é uma implementação simplificada
-            
-            # Enviar
-            send_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='send']")
-            send_button.click()
+            with self._driver_lock:
+                # Abrir chat
+                number = phones.to_whatsapp(phone, self.config.default_country)
+                self._open_chat(number)
+                
+                # Clicar no botão de anexo
+                self.selectors.act("attach_button", lambda button: button.click())
+                
+                # Selecionar localização
+                self.selectors.locate("location_button").click()
+                
+                # Aguardar mapa carregar (retorna o botão de envio do mapa)
+                send_button = self.waiter.until(
+                    readiness.send_button_ready,
+                    "location_map",
+                    self.config.message_timeout,
+                )
+                
+                # Inserir coordenadas (implementar lógica específica)
+                # Esta é uma implementação simplificada
+                
+                # Enviar
+                send_button.click()
             
-            self.logger.info(f"Localização enviada para {phone}: {latitude}, {longitude}")
+            self.logger.info(
+                f"Localização enviada para {phone}: {latitude}, {longitude}"
+            )
             return True
             
         except Exception as e:
             self.logger.error(f"Erro ao enviar localização: {e}")
             raise MessageError(f"Falha ao enviar localização: {e}")
     
+    @timed("create_group")
     def create_group(self, name: str, participants: List[str]) -> Optional[Group]:
         """Cria um grupo"""
         if not self.is_connected:
             raise ConnectionError("Cliente não está conectado")
         
         try:
-            # Clicar no menu
-            menu_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='menu-bar-menu']")
-            menu_button.click()
-            
-            # Selecionar novo grupo
-            new_group_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='new-group']")
-            new_group_button.click()
-            
-            # Inserir nome do grupo
-            name_input = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='group-name-input']")
-            name_input.send_keys(name)
-            
-            # Adicionar participantes
-            for phone in participants:
-                self._add_participant_to_group(phone)
-            
-            # Criar grupo
-            create_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='group-create']")
-            create_button.click()
+            with self._driver_lock:
+                # Clicar no menu
+                self.selectors.act("menu_button", lambda button: button.click())
+                
+                # Selecionar novo grupo
+                self.selectors.locate("new_group_button").click()
+                
+                # Inserir nome do grupo
+                self.selectors.locate("group_name_input").send_keys(name)
+                
+                # Adicionar participantes
+                for phone in participants:
+                    self._add_participant_to_group(phone)
+                
+                # Criar grupo
+                self.selectors.locate("group_create_button").click()
             
             self.logger.info(f"Grupo '{name}' criado com sucesso")
             
@@ -330,6 +496,25 @@ def disconnect(self) -> None:
         """Desconecta e fecha o navegador"""
         try:
             self.is_connected = False
+            self._known_chats.clear()
+            self._current_chat = None
+            self.qr_watcher.reset()
+            
+            if self.store is not None:
+                self.store.close()
+                self.store = None
+            
+            if self._media_pipeline is not None:
+                self._media_pipeline.close(wait=False)
+                self._media_pipeline = None
+            
+            if self._downloader is not None:
+                self._downloader.close(wait=False)
+                self._downloader = None
+            
+            if self.metrics_server is not None:
+                self.metrics_server.close()
+                self.metrics_server = None
             
             if self.driver:
                 self.driver.quit()
@@ -344,45 +529,321 @@ def disconnect(self) -> None:
         except Exception as e:
             self.logger.error(f"Erro ao desconectar: {e}")
     
-    def _is_authenticated(self) -> bool:
-        """Verifica se está autenticado"""
+    @property
+    def qr_image(self) -> Any:
+        """Última saída do QR Code (bytes PNG, texto, caminho do arquivo ou None)"""
+        return self.qr_watcher.output
+    
+    def _handle_qr(self, qr_data: Optional[str]) -> bool:
+        """Renderiza e notifica um QR Code lido da página (apenas se mudou)"""
+        if not self.qr_watcher.update(qr_data):
+            return False
+        
+        self.qr_code = qr_data
+        if self.qr_watcher.rotations > 1:
+            self.logger.info("QR Code atualizado pelo WhatsApp Web")
+        else:
+            mode = self.qr_watcher.renderer.mode
+            self.logger.info(f"QR Code gerado (saída: {mode})")
+        
+        # Chamar callback
+        if self.on_qr:
+            self.on_qr(qr_data)
+        return True
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot das métricas: histogramas por operação, contadores e erros
+        
+        Vazio se ``Config.metrics_enabled`` estiver desativado.
+        """
+        return self._metrics.snapshot()
+    
+    def _start_metrics_server(self) -> None:
+        """Sobe o endpoint HTTP de métricas, se configurado"""
+        if (
+            self._metrics.enabled
+            and self.config.metrics_port is not None
+            and self.metrics_server is None
+        ):
+            self.metrics_server = MetricsServer(
+                self._metrics, self.config.metrics_port, self.config.metrics_host
+            ).start()
+    
+    def _open_store(self) -> None:
+        """Abre o armazenamento local de mensagens, se configurado"""
+        if self.config.store_dir and self.store is None:
+            self.store = MessageStore(
+                self.config.store_dir, ring_size=self.config.store_ring_size
+            )
+    
+    @property
+    def media_pipeline(self) -> MediaPipeline:
+        """Pipeline de preparação de mídias (criado no primeiro uso)"""
+        if self._media_pipeline is None:
+            cache_dir = self.config.media_cache_dir or os.path.join(
+                self.config.user_data_dir, "media_cache"
+            )
+            self._media_pipeline = MediaPipeline(
+                cache_dir,
+                max_dimension=self.config.media_max_dimension,
+                quality=self.config.media_quality,
+                workers=self.config.media_processes,
+            )
+        return self._media_pipeline
+    
+    def prepare_media(
+        self, media: Union[str, MediaMessage], caption: Optional[str] = None
+    ) -> "Future[MediaMessage]":
+        """Agenda a preparação de uma mídia (reduz imagens; reutiliza o cache)
+        
+        Permite preparar arquivos antes de enfileirar os envios; o resultado
+        pode ser passado diretamente para ``send_media``.
+        """
+        if not self.config.media_preprocess:
+            future: Future = Future()
+            if isinstance(media, MediaMessage):
+                if caption is not None:
+                    media = MediaMessage.from_file(media.file_path, caption)
+                future.set_result(media)
+            else:
+                future.set_result(MediaMessage.from_file(media, caption))
+            return future
+        return self.media_pipeline.prepare(media, caption)
+    
+    def _resolve_media(
+        self, media: Union[str, MediaMessage], caption: str = ""
+    ) -> MediaMessage:
+        """MediaMessage pronto para envio"""
+        return self.prepare_media(media, caption or None).result()
+    
+    def download_media(self, message: Message) -> "Future[MediaMessage]":
+        """Agenda o download da mídia de uma mensagem recebida
+        
+        O arquivo é gravado em ``media_dir`` (padrão ``<user_data_dir>/media``);
+        ao terminar, ``message.media`` aponta para ele e ``on_media`` é chamado.
+        """
+        if self.driver is None:
+            raise ConnectionError("Cliente não está conectado")
+        if self._downloader is None:
+            self._downloader = MediaDownloader(
+                self.driver,
+                self.config.media_dir
+                or os.path.join(self.config.user_data_dir, "media"),
+                chunk_size=self.config.download_chunk_size,
+                workers=self.config.download_workers,
+                lock=self._driver_lock,
+                on_media=self._handle_media,
+            )
+        return self._downloader.submit(message)
+    
+    def _record_sent(
+        self, phone: str, content: str, file_path: Optional[str] = None
+    ) -> None:
+        """Contabiliza uma mensagem enviada e a grava no armazenamento (se ativo)"""
+        self._metrics.inc("messages_sent_total")
+        if self.store is None or not self.phone_number:
+            return
         try:
-            # Verificar se existe elemento da lista de chats
-            self.driver.find_element(By.CSS_SELECTOR, "[data-testid='chat-list']")
+            message_type = MessageType.TEXT
+            if file_path:
+                message_type = extraction.media_type(file_path)
+                content = content or f"[{message_type.value.upper()}]"
+            message = Message(
+                id="",
+                content=content,
+                sender=Contact(phone=self.phone_number),
+                recipient=Contact(phone=phone),
+                message_type=message_type,
+                status=MessageStatus.SENT,
+                metadata={"chat": f"{phone}@c.us", "file_path": file_path} if file_path
+                else {"chat": f"{phone}@c.us"},
+            )
+            self.store.append(message, from_me=True)
+        except Exception as e:
+            self.logger.warning(f"Mensagem enviada não foi armazenada: {e}")
+    
+    def _check_connection(self, driver: Any = None) -> bool:
+        """Condição de conexão; enquanto isso, acompanha a troca do QR Code"""
+        if readiness.chat_list_present(self.driver):
             return True
-        except NoSuchElementException:
-            return False
+        
+        now = time.monotonic()
+        if self.qr_code and now >= self._next_qr_check:
+            self._next_qr_check = now + self.config.qr_refresh_interval
+            self._handle_qr(self._poll_qr())
+        return False
+    
+    def _mark_connected(self) -> None:
+        """Marca a sessão como conectada e dispara os callbacks"""
+        self.is_connected = True
+        self.phone_number = self._get_phone_number()
+        
+        self.logger.info(f"Conectado com sucesso! Número: {self.phone_number}")
+        
+        # Capturar mensagens recebidas a partir de agora
+        try:
+            self._install_message_observer()
+        except Exception as e:
+            self.logger.warning(f"Erro ao instalar observer de mensagens: {e}")
+        
+        # Chamar callbacks
+        if self.on_connection:
+            self.on_connection()
+        if self.on_ready:
+            self.on_ready()
+    
+    def _poll_qr(self) -> Optional[str]:
+        """Lê o QR Code atual sem aguardar (None se ainda não disponível)"""
+        return readiness.qr_data_ref()(self.driver) or None
+    
+    def _is_authenticated(self) -> bool:
+        """Verifica se está autenticado"""
+        # Verificar se existe elemento da lista de chats
+        return bool(readiness.chat_list_present(self.driver))
     
     def _get_phone_number(self) -> Optional[str]:
         """Obtém o número do WhatsApp conectado"""
         try:
-            # Clicar no menu de perfil
-            profile_button = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='header-profile']")
-            profile_button.click()
+            # Ler o identificador da sessão salvo pelo WhatsApp Web, sem abrir o perfil
+            wid = self.driver.execute_script(
+                "return window.localStorage.getItem('last-wid-md')"
+                " || window.localStorage.getItem('last-wid');"
+            )
+            if not wid:
+                return None
             
-            # Aguardar perfil carregar
-            time.sleep(1)
-            
-            # Capturar número (implementar lógica específica)
-            # Esta é uma implementação simplificada
-            return None
+            # Formato: "5511999999999:12@c.us"
+            number = wid.strip('"').split('@')[0].split(':')[0]
+            return number if number.isdigit() else None
             
         except Exception:
             return None
     
+    @property
+    def known_chats(self) -> List[str]:
+        """Chats já abertos nesta sessão (do menos ao mais recente)"""
+        return list(self._known_chats)
+    
+    @timed("open_chat")
     def _open_chat(self, phone: str) -> None:
-        """Abre chat com um número específico"""
+        """Abre chat com um número específico
+        
+        No modo ``search`` troca de chat dentro da aplicação já carregada para
+        números conhecidos e só recarrega a página (deep link) para números
+        nunca vistos ou quando a troca não se confirma.
+        """
         try:
-            # Construir URL do chat
-            chat_url = f"https://web.whatsapp.com/send?phone={phone}"
-            self.driver.get(chat_url)
+            if self.config.navigation_mode == "search" and phone in self._known_chats:
+                current = phone == self._current_chat
+                if current and readiness.chat_open(phone)(self.driver):
+                    self._remember_chat(phone)
+                    return
+                
+                if self._switch_chat(phone):
+                    self._remember_chat(phone)
+                    return
+                
+                self.logger.debug(f"Troca de chat falhou para {phone}, recarregando")
             
-            # Aguardar chat carregar
-            time.sleep(2)
+            self._load_chat(phone)
+            self._remember_chat(phone)
             
         except Exception as e:
+            self._current_chat = None
             raise MessageError(f"Erro ao abrir chat: {e}")
     
+    def _load_chat(self, phone: str) -> None:
+        """Abre o chat recarregando a página pelo deep link"""
+        chat_url = f"{self.whatsapp_url}send?phone={phone}"
+        self.driver.get(chat_url)
+        self.selectors.invalidate(PAGE)
+        
+        # Aguardar campo de texto pronto (chat carregado)
+        text_box = self.waiter.until(
+            readiness.compose_box_ready, "open_chat", self.config.message_timeout
+        )
+        self.selectors.remember("compose_box", text_box)
+    
+    def _switch_chat(self, phone: str) -> bool:
+        """Troca para um chat conhecido pela busca da lista de chats"""
+        try:
+            def search(search_box: Any) -> None:
+                search_box.click()
+                search_box.send_keys(Keys.CONTROL, "a")
+                search_box.send_keys(phone, Keys.ENTER)
+            
+            self.selectors.act("chat_search", search, resolve=lambda: self.waiter.until(
+                readiness.element_ready(readiness.CHAT_SEARCH), "chat_search",
+                self.config.switch_timeout
+            ))
+            self.selectors.invalidate(CHAT)
+            
+            # Confirmar que o chat aberto é o do número pedido
+            text_box = self.waiter.until(
+                readiness.chat_open(phone), "switch_chat", self.config.switch_timeout
+            )
+            self.selectors.remember("compose_box", text_box)
+            return True
+            
+        except TimeoutException:
+            return False
+    
+    def _remember_chat(self, phone: str) -> None:
+        """Registra o chat como aberto no cache LRU"""
+        self._current_chat = phone
+        self._known_chats[phone] = None
+        self._known_chats.move_to_end(phone)
+        while len(self._known_chats) > self.config.chat_cache_size:
+            self._known_chats.popitem(last=False)
+    
+    def _send_text_in_chat(self, text: str) -> None:
+        """Digita e envia texto no chat aberto"""
+        def type_text(text_box: Any) -> None:
+            text_box.clear()
+            text_box.send_keys(text)
+        
+        # Campo de texto em cache desde a abertura do chat; aguarda se obsoleto
+        self.selectors.act("compose_box", type_text, resolve=lambda: self.waiter.until(
+            readiness.compose_box_ready, "compose_box", self.config.message_timeout
+        ))
+        
+        # Enviar
+        self.selectors.act("send_button", lambda button: button.click())
+    
+    def _send_media_in_chat(self, file_path: str, caption: str = "") -> None:
+        """Anexa e envia um arquivo no chat aberto"""
+        # Clicar no botão de anexo
+        self.selectors.act("attach_button", lambda button: button.click())
+        
+        # Selecionar arquivo (o input é recriado a cada anexo)
+        self.selectors.locate("file_input").send_keys(file_path)
+        
+        # Aguardar pré-visualização do upload (retorna o botão de envio da prévia)
+        send_button = self.waiter.until(
+            readiness.upload_preview_ready,
+            "upload_preview",
+            self.config.message_timeout,
+        )
+        
+        # Adicionar legenda se houver
+        if caption:
+            self.selectors.locate("media_caption").send_keys(caption)
+        
+        # Enviar, aguardar a bolha da nova mídia e o fim do seu upload (o
+        # indicador de envio pendente dessa bolha some)
+        previous = readiness.last_outgoing(self.driver)
+        send_button.click()
+        message_id = self.waiter.until(
+            readiness.outgoing_after(previous),
+            "upload_started",
+            self.config.message_timeout,
+        )
+        self.waiter.until(
+            readiness.upload_complete(message_id),
+            "upload_complete",
+            self.config.upload_timeout,
+        )
+    
     def _add_participant_to_group(self, phone: str) -> None:
         """Adiciona participante ao grupo sendo criado"""
         try:
@@ -393,11 +854,63 @@ def _add_participant_to_group(self, phone: str) -> None:
         except Exception as e:
             self.logger.warning(f"Erro ao adicionar participante {phone}: {e}")
     
-    def _get_new_messages(self) -> List[Message]:
-        """Obtém novas mensagens recebidas"""
-        # Implementar lógica de captura de mensagens
-        # Esta é uma implementação simplificada
-        return []
+    def _install_message_observer(self) -> None:
+        """Injeta o observer que captura mensagens recebidas na página"""
+        # O long-poll precisa de folga além do próprio prazo
+        self.driver.set_script_timeout(
+            self.config.receive_interval + self.config.timeout
+        )
+        self.driver.execute_script(scripts.INSTALL_MESSAGE_OBSERVER)
+    
+    @timed("receive_poll")
+    def _get_new_messages(self, timeout: Optional[float] = None) -> List[Message]:
+        """Obtém novas mensagens recebidas
+        
+        Aguarda no buffer da página por até ``timeout`` segundos (padrão
+        ``receive_interval``) e retorna assim que houver mensagens, em uma
+        única chamada ao driver que também traz as diferenças da lista de chats
+        (atualiza ``chats``).
+        """
+        if timeout is None:
+            timeout = self.config.receive_interval
+        # Com downloads em andamento, o long-poll é curto para liberar o driver
+        timeout_ms = int(timeout * 1000)
+        if self._downloader is not None and self._downloader.active:
+            timeout_ms = min(timeout_ms, 50)
+        
+        with self._driver_lock:
+            payload = self.driver.execute_async_script(
+                scripts.DRAIN_MESSAGES, timeout_ms
+            )
+            if payload is None:
+                # Página recarregada (ou primeira chamada): reinstalar o observer
+                self._install_message_observer()
+                return []
+        
+        messages, chats = extraction.parse_payload(
+            payload, self.phone_number, day_first=self.config.day_first
+        )
+        # IDs vêm da chave do WhatsApp (data-id); recapturas são descartadas
+        messages = self.seen.filter(messages)
+        if messages:
+            self._metrics.inc("messages_received_total", len(messages))
+        if self.store is not None:
+            for message in messages:
+                self.store.append(message)
+        if self.config.download_media:
+            for message in messages:
+                if message.message_type in DOWNLOADABLE:
+                    self.download_media(message)
+        for chat in chats:
+            self.chats[chat.id] = chat
+            if self.on_chat_update:
+                self.on_chat_update(chat)
+        return messages
+    
+    @property
+    def wait_timings(self) -> dict:
+        """Tempos (em segundos) da última espera de cada operação"""
+        return dict(self.waiter.timings) if self.waiter else {}
     
     def __enter__(self):
         """Context manager entry"""
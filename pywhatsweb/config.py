@@ -7,6 +7,12 @@
 from dataclasses import dataclass
 
 
+# Cache do caminho do chromedriver por versão do Chrome (ver pywhatsweb.driver)
+DEFAULT_DRIVER_CACHE = os.path.join(
+    os.path.expanduser("~"), ".pywhatsweb", "chromedriver.json"
+)
+
+
 @dataclass
 class Config:
     """Configurações para o cliente WhatsApp"""
@@ -17,10 +23,73 @@ class Config:
     user_data_dir: str = "./whatsapp_data"
     chrome_options: List[str] = None
     
+    # Resolução do chromedriver (caminho explícito ou cache por versão do Chrome)
+    chromedriver_path: Optional[str] = None
+    chrome_binary: Optional[str] = None
+    driver_cache_path: str = DEFAULT_DRIVER_CACHE
+    
     # Configurações do WhatsApp
+    base_url: str = "https://web.whatsapp.com/"  # ex.: simulador local dos benchmarks
     wait_timeout: int = 60
     qr_timeout: int = 120
     message_timeout: int = 30
+    receive_interval: float = 1.0  # Prazo máximo do long-poll de mensagens
+    seen_capacity: int = 100_000   # IDs lembrados para descartar mensagens repetidas
+    
+    # Armazenamento local de mensagens (desativado se store_dir for None)
+    store_dir: Optional[str] = None
+    store_ring_size: int = 10_000
+    
+    # Mídia: redução de imagens com cache pelo hash do conteúdo
+    media_preprocess: bool = True
+    media_max_dimension: int = 1600
+    media_quality: int = 80
+    media_processes: int = 0  # 0 = na thread do envio; > 0 = pool de processos
+    media_cache_dir: Optional[str] = None  # padrão: <user_data_dir>/media_cache
+    upload_timeout: int = 120
+    
+    # Download de mídias recebidas (em blocos, em segundo plano)
+    download_media: bool = False
+    media_dir: Optional[str] = None  # padrão: <user_data_dir>/media
+    download_chunk_size: int = 512 * 1024
+    download_workers: int = 2
+    
+    # QR Code: saída ("file", "png", "terminal" ou "none") e verificação de troca
+    qr_output: str = "file"
+    qr_path: Optional[str] = None  # padrão: <user_data_dir>/whatsapp_qr.png
+    qr_refresh_interval: float = 1.0
+    
+    # País dos números informados sem código do país (ver pywhatsweb.phones)
+    default_country: str = "BR"
+    
+    # Ordem das datas exibidas pelo WhatsApp ("18/10/2026" x "10/18/2026")
+    day_first: bool = True
+    
+    # Inicialização: detectar perfil já autenticado e pular o QR Code
+    warm_start: bool = True
+    
+    # Configurações de prontidão (esperas por condições do DOM)
+    poll_interval: float = 0.05
+    report_waits: bool = False
+    
+    # Navegação entre chats ("search" troca dentro da aplicação, "reload" usa deep link)
+    navigation_mode: str = "search"
+    switch_timeout: int = 5
+    chat_cache_size: int = 256
+    
+    # Despacho do on_message (0 threads = chamada direta no laço de recepção)
+    dispatch_workers: int = 4
+    dispatch_queue_size: int = 1000
+    dispatch_policy: str = "spill"
+    
+    # Métricas de latência (endpoint Prometheus local se metrics_port for definido)
+    metrics_enabled: bool = False
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    
+    # Rastreamento dos comandos do chromedriver (spans em JSON lines se trace_file)
+    trace: bool = False
+    trace_file: Optional[str] = None
     
     # Configurações de debug
     debug: bool = False
@@ -53,7 +122,36 @@ def from_env(cls) -> 'Config':
             headless=os.getenv('WHATSAPP_HEADLESS', 'false').lower() == 'true',
             timeout=int(os.getenv('WHATSAPP_TIMEOUT', '30')),
             user_data_dir=os.getenv('WHATSAPP_USER_DATA_DIR', './whatsapp_data'),
+            chromedriver_path=os.getenv('WHATSAPP_CHROMEDRIVER_PATH') or None,
+            chrome_binary=os.getenv('WHATSAPP_CHROME_BINARY') or None,
+            driver_cache_path=os.getenv('WHATSAPP_DRIVER_CACHE', DEFAULT_DRIVER_CACHE),
+            base_url=os.getenv('WHATSAPP_BASE_URL', 'https://web.whatsapp.com/'),
             debug=os.getenv('WHATSAPP_DEBUG', 'false').lower() == 'true',
+            navigation_mode=os.getenv('WHATSAPP_NAVIGATION_MODE', 'search'),
+            report_waits=os.getenv('WHATSAPP_REPORT_WAITS', 'false').lower() == 'true',
+            default_country=os.getenv('WHATSAPP_DEFAULT_COUNTRY', 'BR'),
+            day_first=os.getenv('WHATSAPP_DAY_FIRST', 'true').lower() == 'true',
+            store_dir=os.getenv('WHATSAPP_STORE_DIR') or None,
+            media_preprocess=(
+                os.getenv('WHATSAPP_MEDIA_PREPROCESS', 'true').lower() == 'true'
+            ),
+            media_processes=int(os.getenv('WHATSAPP_MEDIA_PROCESSES', '0')),
+            media_cache_dir=os.getenv('WHATSAPP_MEDIA_CACHE_DIR') or None,
+            download_media=(
+                os.getenv('WHATSAPP_DOWNLOAD_MEDIA', 'false').lower() == 'true'
+            ),
+            media_dir=os.getenv('WHATSAPP_MEDIA_DIR') or None,
+            qr_output=os.getenv('WHATSAPP_QR_OUTPUT', 'file'),
+            qr_path=os.getenv('WHATSAPP_QR_PATH') or None,
+            warm_start=os.getenv('WHATSAPP_WARM_START', 'true').lower() == 'true',
+            metrics_enabled=os.getenv('WHATSAPP_METRICS', 'false').lower() == 'true',
+            metrics_port=(
+                int(os.environ['WHATSAPP_METRICS_PORT'])
+                if os.getenv('WHATSAPP_METRICS_PORT')
+                else None
+            ),
+            trace=os.getenv('WHATSAPP_TRACE', 'false').lower() == 'true',
+            trace_file=os.getenv('WHATSAPP_TRACE_FILE') or None,
             log_level=os.getenv('WHATSAPP_LOG_LEVEL', 'INFO')
         )
     
@@ -0,0 +1,62 @@
+"""
+Deduplicação de mensagens recebidas
+
+Depois de reconexões ou recargas da página, as mesmas mensagens podem ser
+capturadas de novo. O ``SeenSet`` guarda um resumo de 8 bytes de cada ID já
+entregue, com capacidade limitada (LRU), e o laço de recepção descarta as
+repetidas.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, List
+
+
+def digest(message_id: str) -> int:
+    """Resumo de 64 bits do ID (estável entre processos, ao contrário de hash())"""
+    return int.from_bytes(
+        hashlib.blake2b(message_id.encode(), digest_size=8).digest(), "big"
+    )
+
+
+class SeenSet:
+    """Conjunto limitado de IDs já vistos, descartando os mais antigos"""
+
+    def __init__(self, capacity: int = 100_000):
+        """Inicializa com a capacidade máxima de IDs"""
+        if capacity < 1:
+            raise ValueError("A capacidade precisa ser positiva")
+        self.capacity = capacity
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def add(self, message_id: str) -> bool:
+        """Registra o ID (True se ainda não tinha sido visto)"""
+        key = digest(message_id)
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                self.duplicates += 1
+                return False
+            self._seen[key] = None
+            if len(self._seen) > self.capacity:
+                self._seen.popitem(last=False)
+            return True
+
+    def filter(self, messages: Iterable) -> List:
+        """Mensagens (com atributo ``id``) ainda não vistas, na ordem original"""
+        return [message for message in messages if self.add(message.id)]
+
+    def __contains__(self, message_id: str) -> bool:
+        with self._lock:
+            return digest(message_id) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def clear(self) -> None:
+        """Esquece todos os IDs"""
+        with self._lock:
+            self._seen.clear()
@@ -0,0 +1,249 @@
+"""
+Despacho de mensagens recebidas para o callback on_message
+
+As mensagens são distribuídas entre threads por hash do chat: cada thread
+tem sua própria fila limitada, o que garante a ordem dentro de um chat sem
+serializar chats diferentes. O laço de recepção nunca executa código do
+usuário; quando uma fila enche, vale a política de contrapressão.
+"""
+
+import logging
+import pickle
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from .models import Message
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressurePolicy(Enum):
+    """Política quando a fila de uma thread está cheia"""
+
+    BLOCK = "block"  # o produtor aguarda espaço
+    DROP_OLDEST = "drop_oldest"  # descarta a mensagem mais antiga da fila
+    SPILL = "spill"  # grava o excedente em disco, preservando a ordem
+
+
+def chat_key(message: Message) -> str:
+    """Chave de ordenação: o chat da mensagem"""
+    return message.metadata.get("chat") or message.sender.phone
+
+
+class _SpillFile:
+    """Fila FIFO em arquivo temporário para o excedente de uma thread"""
+
+    def __init__(self, directory: Optional[str]):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._read_offset = 0
+        self.count = 0
+
+    def append(self, item: Any) -> None:
+        self._file.seek(0, 2)
+        pickle.dump(item, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def pop_many(self, limit: int) -> List[Any]:
+        items: List[Any] = []
+        self._file.seek(self._read_offset)
+        while self.count and len(items) < limit:
+            items.append(pickle.load(self._file))
+            self.count -= 1
+        self._read_offset = self._file.tell()
+        if not self.count:
+            self.clear()
+        return items
+
+    def clear(self) -> None:
+        # Arquivo esvaziado: reaproveitar desde o início
+        self._file.seek(0)
+        self._file.truncate()
+        self._read_offset = 0
+        self.count = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _Shard:
+    """Fila e thread responsáveis por um subconjunto dos chats"""
+
+    def __init__(self, index: int, queue_size: int):
+        self.index = index
+        self.queue: Deque[Message] = deque()
+        self.queue_size = queue_size
+        self.condition = threading.Condition()
+        self.spill: Optional[_SpillFile] = None
+        self.thread: Optional[threading.Thread] = None
+        self.busy = False
+
+
+class MessageDispatcher:
+    """Entrega mensagens a um handler em um pool de threads limitado"""
+
+    def __init__(
+        self,
+        handler: Callable[[Message], None],
+        workers: int = 4,
+        queue_size: int = 1000,
+        policy: Union[BackpressurePolicy, str] = BackpressurePolicy.SPILL,
+        spill_dir: Optional[str] = None,
+        key: Callable[[Message], str] = chat_key,
+    ):
+        """Inicializa e inicia as threads de despacho"""
+        if workers < 1:
+            raise ValueError("O despacho precisa de pelo menos uma thread")
+
+        self.handler = handler
+        self.policy = BackpressurePolicy(policy)
+        self.spill_dir = spill_dir
+        self.key = key
+
+        self._shards = [
+            _Shard(i, max(queue_size // workers, 1)) for i in range(workers)
+        ]
+        self._running = True
+        self._stats_lock = threading.Lock()
+        self._handled = 0
+        self._errors = 0
+        self._dropped = 0
+        self._spilled = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+        for shard in self._shards:
+            shard.thread = threading.Thread(
+                target=self._run,
+                args=(shard,),
+                name=f"pywhatsweb-dispatch-{shard.index}",
+                daemon=True,
+            )
+            shard.thread.start()
+
+    def submit(self, message: Message) -> bool:
+        """Enfileira uma mensagem (False se foi preciso descartar alguma)"""
+        shard = self._shards[zlib.crc32(self.key(message).encode()) % len(self._shards)]
+        dropped = False
+
+        with shard.condition:
+            # Com excedente em disco, novas mensagens vão atrás dele
+            if shard.spill and shard.spill.count:
+                shard.spill.append(message)
+                self._count("_spilled")
+            elif len(shard.queue) < shard.queue_size:
+                shard.queue.append(message)
+            elif self.policy is BackpressurePolicy.BLOCK:
+                while len(shard.queue) >= shard.queue_size and self._running:
+                    shard.condition.wait()
+                shard.queue.append(message)
+            elif self.policy is BackpressurePolicy.DROP_OLDEST:
+                shard.queue.popleft()
+                shard.queue.append(message)
+                self._count("_dropped")
+                dropped = True
+            else:
+                if shard.spill is None:
+                    shard.spill = _SpillFile(self.spill_dir)
+                shard.spill.append(message)
+                self._count("_spilled")
+            shard.condition.notify_all()
+
+        return not dropped
+
+    def _run(self, shard: _Shard) -> None:
+        """Laço de uma thread de despacho"""
+        while True:
+            with shard.condition:
+                while not shard.queue:
+                    if shard.spill and shard.spill.count:
+                        shard.queue.extend(shard.spill.pop_many(shard.queue_size))
+                        break
+                    if not self._running:
+                        return
+                    shard.condition.wait()
+                message = shard.queue.popleft()
+                shard.busy = True
+                shard.condition.notify_all()
+
+            start = time.monotonic()
+            try:
+                self.handler(message)
+            except Exception as e:
+                logger.error(f"Erro no handler de mensagem {message.id}: {e}")
+                self._count("_errors")
+            finally:
+                elapsed = time.monotonic() - start
+                with self._stats_lock:
+                    self._handled += 1
+                    self._latency_total += elapsed
+                    self._latency_max = max(self._latency_max, elapsed)
+                with shard.condition:
+                    shard.busy = False
+                    shard.condition.notify_all()
+
+    def _count(self, name: str) -> None:
+        """Incrementa um contador"""
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def queue_depth(self) -> int:
+        """Mensagens aguardando despacho (memória e disco)"""
+        return sum(
+            len(s.queue) + (s.spill.count if s.spill else 0) for s in self._shards
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Profundidade das filas, contadores e latência do handler"""
+        with self._stats_lock:
+            handled = self._handled
+            return {
+                "queue_depth": self.queue_depth(),
+                "queue_depth_per_worker": [
+                    len(s.queue) + (s.spill.count if s.spill else 0)
+                    for s in self._shards
+                ],
+                "handled": handled,
+                "errors": self._errors,
+                "dropped": self._dropped,
+                "spilled": self._spilled,
+                "handler_latency_avg": (
+                    self._latency_total / handled if handled else 0.0
+                ),
+                "handler_latency_max": self._latency_max,
+            }
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda as filas esvaziarem (True se esvaziaram no prazo)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for shard in self._shards:
+            with shard.condition:
+                while shard.queue or shard.busy or (shard.spill and shard.spill.count):
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    shard.condition.wait(remaining)
+        return True
+
+    def close(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """Encerra as threads (por padrão após esvaziar as filas)"""
+        if wait:
+            self.join(timeout)
+        self._running = False
+        for shard in self._shards:
+            with shard.condition:
+                if not wait:
+                    shard.queue.clear()
+                    if shard.spill:
+                        shard.spill.clear()
+                shard.condition.notify_all()
+        for shard in self._shards:
+            shard.thread.join(timeout)
+            if shard.spill:
+                shard.spill.close()
@@ -0,0 +1,188 @@
+"""
+Download de mídias recebidas
+
+A mídia é lida da página em blocos (``scripts.FETCH_MEDIA_CHUNK``: fatias do
+Blob em base64) e gravada no arquivo à medida que chega, então a memória do
+processo não cresce com o tamanho do anexo. Os downloads rodam em um pool
+pequeno de threads e nunca bloqueiam a recepção de mensagens; o acesso ao
+driver é serializado por um lock compartilhado com o laço de recepção.
+"""
+
+import base64
+import logging
+import mimetypes
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from . import scripts
+from .exceptions import MediaDownloadError
+from .models import MediaMessage, Message, MessageType
+
+logger = logging.getLogger(__name__)
+
+# Tipos de mensagem com mídia baixável
+DOWNLOADABLE = frozenset(
+    {
+        MessageType.IMAGE,
+        MessageType.VIDEO,
+        MessageType.AUDIO,
+        MessageType.DOCUMENT,
+        MessageType.STICKER,
+    }
+)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def file_name(message_id: str) -> str:
+    """Nome de arquivo seguro a partir do ID da mensagem"""
+    return _UNSAFE.sub("_", message_id).strip("._") or "media"
+
+
+def caption_of(message: Message) -> Optional[str]:
+    """Legenda da mídia (None quando o conteúdo é só o marcador do tipo)"""
+    if message.content == f"[{message.message_type.value.upper()}]":
+        return None
+    return message.content or None
+
+
+class MediaDownloader:
+    """Baixa mídias recebidas em segundo plano, bloco a bloco"""
+
+    def __init__(
+        self,
+        driver: Any,
+        directory: str,
+        chunk_size: int = 512 * 1024,
+        workers: int = 2,
+        lock: Optional[threading.RLock] = None,
+        on_media: Optional[Callable[[Message], None]] = None,
+    ):
+        """Inicializa o downloader (as threads sobem no primeiro download)"""
+        self.driver = driver
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.workers = max(workers, 1)
+        self.lock = lock or threading.RLock()
+        self.on_media = on_media
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        """Downloads agendados ou em andamento"""
+        return len(self._pending)
+
+    def pending(self, message_id: str) -> Optional[Future]:
+        """Future do download em andamento da mensagem, se houver"""
+        return self._pending.get(message_id)
+
+    def submit(self, message: Message) -> "Future[MediaMessage]":
+        """Agenda o download da mídia da mensagem"""
+        with self._pending_lock:
+            future = self._pending.get(message.id)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="pywhatsweb-download"
+                )
+            future = self._executor.submit(self._download, message)
+            self._pending[message.id] = future
+
+        future.add_done_callback(lambda done: self._finish(message, done))
+        return future
+
+    def _finish(self, message: Message, future: Future) -> None:
+        """Atualiza a mensagem e avisa o callback"""
+        with self._pending_lock:
+            self._pending.pop(message.id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Erro ao baixar mídia de {message.id}: {error}")
+            return
+
+        message.media = future.result()
+        if self.on_media:
+            try:
+                self.on_media(message)
+            except Exception as e:
+                logger.error(f"Erro no callback on_media: {e}")
+
+    def _read_chunk(self, message: Message, offset: int) -> dict:
+        """Lê um bloco da mídia na página"""
+        with self.lock:
+            chunk = self.driver.execute_async_script(
+                scripts.FETCH_MEDIA_CHUNK,
+                message.id,
+                message.metadata.get("media_url"),
+                offset,
+                self.chunk_size,
+            )
+        if not chunk or "e" in chunk:
+            reason = chunk.get("e") if chunk else "sem resposta da página"
+            raise MediaDownloadError(f"Falha ao baixar mídia de {message.id}: {reason}")
+        return chunk
+
+    def _download(self, message: Message) -> MediaMessage:
+        """Baixa a mídia para ``directory`` e retorna o MediaMessage"""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, file_name(message.id))
+        part_path = f"{base}.part"
+        offset, total, mime_type = 0, None, ""
+
+        try:
+            with open(part_path, "wb") as f:
+                while total is None or offset < total:
+                    chunk = self._read_chunk(message, offset)
+                    data = base64.b64decode(chunk["d"])
+                    total, mime_type = (
+                        chunk["n"],
+                        (chunk.get("t") or "").split(";")[0].strip(),
+                    )
+                    if not data and offset < total:
+                        raise MediaDownloadError(
+                            f"Mídia de {message.id} interrompida "
+                            f"em {offset}/{total} bytes"
+                        )
+                    f.write(data)
+                    offset += len(data)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            self._release(message.id)
+
+        extension = mimetypes.guess_extension(mime_type) if mime_type else None
+        path = base + (extension or "")
+        os.replace(part_path, path)
+        media = MediaMessage.from_file(path, caption_of(message))
+        if mime_type:
+            media.mime_type = mime_type
+        logger.debug(f"Mídia de {message.id} salva em {path} ({offset} bytes)")
+        return media
+
+    def _release(self, message_id: str) -> None:
+        """Libera o Blob mantido na página"""
+        try:
+            with self.lock:
+                self.driver.execute_script(scripts.RELEASE_MEDIA, message_id)
+        except Exception as e:
+            logger.debug(f"Falha ao liberar mídia {message_id}: {e}")
+
+    def close(self, wait: bool = True) -> None:
+        """Encerra o pool (``wait=False`` cancela os downloads ainda na fila)"""
+        if self._executor is not None:
+            if not wait:
+                for future in list(self._pending.values()):
+                    future.cancel()
+            self._executor.shutdown(wait=wait)
+            self._executor = None
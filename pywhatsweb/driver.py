@@ -0,0 +1,194 @@
+"""
+Resolução do chromedriver usado pelo cliente
+
+O caminho do driver é guardado em cache (arquivo JSON) por versão do Chrome
+instalado. A versão é lida localmente (``chrome --version``) e a entrada do
+cache é validada apenas com uma verificação no sistema de arquivos, então o
+webdriver-manager, que pode consultar a rede, só é usado quando não há cache
+para a versão atual.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .config import DEFAULT_DRIVER_CACHE, Config
+from .exceptions import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Origens possíveis do caminho resolvido
+SOURCE_CONFIG = "config"
+SOURCE_CACHE = "cache"
+SOURCE_DOWNLOAD = "download"
+
+_CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+
+_CHROME_PATHS = {
+    "darwin": ("/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",),
+    "win32": (
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    ),
+}
+
+_VERSION = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+
+@dataclass
+class DriverResolution:
+    """Resultado da resolução do chromedriver"""
+
+    path: str
+    source: str
+    chrome_version: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def is_executable(path: Optional[str]) -> bool:
+    """Verificação local e barata de que o driver ainda existe"""
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _windows_chrome_version() -> Optional[str]:
+    """Versão do Chrome registrada pelo instalador no Windows"""
+    try:
+        import winreg
+
+        key = winreg.OpenKey(
+            winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon"
+        )
+        return winreg.QueryValueEx(key, "version")[0]
+    except (ImportError, OSError):
+        return None
+
+
+def chrome_version(binary: Optional[str] = None) -> Optional[str]:
+    """Versão do Chrome instalado (None se não for possível detectar)"""
+    if binary is None and sys.platform == "win32":
+        version = _windows_chrome_version()
+        if version:
+            return version
+
+    if binary:
+        candidates = [binary]
+    else:
+        candidates = [path for path in map(shutil.which, _CHROME_BINARIES) if path]
+        candidates.extend(
+            path for path in _CHROME_PATHS.get(sys.platform, ()) if os.path.exists(path)
+        )
+
+    for candidate in candidates:
+        try:
+            output = subprocess.run(
+                [candidate, "--version"], capture_output=True, text=True, timeout=5
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION.search(output or "")
+        if match:
+            return match.group(0)
+    return None
+
+
+def _major(version: str) -> str:
+    return version.split(".", 1)[0]
+
+
+class DriverCache:
+    """Cache em JSON: versão do Chrome -> caminho do chromedriver"""
+
+    def __init__(self, path: str = DEFAULT_DRIVER_CACHE):
+        """Inicializa o cache no arquivo informado"""
+        self.path = path
+
+    def load(self) -> Dict[str, str]:
+        """Entradas do cache (vazio se o arquivo não existe ou está corrompido)"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, version: str) -> Optional[str]:
+        """Driver válido para a versão (ou, na falta, para a mesma versão principal)"""
+        entries = self.load()
+        path = entries.get(version)
+        if is_executable(path):
+            return path
+
+        # O chromedriver é compatível dentro da mesma versão principal
+        for cached_version, cached_path in sorted(entries.items(), reverse=True):
+            if _major(cached_version) == _major(version) and is_executable(cached_path):
+                return cached_path
+        return None
+
+    def put(self, version: str, driver_path: str) -> None:
+        """Grava a entrada, removendo as que apontam para drivers inexistentes"""
+        entries = {v: p for v, p in self.load().items() if is_executable(p)}
+        entries[version] = driver_path
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _download_driver() -> str:
+    """Resolve o driver pelo webdriver-manager (pode acessar a rede)"""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def resolve_driver(config: Config) -> DriverResolution:
+    """Caminho do chromedriver: Config, cache por versão do Chrome ou download"""
+    start = time.monotonic()
+
+    if config.chromedriver_path:
+        if not is_executable(config.chromedriver_path):
+            raise ConnectionError(
+                "chromedriver não encontrado ou sem permissão: "
+                f"{config.chromedriver_path}"
+            )
+        return DriverResolution(
+            config.chromedriver_path, SOURCE_CONFIG, elapsed=time.monotonic() - start
+        )
+
+    cache = DriverCache(config.driver_cache_path)
+    version = chrome_version(config.chrome_binary)
+    if version:
+        path = cache.get(version)
+        if path:
+            return DriverResolution(
+                path, SOURCE_CACHE, version, time.monotonic() - start
+            )
+    else:
+        logger.warning(
+            "Versão do Chrome não detectada; o cache do chromedriver não será usado"
+        )
+
+    path = _download_driver()
+    if version:
+        try:
+            cache.put(version, path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o cache do chromedriver: {e}")
+    return DriverResolution(path, SOURCE_DOWNLOAD, version, time.monotonic() - start)
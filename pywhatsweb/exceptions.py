@@ -40,6 +40,25 @@ def __init__(self, message: str = "Timeout na operação"):
         super().__init__(message, "TIMEOUT_ERROR")
 
 
+class MediaDownloadError(WhatsAppError):
+    """Erro ao baixar mídia recebida"""
+    
+    def __init__(self, message: str = "Erro ao baixar mídia"):
+        super().__init__(message, "DOWNLOAD_ERROR")
+
+
+class WorkerDied(WhatsAppError):
+    """Sessão do pool encerrada durante um envio (não se sabe se foi entregue)"""
+    
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        message = (
+            f"Sessão {worker_id} encerrada durante o envio; "
+            "a entrega não foi confirmada"
+        )
+        super().__init__(message, "WORKER_DIED")
+
+
 class ElementNotFoundError(WhatsAppError):
     """Elemento não encontrado na página"""
     
@@ -47,7 +66,7 @@ def __init__(self, message: str = "Elemento não encontrado"):
         super().__init__(message, "ELEMENT_NOT_FOUND")
 
 
-class InvalidPhoneError(WhatsAppError):
+class InvalidPhoneError(WhatsAppError, ValueError):
     """Número de telefone inválido"""
     
     def __init__(self, phone: str):
@@ -0,0 +1,173 @@
+"""
+Conversão dos dados extraídos da página em modelos do PyWhatsWeb
+
+O observer injetado (``scripts.INSTALL_MESSAGE_OBSERVER``) e o dreno
+(``scripts.DRAIN_MESSAGES``) devolvem, em uma única chamada ao driver, um
+payload compacto ``{"m": [...], "c": [...]}`` com listas posicionais:
+
+- mensagem: ``[id, chat, sender, type, text, ts_ms, quoted_id, pre_plain, media_url]``
+- chat: ``[jid, name, unread, preview]``
+"""
+
+import logging
+import mimetypes
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .models import Chat, ContactTable, Message, MessageType
+from .models import contacts as default_contacts
+
+logger = logging.getLogger(__name__)
+
+# Índices do registro de mensagem
+(
+    MSG_ID,
+    MSG_CHAT,
+    MSG_SENDER,
+    MSG_TYPE,
+    MSG_TEXT,
+    MSG_TS,
+    MSG_QUOTED,
+    MSG_PRE_PLAIN,
+    MSG_MEDIA,
+) = range(9)
+
+# Índices do registro de chat
+CHAT_JID, CHAT_NAME, CHAT_UNREAD, CHAT_PREVIEW = range(4)
+
+# "[10:15, 18/10/2026] Nome: " ou "[10:15 AM, 10/18/2026] Nome: "
+_PRE_PLAIN = re.compile(
+    r"^\[(\d{1,2}):(\d{2})(?:\s*([AaPp])\.?\s*[Mm]\.?)?,"
+    r"\s*(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})\]"
+)
+
+_MESSAGE_TYPES = {member.value: member for member in MessageType}
+
+
+def media_type(file_path: str) -> MessageType:
+    """Tipo de mensagem de um arquivo enviado, pelo tipo MIME"""
+    mime = mimetypes.guess_type(file_path)[0] or ""
+    kind = mime.split("/", 1)[0]
+    if kind in ("image", "video", "audio"):
+        return _MESSAGE_TYPES[kind]
+    return MessageType.DOCUMENT
+
+
+def parse_timestamp(
+    pre_plain: Optional[str], fallback_ms: Optional[float], day_first: bool = True
+) -> datetime:
+    """Extrai a data/hora de ``data-pre-plain-text``
+
+    Usa o horário de captura (``fallback_ms``) quando o atributo não existe
+    ou não pode ser interpretado.
+    """
+    match = _PRE_PLAIN.match(pre_plain) if pre_plain else None
+    if match:
+        hour, minute, meridiem, first, second, year = match.groups()
+        hour, minute, year = int(hour), int(minute), int(year)
+        if year < 100:
+            year += 2000
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem.lower() == "p" else 0)
+        day, month = (
+            (int(first), int(second)) if day_first else (int(second), int(first))
+        )
+        if month > 12:
+            day, month = month, day
+        try:
+            return datetime(year, month, day, hour, minute)
+        except ValueError:
+            pass
+
+    if fallback_ms:
+        return datetime.fromtimestamp(fallback_ms / 1000)
+    return datetime.now()
+
+
+def parse_message(
+    record: Sequence[Any],
+    own_phone: Optional[str] = None,
+    contacts: Optional[ContactTable] = None,
+    day_first: bool = True,
+) -> Optional[Message]:
+    """Converte um registro compacto em Message (None se inválido)"""
+    contacts = default_contacts if contacts is None else contacts
+    try:
+        chat_jid = record[MSG_CHAT]
+        chat = contacts.get(chat_jid)
+        sender = contacts.get(record[MSG_SENDER])
+
+        if not chat.is_group and own_phone:
+            recipient = contacts.get(f"{own_phone}@c.us")
+        else:
+            recipient = chat
+
+        message_type = _MESSAGE_TYPES.get(record[MSG_TYPE], MessageType.TEXT)
+        content = record[MSG_TEXT] or ""
+        if not content and message_type is not MessageType.TEXT:
+            # Mídia sem legenda: a mídia em si não vem no payload
+            content = f"[{message_type.value.upper()}]"
+
+        metadata = {"chat": chat_jid}
+        if record[MSG_QUOTED]:
+            metadata["quoted_id"] = record[MSG_QUOTED]
+        if len(record) > MSG_MEDIA and record[MSG_MEDIA]:
+            metadata["media_url"] = record[MSG_MEDIA]
+
+        return Message(
+            id=record[MSG_ID],
+            content=content,
+            sender=sender,
+            recipient=recipient,
+            message_type=message_type,
+            timestamp=parse_timestamp(
+                record[MSG_PRE_PLAIN], record[MSG_TS], day_first=day_first
+            ),
+            metadata=metadata,
+        )
+    except (IndexError, KeyError, TypeError, ValueError) as e:
+        logger.debug(f"Registro de mensagem ignorado: {record!r} ({e})")
+        return None
+
+
+def parse_chat(
+    record: Sequence[Any], contacts: Optional[ContactTable] = None
+) -> Optional[Chat]:
+    """Converte um registro compacto da lista de chats em Chat"""
+    contacts = default_contacts if contacts is None else contacts
+    try:
+        contact = contacts.get(record[CHAT_JID])
+        if record[CHAT_NAME]:
+            contact.name = record[CHAT_NAME]
+        return Chat(
+            contact=contact,
+            unread_count=int(record[CHAT_UNREAD] or 0),
+            last_message=record[CHAT_PREVIEW],
+        )
+    except (IndexError, TypeError, ValueError) as e:
+        logger.debug(f"Registro de chat ignorado: {record!r} ({e})")
+        return None
+
+
+def parse_payload(
+    payload: Dict[str, Any], own_phone: Optional[str] = None, day_first: bool = True
+) -> Tuple[List[Message], List[Chat]]:
+    """Converte o payload do dreno em mensagens e diferenças de chats
+
+    ``day_first`` indica a ordem das datas da página (``Config.day_first``).
+    """
+    contacts = default_contacts
+    messages = []
+    for record in payload.get("m") or ():
+        message = parse_message(record, own_phone, contacts, day_first)
+        if message is not None:
+            messages.append(message)
+
+    chats = []
+    for record in payload.get("c") or ():
+        chat = parse_chat(record, contacts)
+        if chat is not None:
+            chats.append(chat)
+
+    return messages, chats
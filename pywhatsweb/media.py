@@ -0,0 +1,229 @@
+"""
+Preparação de mídias antes do envio
+
+Imagens grandes são reduzidas e recomprimidas antes de chegarem à fila de
+envio (na própria thread ou, opcionalmente, em um pool de processos), e o
+resultado fica em cache pelo hash do conteúdo: a mesma imagem enviada a
+milhares de contatos é processada uma única vez. Outros tipos de arquivo
+seguem sem alteração.
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .models import MediaMessage
+
+logger = logging.getLogger(__name__)
+
+# Formatos que o pipeline reprocessa
+IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/bmp"}
+
+_CHUNK = 1024 * 1024
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def process_image(
+    source: str, target_base: str, max_dimension: int, quality: int
+) -> str:
+    """Reduz e recomprime uma imagem (na thread chamadora ou no pool)
+
+    Retorna o caminho gerado: JPEG, ou PNG quando há transparência. Se o
+    resultado não ficar menor que o original, o original é copiado.
+    """
+    from PIL import Image, ImageOps  # carregado só quando há imagem a processar
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        if max(image.size) > max_dimension:
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        # Grava em arquivo temporário: o cache só vê artefatos completos
+        tmp_path = f"{target_base}.tmp"
+        if has_alpha:
+            target = f"{target_base}.png"
+            image.save(tmp_path, format="PNG", optimize=True)
+        else:
+            target = f"{target_base}.jpg"
+            image.convert("RGB").save(
+                tmp_path,
+                format="JPEG",
+                quality=quality,
+                optimize=True,
+                progressive=True,
+            )
+
+    if os.path.getsize(tmp_path) >= os.path.getsize(source):
+        target = f"{target_base}{os.path.splitext(source)[1].lower()}"
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+    return target
+
+
+class MediaPipeline:
+    """Prepara mídias com cache por hash do conteúdo
+
+    Com ``workers=0`` (padrão) a imagem é processada na thread que chama
+    ``prepare``; com ``workers > 0`` o processamento vai para um pool de
+    processos e ``prepare`` retorna sem esperar.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_dimension: int = 1600,
+        quality: int = 80,
+        workers: int = 0,
+        hash_cache_size: int = 4096,
+    ):
+        """Inicializa o pipeline (o pool de processos sobe no primeiro uso)"""
+        self.cache_dir = cache_dir
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.workers = workers
+        self.hash_cache_size = hash_cache_size
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._hashes: "OrderedDict[Tuple[str, int, float], str]" = OrderedDict()
+        self.hits = 0
+        self.processed = 0
+
+    def _hash(self, path: str) -> str:
+        """Hash do arquivo, sem reler arquivos que não mudaram (LRU limitado)"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        with self._lock:
+            digest = self._hashes.get(key)
+            if digest is not None:
+                self._hashes.move_to_end(key)
+                return digest
+
+        digest = content_hash(path)
+        with self._lock:
+            self._hashes[key] = digest
+            if len(self._hashes) > self.hash_cache_size:
+                self._hashes.popitem(last=False)
+        return digest
+
+    def _cached(self, base: str, source: str) -> Optional[str]:
+        """Artefato já preparado para o hash (JPEG, PNG ou cópia do original)"""
+        extensions = (".jpg", ".png", os.path.splitext(source)[1].lower())
+        for extension in extensions:
+            path = base + extension
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def prepare(
+        self, media: Union[str, MediaMessage], caption: Optional[str] = None
+    ) -> "Future[MediaMessage]":
+        """Agenda a preparação; o Future resolve no MediaMessage pronto para envio"""
+        if isinstance(media, MediaMessage):
+            source, caption = media.file_path, (
+                caption if caption is not None else media.caption
+            )
+        else:
+            source = media
+
+        result: Future = Future()
+        original = MediaMessage.from_file(source, caption)
+        if original.mime_type not in IMAGE_TYPES:
+            result.set_result(original)
+            return result
+
+        digest = self._hash(source)
+        base = os.path.join(
+            self.cache_dir, f"{digest}-{self.max_dimension}-{self.quality}"
+        )
+
+        # Consulta ao disco fora do lock; uma corrida com um job que acabou de
+        # terminar só reprocessa a imagem (a gravação é atômica)
+        cached = self._cached(base, source)
+        if cached:
+            with self._lock:
+                self.hits += 1
+            result.set_result(MediaMessage.from_file(cached, caption))
+            return result
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        run_here = False
+        with self._lock:
+            job = self._inflight.get(digest)
+            if job is None:
+                if self.workers > 0:
+                    job = self._pool().submit(
+                        process_image, source, base, self.max_dimension, self.quality
+                    )
+                else:
+                    job = Future()
+                    run_here = True
+                self._inflight[digest] = job
+                self.processed += 1
+            else:
+                self.hits += 1
+
+        if run_here:
+            # Sem pool: processa na thread chamadora; outras threads que pedirem
+            # o mesmo conteúdo aguardam este Future
+            try:
+                job.set_result(
+                    process_image(source, base, self.max_dimension, self.quality)
+                )
+            except Exception as e:
+                job.set_exception(e)
+
+        def _done(job: Future) -> None:
+            with self._lock:
+                self._inflight.pop(digest, None)
+            try:
+                result.set_result(MediaMessage.from_file(job.result(), caption))
+            except Exception as e:
+                # Falha no processamento: enviar o arquivo original
+                logger.warning(f"Mídia enviada sem preparação ({source}): {e}")
+                result.set_result(original)
+
+        job.add_done_callback(_done)
+        return result
+
+    def prepare_many(
+        self, items: Iterable[Union[str, Tuple[str, Optional[str]], MediaMessage]]
+    ) -> List["Future[MediaMessage]"]:
+        """Agenda vários arquivos (caminho, (caminho, legenda) ou MediaMessage)"""
+        futures = []
+        for item in items:
+            if isinstance(item, tuple):
+                futures.append(self.prepare(*item))
+            else:
+                futures.append(self.prepare(item))
+        return futures
+
+    def close(self, wait: bool = True) -> None:
+        """Encerra o pool de processos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,302 @@
+"""
+Métricas de latência e contadores do cliente
+
+``Metrics`` registra histogramas de duração por operação (``connect``,
+``send_message``, recepção, despacho...) e contagens de erros por classe de
+exceção. Os dados ficam disponíveis em ``WhatsAppClient.metrics()`` e,
+opcionalmente, em um endpoint HTTP local no formato texto do Prometheus
+(``MetricsServer``). Desativadas, as métricas usam ``NullMetrics``, que não
+faz nada.
+"""
+
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import exceptions
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores dos buckets, em segundos
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+PREFIX = "pywhatsweb"
+
+
+def _error_classes() -> List[str]:
+    """Classes de exceção do PyWhatsWeb (sempre presentes na contagem de erros)"""
+    return sorted(
+        name
+        for name, value in vars(exceptions).items()
+        if isinstance(value, type) and issubclass(value, exceptions.WhatsAppError)
+    )
+
+
+class Histogram:
+    """Histograma de durações com buckets fixos"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # último: acima do maior limite
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        """Contagens acumuladas por bucket (a última é o total, ``+Inf``)"""
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class _Timer:
+    """Mede uma operação e registra o erro, se houver
+
+    Operações aninhadas (ex.: ``open_chat`` dentro de ``send_message``) contam
+    o erro uma única vez, na mais externa, com a exceção que chega ao usuário.
+    """
+
+    __slots__ = ("metrics", "operation", "start")
+
+    def __init__(self, metrics: "Metrics", operation: str):
+        self.metrics = metrics
+        self.operation = operation
+
+    def __enter__(self) -> "_Timer":
+        local = self.metrics._local
+        local.depth = getattr(local, "depth", 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.metrics.observe(self.operation, time.perf_counter() - self.start)
+        local = self.metrics._local
+        local.depth -= 1
+        if exc_type is not None and issubclass(exc_type, Exception) and not local.depth:
+            self.metrics.error(exc_val)
+
+
+class Metrics:
+    """Histogramas por operação, contadores e erros por classe de exceção"""
+
+    enabled = True
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Inicializa as métricas"""
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._errors: Dict[str, int] = dict.fromkeys(_error_classes(), 0)
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """Registra a duração de uma operação"""
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def time(self, operation: str) -> _Timer:
+        """Context manager que mede a operação (e conta exceções)"""
+        return _Timer(self, operation)
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Incrementa um contador"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def error(self, error: BaseException) -> None:
+        """Conta um erro pela classe da exceção"""
+        name = type(error).__name__
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cópia dos valores atuais"""
+        with self._lock:
+            operations = {}
+            for operation, histogram in self._histograms.items():
+                cumulative = histogram.cumulative()
+                operations[operation] = {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "avg": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "buckets": dict(zip(self.buckets + (float("inf"),), cumulative)),
+                }
+            return {
+                "operations": operations,
+                "counters": dict(self._counters),
+                "errors": dict(self._errors),
+            }
+
+    def render(self) -> str:
+        """Métricas no formato texto do Prometheus"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PREFIX}_operation_seconds Duração das operações do cliente",
+            f"# TYPE {PREFIX}_operation_seconds histogram",
+        ]
+        name = f"{PREFIX}_operation_seconds"
+        for operation, data in sorted(snapshot["operations"].items()):
+            labels = f'operation="{operation}"'
+            for bound, count in data["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {data["sum"]!r}')
+            lines.append(f'{name}_count{{{labels}}} {data["count"]}')
+
+        lines.append(f"# HELP {PREFIX}_errors_total Erros por classe de exceção")
+        lines.append(f"# TYPE {PREFIX}_errors_total counter")
+        for name, count in sorted(snapshot["errors"].items()):
+            lines.append(f'{PREFIX}_errors_total{{exception="{name}"}} {count}')
+
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            lines.append(f"{PREFIX}_{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullMetrics:
+    """Métricas desativadas: mesma interface, sem custo"""
+
+    enabled = False
+
+    def observe(self, operation: str, seconds: float) -> None:
+        pass
+
+    def time(self, operation: str) -> _NullTimer:
+        return _NULL_TIMER
+
+    def inc(self, name: str, value: float = 1) -> None:
+        pass
+
+    def error(self, error: BaseException) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"operations": {}, "counters": {}, "errors": {}}
+
+    def render(self) -> str:
+        return ""
+
+
+def timed(operation: str) -> Callable:
+    """Decorador de métodos do cliente: mede a chamada em ``self._metrics``
+
+    Com rastreamento ativo (``self.tracer``), a chamada também abre um span.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            metrics, tracer = self._metrics, self.tracer
+            if not metrics.enabled and not tracer.enabled:
+                return func(self, *args, **kwargs)
+            with tracer.span(operation), metrics.time(operation):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsServer:
+    """Endpoint HTTP local com as métricas (``GET /metrics``)"""
+
+    def __init__(self, metrics: Metrics, port: int = 9464, host: str = "127.0.0.1"):
+        """Inicializa o servidor (``port=0`` escolhe uma porta livre)"""
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsServer":
+        """Sobe o servidor em uma thread de fundo"""
+        if self._server is not None:
+            return self
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("metrics: " + format % args)
+
+        self._server = _ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="pywhatsweb-metrics", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Métricas em http://{self.host}:{self.port}/metrics")
+        return self
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def close(self) -> None:
+        """Encerra o servidor"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
@@ -2,11 +2,15 @@
 Modelos de dados para PyWhatsWeb
 """
 
+import hashlib
+import weakref
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
+from . import phones
+
 
 class MessageType(Enum):
     """Tipos de mensagem"""
@@ -42,16 +46,121 @@ class Contact:
     last_seen: Optional[datetime] = None
     
     def __post_init__(self):
-        """Valida e formata o telefone"""
+        """Valida e formata o telefone (E.164 sem o "+", como no WhatsApp)"""
         if not self.phone:
             raise ValueError("Telefone é obrigatório")
         
-        # Remove caracteres especiais e formata
-        self.phone = ''.join(filter(str.isdigit, self.phone))
-        
-        # Adiciona código do país se não tiver
-        if not self.phone.startswith('55') and len(self.phone) <= 11:
-            self.phone = '55' + self.phone
+        if self.is_group:
+            # ID de grupo não é telefone: apenas os dígitos
+            self.phone = ''.join(filter(str.isdigit, self.phone))
+        else:
+            self.phone = phones.to_whatsapp(self.phone)
+
+
+class ContactTable:
+    """Tabela de contatos compartilhados (flyweight) por JID
+    
+    Mensagens do mesmo remetente passam a apontar para um único Contact.
+    As entradas são referências fracas: contatos sem uso são liberados.
+    """
+    
+    def __init__(self) -> None:
+        self._contacts: "weakref.WeakValueDictionary[str, Contact]" = (
+            weakref.WeakValueDictionary()
+        )
+    
+    def get(self, jid: str) -> Contact:
+        """Contato do JID ("5511999999999@c.us", "...@g.us" ou só o número)"""
+        contact = self._contacts.get(jid)
+        if contact is None:
+            number, _, server = jid.partition("@")
+            # JIDs já trazem o código do país
+            is_group = server == "g.us"
+            phone = number if is_group else f"+{number}"
+            contact = Contact(phone=phone, is_group=is_group)
+            self._contacts[jid] = contact
+        return contact
+    
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+
+# Tabela padrão usada na conversão das mensagens recebidas
+contacts = ContactTable()
+
+
+class ContactSet:
+    """Conjunto de contatos indexado pelo telefone, na ordem de inserção
+    
+    Mantém a interface de lista usada até aqui (``append``, ``remove``,
+    ``in``, iteração, índice), com pertinência, inclusão e remoção em O(1).
+    """
+    
+    __slots__ = ("_contacts",)
+    
+    def __init__(self, contacts: Iterable[Contact] = ()):
+        """Inicializa a partir de contatos (duplicados pelo telefone são ignorados)"""
+        self._contacts: Dict[str, Contact] = {}
+        for contact in contacts:
+            self.add(contact)
+    
+    @staticmethod
+    def _key(item: Union[Contact, str]) -> str:
+        return item.phone if isinstance(item, Contact) else item
+    
+    def add(self, contact: Contact) -> bool:
+        """Adiciona o contato (False se o telefone já estava presente)"""
+        if contact.phone in self._contacts:
+            return False
+        self._contacts[contact.phone] = contact
+        return True
+    
+    append = add
+    
+    def discard(self, item: Union[Contact, str]) -> Optional[Contact]:
+        """Remove pelo contato ou telefone, se presente"""
+        return self._contacts.pop(self._key(item), None)
+    
+    def remove(self, item: Union[Contact, str]) -> None:
+        """Remove pelo contato ou telefone (ValueError se ausente, como em list)"""
+        if self.discard(item) is None:
+            raise ValueError(f"Contato não está no conjunto: {self._key(item)}")
+    
+    def get(self, phone: str) -> Optional[Contact]:
+        """Contato pelo telefone"""
+        return self._contacts.get(phone)
+    
+    def phones(self) -> List[str]:
+        """Telefones, na ordem de inserção"""
+        return list(self._contacts)
+    
+    def clear(self) -> None:
+        """Remove todos os contatos"""
+        self._contacts.clear()
+    
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, (Contact, str)):
+            return self._key(item) in self._contacts
+        return False
+    
+    def __iter__(self) -> Iterator[Contact]:
+        return iter(self._contacts.values())
+    
+    def __len__(self) -> int:
+        return len(self._contacts)
+    
+    def __getitem__(self, index: int) -> Contact:
+        return list(self._contacts.values())[index]
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ContactSet):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"ContactSet({list(self._contacts.values())!r})"
 
 
 @dataclass
@@ -59,26 +168,53 @@ class Group:
     """Modelo de grupo"""
     id: str
     name: str
-    participants: List[Contact] = field(default_factory=list)
-    admins: List[Contact] = field(default_factory=list)
+    participants: ContactSet = field(default_factory=ContactSet)
+    admins: ContactSet = field(default_factory=ContactSet)
     description: Optional[str] = None
     invite_link: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
+    def __post_init__(self):
+        """Aceita listas de contatos e converte para ContactSet"""
+        if not isinstance(self.participants, ContactSet):
+            self.participants = ContactSet(self.participants)
+        if not isinstance(self.admins, ContactSet):
+            self.admins = ContactSet(self.admins)
+    
     def add_participant(self, contact: Contact):
         """Adiciona participante ao grupo"""
-        if contact not in self.participants:
-            self.participants.append(contact)
+        self.participants.add(contact)
     
     def remove_participant(self, contact: Contact):
-        """Remove participante do grupo"""
-        if contact in self.participants:
-            self.participants.remove(contact)
+        """Remove participante do grupo (e da lista de admins)"""
+        self.participants.discard(contact)
+        self.admins.discard(contact)
     
     def is_admin(self, contact: Contact) -> bool:
         """Verifica se o contato é admin"""
         return contact in self.admins
+    
+    def sync_participants(
+        self, contacts: Iterable[Contact]
+    ) -> Tuple[List[Contact], List[Contact]]:
+        """Substitui os participantes pela lista atual
+        
+        Retorna (adicionados, removidos).
+        
+        Participantes que permanecem mantêm a posição; os novos entram no
+        final, na ordem recebida. Removidos deixam também de ser admins.
+        """
+        current = ContactSet(contacts)
+        removed = [c for c in self.participants if c.phone not in current]
+        added = [c for c in current if c.phone not in self.participants]
+        
+        for contact in removed:
+            self.participants.discard(contact)
+            self.admins.discard(contact)
+        for contact in added:
+            self.participants.add(contact)
+        return added, removed
 
 
 @dataclass
@@ -95,6 +231,31 @@ def __post_init__(self):
         import os
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {self.file_path}")
+    
+    @classmethod
+    def from_file(cls, file_path: str, caption: Optional[str] = None) -> "MediaMessage":
+        """Cria a partir de um arquivo (tipo pela extensão, tamanho real)"""
+        import mimetypes
+        import os
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        return cls(
+            file_path=file_path,
+            mime_type=mimetypes.guess_type(file_path)[0] or "application/octet-stream",
+            file_size=os.path.getsize(file_path),
+            caption=caption or None,
+        )
+
+
+def stable_message_id(sender: str, recipient: str, timestamp: datetime,
+                      message_type: str, content: str) -> str:
+    """ID determinístico para mensagens sem a chave do WhatsApp
+    
+    Usa um resumo (blake2b) dos campos, igual entre processos e execuções.
+    """
+    fields = (sender, recipient, timestamp.isoformat(), message_type, content or "")
+    data = "\x1f".join(fields)
+    return f"msg_{hashlib.blake2b(data.encode(), digest_size=12).hexdigest()}"
 
 
 @dataclass
@@ -118,7 +279,17 @@ def __post_init__(self):
             raise ValueError("Mensagem deve ter conteúdo ou mídia")
         
         if not self.id:
-            self.id = f"msg_{int(self.timestamp.timestamp())}_{hash(self.content)}"
+            self.id = stable_message_id(
+                self.sender.phone, self.recipient.phone, self.timestamp,
+                self.message_type.value, self.content,
+            )
+    
+    @property
+    def reply_to_id(self) -> Optional[str]:
+        """ID da mensagem respondida"""
+        if self.reply_to is not None:
+            return self.reply_to.id
+        return self.metadata.get("quoted_id")
     
     def is_from_me(self) -> bool:
         """Verifica se a mensagem é do usuário atual"""
@@ -137,6 +308,155 @@ def get_formatted_content(self) -> str:
                 return f"{media_info} {self.content}"
             return media_info
         return self.content
+    
+    def compact(self) -> "CompactMessage":
+        """Versão compacta para guardar em memória"""
+        return CompactMessage.from_message(self)
+
+
+class CompactMessage:
+    """Mensagem com ``__slots__`` para manter muitas mensagens em memória
+    
+    Guarda o horário como timestamp, a resposta como ID (``reply_to_id``) e
+    só aloca ``metadata`` quando usado. Remetente e destinatário devem vir de
+    uma ``ContactTable`` para serem compartilhados entre mensagens.
+    """
+    
+    __slots__ = (
+        "id", "content", "sender", "recipient", "message_type", "_timestamp",
+        "status", "media", "reply_to_id", "forwarded", "_metadata",
+    )
+    
+    def __init__(self, id: str, content: str, sender: Contact, recipient: Contact,
+                 message_type: MessageType = MessageType.TEXT,
+                 timestamp: Optional[datetime] = None,
+                 status: MessageStatus = MessageStatus.PENDING,
+                 media: Optional[MediaMessage] = None,
+                 reply_to_id: Optional[str] = None,
+                 forwarded: bool = False,
+                 metadata: Optional[Dict[str, Any]] = None):
+        """Inicializa a mensagem"""
+        if not content and not media:
+            raise ValueError("Mensagem deve ter conteúdo ou mídia")
+        
+        self.id = id
+        self.content = content
+        self.sender = sender
+        self.recipient = recipient
+        self.message_type = message_type
+        self._timestamp = (timestamp or datetime.now()).timestamp()
+        self.status = status
+        self.media = media
+        self.reply_to_id = reply_to_id
+        self.forwarded = forwarded
+        self._metadata = metadata or None
+    
+    @classmethod
+    def from_message(cls, message: Message) -> "CompactMessage":
+        """Converte uma Message"""
+        metadata = message.metadata
+        if "quoted_id" in metadata:
+            metadata = {k: v for k, v in metadata.items() if k != "quoted_id"}
+        return cls(
+            id=message.id,
+            content=message.content,
+            sender=message.sender,
+            recipient=message.recipient,
+            message_type=message.message_type,
+            timestamp=message.timestamp,
+            status=message.status,
+            media=message.media,
+            reply_to_id=message.reply_to_id,
+            forwarded=message.forwarded,
+            metadata=metadata,
+        )
+    
+    def to_message(self) -> Message:
+        """Converte de volta para Message"""
+        metadata = dict(self._metadata or ())
+        if self.reply_to_id:
+            metadata["quoted_id"] = self.reply_to_id
+        return Message(
+            id=self.id,
+            content=self.content,
+            sender=self.sender,
+            recipient=self.recipient,
+            message_type=self.message_type,
+            timestamp=self.timestamp,
+            status=self.status,
+            media=self.media,
+            forwarded=self.forwarded,
+            metadata=metadata,
+        )
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Data/hora da mensagem"""
+        return datetime.fromtimestamp(self._timestamp)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadados (alocados no primeiro acesso)"""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+    
+    def is_group_message(self) -> bool:
+        """Verifica se é mensagem de grupo"""
+        return self.recipient.is_group
+    
+    def get_formatted_content(self) -> str:
+        """Retorna conteúdo formatado"""
+        if self.media:
+            media_info = f"[{self.message_type.value.upper()}]"
+            if self.content:
+                return f"{media_info} {self.content}"
+            return media_info
+        return self.content
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactMessage):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"CompactMessage(id={self.id!r}, sender={self.sender.phone!r}, "
+            f"content={self.content!r})"
+        )
+    
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+@dataclass
+class Chat:
+    """Modelo de chat (entrada da lista de chats)"""
+    contact: Contact
+    unread_count: int = 0
+    last_message: Optional[str] = None
+    updated_at: datetime = field(default_factory=datetime.now)
+    
+    @property
+    def id(self) -> str:
+        """JID do chat"""
+        suffix = "@g.us" if self.contact.is_group else "@c.us"
+        return f"{self.contact.phone}{suffix}"
+
+
+@dataclass
+class SendResult:
+    """Resultado do envio de um item de lote"""
+    index: int
+    phone: str
+    success: bool
+    error: Optional[Exception] = None
 
 
 @dataclass
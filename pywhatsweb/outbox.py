@@ -0,0 +1,338 @@
+"""
+Outbox persistente do PyWhatsWeb
+
+Registra cada envio em SQLite (modo WAL) com uma chave de idempotência e
+o estado do envio (pending, sending, sent, failed). Ao reabrir, retoma o que
+não foi enviado e ignora chaves já enviadas. As transições de estado são
+agrupadas em transações para que a persistência não limite a vazão.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .models import MediaMessage
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxState(Enum):
+    """Estados de um envio no outbox"""
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+@dataclass
+class OutboxEntry:
+    """Envio registrado no outbox"""
+
+    key: str
+    phone: str
+    content: str
+    caption: Optional[str] = None
+    is_media: bool = False
+    state: OutboxState = OutboxState.PENDING
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    phone TEXT NOT NULL,
+    content TEXT NOT NULL,
+    caption TEXT,
+    is_media INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, seq);
+"""
+
+
+class Outbox:
+    """Fila de saída durável com chaves de idempotência
+
+    ``add`` grava o envio antes de devolver a chave (``add_many`` grava o
+    lote inteiro em uma transação). As transições de estado (``mark_sent``,
+    ``mark_failed``) ficam em buffer e são gravadas em uma única transação
+    quando o buffer atinge ``batch_size``, a cada ``flush_interval`` segundos
+    (por uma thread de fundo) ou em ``flush()``/``claim()``/``close()``.
+    A transição para ``sending`` é gravada antes de devolver o lote, então,
+    após uma queda, apenas os envios em andamento e as confirmações dos
+    últimos ``flush_interval`` segundos podem ser repetidos (entrega pelo
+    menos uma vez).
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.5):
+        """Abre (ou cria) o outbox e recupera envios interrompidos"""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._inserts: List[Tuple] = []
+        self._updates: List[Tuple] = []
+
+        recovered = self.recover()
+        if recovered:
+            logger.info(
+                f"Outbox: {recovered} envios interrompidos voltaram para a fila"
+            )
+
+        # Grava periodicamente as transições em buffer, mesmo sem novas chamadas
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="pywhatsweb-outbox", daemon=True
+            )
+            self._flusher.start()
+
+    def add(
+        self, phone: str, content: Union[str, MediaMessage], key: Optional[str] = None
+    ) -> str:
+        """Registra um envio e retorna sua chave de idempotência
+
+        O envio já está gravado no banco quando a chave é devolvida. Chaves já
+        registradas (em qualquer estado) são ignoradas.
+        """
+        return self.add_many([(phone, content, key)])[0]
+
+    def add_many(
+        self, items: Iterable[Tuple[str, Union[str, MediaMessage], Optional[str]]]
+    ) -> List[str]:
+        """Registra vários envios ``(telefone, conteúdo, chave)`` em uma transação"""
+        keys = []
+        with self._lock:
+            for phone, content, key in items:
+                key = key or uuid.uuid4().hex
+                if isinstance(content, MediaMessage):
+                    self._inserts.append(
+                        (key, phone, content.file_path, content.caption, 1)
+                    )
+                else:
+                    self._inserts.append((key, phone, content, None, 0))
+                keys.append(key)
+            self.flush()
+        return keys
+
+    def claim(self, limit: int = 100) -> List[OutboxEntry]:
+        """Retira até ``limit`` envios pendentes, marcando-os como ``sending``"""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT key, phone, content, caption, is_media, attempts FROM outbox "
+                "WHERE state = ? ORDER BY seq LIMIT ?",
+                (OutboxState.PENDING.value, limit),
+            ).fetchall()
+            if not rows:
+                return []
+
+            now = time.time()
+            with self._transaction():
+                self._conn.executemany(
+                    "UPDATE outbox SET state = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE key = ?",
+                    [(OutboxState.SENDING.value, now, row[0]) for row in rows],
+                )
+
+        return [
+            OutboxEntry(
+                key=key,
+                phone=phone,
+                content=content,
+                caption=caption,
+                is_media=bool(is_media),
+                state=OutboxState.SENDING,
+                attempts=attempts + 1,
+            )
+            for key, phone, content, caption, is_media, attempts in rows
+        ]
+
+    def mark_sent(self, key: str) -> None:
+        """Marca um envio como concluído"""
+        self._update(key, OutboxState.SENT, None)
+
+    def mark_failed(self, key: str, error: Optional[str] = None) -> None:
+        """Marca um envio como falho"""
+        self._update(key, OutboxState.FAILED, error)
+
+    def retry_failed(self) -> int:
+        """Devolve os envios falhos para a fila"""
+        return self._reset(OutboxState.FAILED)
+
+    def recover(self) -> int:
+        """Devolve para a fila os envios interrompidos em ``sending``"""
+        return self._reset(OutboxState.SENDING)
+
+    def get(self, key: str) -> Optional[OutboxEntry]:
+        """Retorna o envio com a chave informada"""
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(
+                "SELECT key, phone, content, caption, is_media, state, attempts, error "
+                "FROM outbox WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        key, phone, content, caption, is_media, state, attempts, error = row
+        return OutboxEntry(
+            key=key,
+            phone=phone,
+            content=content,
+            caption=caption,
+            is_media=bool(is_media),
+            state=OutboxState(state),
+            attempts=attempts,
+            error=error,
+        )
+
+    def process(self, client: Any, batch_size: int = 100) -> Dict[str, int]:
+        """Envia todos os pendentes pelo cliente e retorna os contadores"""
+        counts = {"sent": 0, "failed": 0}
+        while True:
+            entries = self.claim(batch_size)
+            if not entries:
+                break
+            for entry in entries:
+                try:
+                    if entry.is_media:
+                        client.send_media(
+                            entry.phone, entry.content, entry.caption or ""
+                        )
+                    else:
+                        client.send_message(entry.phone, entry.content)
+                except Exception as e:
+                    self.mark_failed(entry.key, str(e))
+                    counts["failed"] += 1
+                else:
+                    self.mark_sent(entry.key)
+                    counts["sent"] += 1
+        self.flush()
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de envios por estado"""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM outbox GROUP BY state"
+            ).fetchall()
+        counts = {state.value: 0 for state in OutboxState}
+        counts.update(dict(rows))
+        return counts
+
+    def flush(self) -> None:
+        """Grava as operações em buffer em uma única transação"""
+        with self._lock:
+            if self._inserts or self._updates:
+                now = time.time()
+                with self._transaction():
+                    if self._inserts:
+                        self._conn.executemany(
+                            "INSERT OR IGNORE INTO outbox "
+                            "(key, phone, content, caption, is_media, "
+                            "state, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [
+                                row + (OutboxState.PENDING.value, now)
+                                for row in self._inserts
+                            ],
+                        )
+                    if self._updates:
+                        self._conn.executemany(
+                            "UPDATE outbox SET state = ?, error = ?, updated_at = ? "
+                            "WHERE key = ?",
+                            [
+                                (state, error, now, key)
+                                for key, state, error in self._updates
+                            ],
+                        )
+                self._inserts.clear()
+                self._updates.clear()
+
+    def close(self) -> None:
+        """Para a gravação periódica, grava o buffer e fecha o banco"""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _flush_loop(self) -> None:
+        """Laço da thread de gravação periódica"""
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Outbox: falha ao gravar o buffer: {e}")
+
+    def _update(self, key: str, state: OutboxState, error: Optional[str]) -> None:
+        """Enfileira uma transição de estado"""
+        with self._lock:
+            self._updates.append((key, state.value, error))
+            self._maybe_flush()
+
+    def _reset(self, state: OutboxState) -> int:
+        """Volta para ``pending`` os envios no estado informado"""
+        with self._lock:
+            self.flush()
+            with self._transaction():
+                cursor = self._conn.execute(
+                    "UPDATE outbox SET state = ?, updated_at = ? WHERE state = ?",
+                    (OutboxState.PENDING.value, time.time(), state.value),
+                )
+            return cursor.rowcount
+
+    def _maybe_flush(self) -> None:
+        """Grava o buffer se atingiu o tamanho (ou sem gravação periódica)"""
+        if len(self._updates) >= self.batch_size or self._flusher is None:
+            self.flush()
+
+    def _transaction(self) -> "_Transaction":
+        """Transação explícita (a conexão está em modo autocommit)"""
+        return _Transaction(self._conn)
+
+    def __enter__(self) -> "Outbox":
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit"""
+        self.close()
+
+
+class _Transaction:
+    """BEGIN/COMMIT com ROLLBACK em caso de erro"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,169 @@
+"""
+Normalização e validação de números de telefone
+
+Converte números digitados ou importados de listas para E.164
+(``+5511999999999``). Números sem código do país são interpretados no país
+informado (o cliente passa ``Config.default_country``) ou no padrão do módulo
+(``set_default_country``); números com ``+`` ou ``00`` são tratados como
+internacionais. O WhatsApp usa o formato E.164 sem o ``+`` (``to_whatsapp``).
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from .exceptions import InvalidPhoneError
+
+
+class CountryRule(NamedTuple):
+    """Código do país, tamanhos do número nacional e prefixo de discagem interurbana"""
+
+    code: str
+    lengths: FrozenSet[int]
+    trunk: str = ""
+
+
+# Tamanhos do número nacional (sem o código do país e sem o prefixo interurbano)
+COUNTRIES: Dict[str, CountryRule] = {
+    "BR": CountryRule("55", frozenset({10, 11}), "0"),
+    "US": CountryRule("1", frozenset({10}), "1"),
+    "CA": CountryRule("1", frozenset({10}), "1"),
+    "MX": CountryRule("52", frozenset({10})),
+    "AR": CountryRule("54", frozenset({10, 11}), "0"),
+    "CL": CountryRule("56", frozenset({9})),
+    "CO": CountryRule("57", frozenset({10})),
+    "PE": CountryRule("51", frozenset({8, 9})),
+    "UY": CountryRule("598", frozenset({8}), "0"),
+    "PY": CountryRule("595", frozenset({9}), "0"),
+    "BO": CountryRule("591", frozenset({8})),
+    "VE": CountryRule("58", frozenset({10}), "0"),
+    "PT": CountryRule("351", frozenset({9})),
+    "ES": CountryRule("34", frozenset({9})),
+    "FR": CountryRule("33", frozenset({9}), "0"),
+    "IT": CountryRule("39", frozenset({9, 10, 11})),
+    "DE": CountryRule("49", frozenset({10, 11}), "0"),
+    "GB": CountryRule("44", frozenset({10}), "0"),
+    "IN": CountryRule("91", frozenset({10}), "0"),
+    "AO": CountryRule("244", frozenset({9})),
+    "MZ": CountryRule("258", frozenset({9})),
+}
+
+_LENGTHS_BY_CODE: Dict[str, FrozenSet[int]] = {}
+for _rule in COUNTRIES.values():
+    _LENGTHS_BY_CODE[_rule.code] = (
+        _LENGTHS_BY_CODE.get(_rule.code, frozenset()) | _rule.lengths
+    )
+
+# Limites do E.164 (código do país incluído)
+MIN_LENGTH = 8
+MAX_LENGTH = 15
+
+# Remove a pontuação usual de números digitados
+_PUNCTUATION = str.maketrans("", "", " -.()/\t\u00a0")
+
+_default_country = "BR"
+
+
+def _country(country: Optional[str]) -> str:
+    """País informado ou padrão, validado"""
+    country = (country or _default_country).upper()
+    if country not in COUNTRIES:
+        raise ValueError(f"País não suportado: {country}")
+    return country
+
+
+def set_default_country(country: str) -> None:
+    """Define o país usado para números sem código do país"""
+    global _default_country
+    _default_country = _country(country)
+
+
+def get_default_country() -> str:
+    """País padrão atual"""
+    return _default_country
+
+
+@lru_cache(maxsize=65536)
+def _normalize(raw: str, country: str) -> str:
+    """Normalização com cache por (número, país)"""
+    number = raw.strip().translate(_PUNCTUATION)
+    international = False
+    if number.startswith("+"):
+        number, international = number[1:], True
+    elif number.startswith("00"):
+        number, international = number[2:], True
+
+    if not number.isdigit() or not number.isascii():
+        raise InvalidPhoneError(raw)
+
+    if not international:
+        rule = COUNTRIES[country]
+        national = number
+        if (
+            rule.trunk
+            and national.startswith(rule.trunk)
+            and len(national) - len(rule.trunk) in rule.lengths
+        ):
+            national = national[len(rule.trunk) :]
+        if len(national) in rule.lengths:
+            number = rule.code + national
+        elif not _has_country_code(number):
+            raise InvalidPhoneError(raw)
+
+    if not MIN_LENGTH <= len(number) <= MAX_LENGTH:
+        raise InvalidPhoneError(raw)
+    return "+" + number
+
+
+def _has_country_code(number: str) -> bool:
+    """Número sem ``+`` que já começa com um código de país conhecido"""
+    for size in (1, 2, 3):
+        lengths = _LENGTHS_BY_CODE.get(number[:size])
+        if lengths and len(number) - size in lengths:
+            return True
+    return False
+
+
+def normalize(raw: str, country: Optional[str] = None) -> str:
+    """Número em E.164 (``+5511999999999``); InvalidPhoneError se inválido"""
+    if not isinstance(raw, str) or not raw:
+        raise InvalidPhoneError(str(raw))
+    return _normalize(raw, _country(country))
+
+
+def to_whatsapp(raw: str, country: Optional[str] = None) -> str:
+    """Número no formato do WhatsApp (E.164 sem o ``+``)"""
+    return normalize(raw, country)[1:]
+
+
+class BulkResult(NamedTuple):
+    """Resultado de ``normalize_many``"""
+
+    numbers: List[Optional[str]]  # mesma ordem da entrada; None nas linhas inválidas
+    errors: Dict[int, str]  # índice da linha -> mensagem de erro
+
+
+def normalize_many(
+    rows: Iterable[str], country: Optional[str] = None, whatsapp: bool = False
+) -> BulkResult:
+    """Normaliza uma lista de números sem interromper nas linhas inválidas"""
+    country = _country(country)
+    start = 1 if whatsapp else 0
+    numbers: List[Optional[str]] = []
+    errors: Dict[int, str] = {}
+    append = numbers.append
+
+    for index, raw in enumerate(rows):
+        try:
+            append(_normalize(raw, country)[start:])
+        except InvalidPhoneError as e:
+            append(None)
+            errors[index] = e.message
+        except (AttributeError, TypeError):
+            append(None)
+            errors[index] = f"Número de telefone inválido: {raw!r}"
+    return BulkResult(numbers, errors)
+
+
+def cache_info() -> Tuple[int, int, int, int]:
+    """Estatísticas do cache de números (hits, misses, maxsize, currsize)"""
+    return tuple(_normalize.cache_info())
@@ -0,0 +1,415 @@
+"""
+Pool de sessões do PyWhatsWeb em processos separados
+
+Cada sessão roda em seu próprio processo, com seu próprio Chrome e
+``user_data_dir``. Os envios são roteados por hash consistente do telefone,
+então as mensagens de um mesmo chat são sempre enviadas em ordem pela mesma
+sessão.
+
+Se uma sessão morre, as tarefas que ela ainda não tinha começado vão para
+outra sessão; as que estavam em andamento falham com ``WorkerDied``, pois
+não há como saber se chegaram ao WhatsApp. Cabe a quem enviou (ou ao
+``Outbox``) decidir se reenvia.
+"""
+
+import bisect
+import dataclasses
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from . import phones
+from .config import Config
+from .exceptions import ConnectionError, MessageError, WorkerDied
+from .models import MediaMessage
+
+logger = logging.getLogger(__name__)
+
+
+class HashRing:
+    """Anel de hash consistente com nós virtuais"""
+
+    def __init__(self, nodes: Optional[List[int]] = None, replicas: int = 100):
+        """Inicializa o anel"""
+        self.replicas = replicas
+        self._keys: List[int] = []
+        self._nodes: Dict[int, int] = {}
+        for node in nodes or []:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Hash estável entre processos (não usa hash() do Python)"""
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def add(self, node: int) -> None:
+        """Adiciona um nó ao anel"""
+        for replica in range(self.replicas):
+            key = self._hash(f"{node}:{replica}")
+            bisect.insort(self._keys, key)
+            self._nodes[key] = node
+
+    def remove(self, node: int) -> None:
+        """Remove um nó do anel"""
+        for replica in range(self.replicas):
+            key = self._hash(f"{node}:{replica}")
+            if self._nodes.pop(key, None) is not None:
+                self._keys.remove(key)
+
+    def get(self, key: str) -> int:
+        """Retorna o nó responsável pela chave"""
+        if not self._keys:
+            raise ConnectionError("Nenhuma sessão disponível no pool")
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._nodes[self._keys[index]]
+
+    @property
+    def nodes(self) -> List[int]:
+        """Nós presentes no anel"""
+        return sorted(set(self._nodes.values()))
+
+
+def _start_session(client: Any) -> None:
+    """Conecta a sessão do processo, passando pelo QR Code se necessário"""
+    # Perfis já autenticados ficam prontos no próprio connect()
+    client.connect()
+    if not client.is_connected:
+        client.wait_for_qr()
+        client.wait_for_connection()
+
+
+def _worker_main(
+    worker_id: int,
+    config: Config,
+    client_factory: Callable[[Config], Any],
+    tasks: "multiprocessing.Queue",
+    events: Connection,
+) -> None:
+    """Laço principal de um processo de sessão
+
+    Os eventos saem por um pipe exclusivo da sessão e são gravados de forma
+    síncrona: se o processo morrer, nenhum lock compartilhado fica preso.
+    """
+    client = client_factory(config)
+    client.on_qr = lambda qr_data: events.send(("qr", worker_id, qr_data))
+
+    try:
+        _start_session(client)
+    except Exception as e:
+        events.send(("error", worker_id, str(e)))
+        return
+
+    events.send(("ready", worker_id, None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            task_id, phone, content = task
+            # Avisado antes do envio: sem este evento, a tarefa pode ser redistribuída
+            events.send(("started", worker_id, task_id))
+            try:
+                if isinstance(content, MediaMessage):
+                    client.send_media(phone, content.file_path, content.caption or "")
+                else:
+                    client.send_message(phone, content)
+                events.send(("result", worker_id, (task_id, None)))
+            except Exception as e:
+                events.send(("result", worker_id, (task_id, str(e))))
+    finally:
+        client.disconnect()
+
+
+class _Worker:
+    """Estado de um processo de sessão no processo pai"""
+
+    def __init__(self, worker_id: int, process: Any, tasks: Any, events: Connection):
+        self.id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.events = events
+        self.events_open = True
+        self.ready = False
+        self.pending: "Dict[int, Tuple[str, Union[str, MediaMessage], Future]]" = {}
+        self.started: Optional[int] = None  # tarefa em andamento
+
+
+class ClientPool:
+    """Gerencia N sessões do WhatsApp em processos separados"""
+
+    def __init__(
+        self,
+        size: int,
+        config: Optional[Config] = None,
+        base_dir: Optional[str] = None,
+        client_factory: Optional[Callable[[Config], Any]] = None,
+    ):
+        """Inicializa o pool (as sessões só sobem em ``start()``)"""
+        if size < 1:
+            raise ValueError("O pool precisa de pelo menos uma sessão")
+
+        self.size = size
+        self.config = config or Config.from_env()
+        self.base_dir = base_dir or self.config.user_data_dir
+        self.client_factory = client_factory or _default_client_factory
+        self.on_qr: Optional[Callable[[int, str], None]] = None
+
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, _Worker] = {}
+        self._ring = HashRing()
+        self._lock = threading.RLock()
+        self._task_ids = itertools.count()
+        self._collector: Optional[threading.Thread] = None
+        self._running = False
+        self._closing = False
+
+        self._started_at: Optional[float] = None
+        self._sent = 0
+        self._failed = 0
+
+    def session_config(self, worker_id: int) -> Config:
+        """Configuração da sessão, com ``user_data_dir`` próprio"""
+        user_data_dir = os.path.join(self.base_dir, f"session_{worker_id}")
+        return dataclasses.replace(self.config, user_data_dir=user_data_dir)
+
+    def start(self) -> None:
+        """Inicia os processos de sessão"""
+        with self._lock:
+            if self._running:
+                return
+            for worker_id in range(self.size):
+                tasks = self._context.Queue()
+                events, child_events = self._context.Pipe(duplex=False)
+                process = self._context.Process(
+                    target=_worker_main,
+                    args=(
+                        worker_id,
+                        self.session_config(worker_id),
+                        self.client_factory,
+                        tasks,
+                        child_events,
+                    ),
+                    name=f"pywhatsweb-session-{worker_id}",
+                    daemon=True,
+                )
+                process.start()
+                # Só o processo filho escreve: fechar aqui permite detectar EOF
+                child_events.close()
+                self._workers[worker_id] = _Worker(worker_id, process, tasks, events)
+                self._ring.add(worker_id)
+
+            self._running = True
+            self._started_at = time.monotonic()
+            self._collector = threading.Thread(
+                target=self._collect, name="pywhatsweb-pool", daemon=True
+            )
+            self._collector.start()
+
+    def submit(self, phone: str, content: Union[str, MediaMessage]) -> Future:
+        """Enfileira um envio e retorna um Future com o resultado"""
+        phone = phones.to_whatsapp(phone, self.config.default_country)
+        future: Future = Future()
+
+        with self._lock:
+            if not self._running:
+                raise ConnectionError("Pool não iniciado")
+            self._dispatch(next(self._task_ids), phone, content, future)
+        return future
+
+    def send_message(self, phone: str, text: str) -> Future:
+        """Enfileira uma mensagem de texto"""
+        return self.submit(phone, text)
+
+    def send_media(self, phone: str, file_path: str, caption: str = "") -> Future:
+        """Enfileira um arquivo de mídia"""
+        return self.submit(phone, MediaMessage.from_file(file_path, caption))
+
+    def _dispatch(
+        self,
+        task_id: int,
+        phone: str,
+        content: Union[str, MediaMessage],
+        future: Future,
+    ) -> None:
+        """Envia a tarefa para a sessão dona do telefone (com o lock adquirido)"""
+        worker = self._workers[self._ring.get(phone)]
+        worker.pending[task_id] = (phone, content, future)
+        worker.tasks.put((task_id, phone, content))
+
+    def _collect(self) -> None:
+        """Recebe eventos dos processos e detecta sessões que morreram"""
+        while self._running:
+            with self._lock:
+                workers = {w.events: w for w in self._workers.values() if w.events_open}
+            if workers:
+                ready = wait(list(workers), timeout=0.5)
+            else:
+                time.sleep(0.5)
+                ready = []
+
+            for conn in ready:
+                self._receive(workers[conn])
+            self._check_workers()
+
+    def _receive(self, worker: _Worker) -> None:
+        """Lê e trata um evento do pipe da sessão"""
+        try:
+            event = worker.events.recv()
+        except (EOFError, OSError):
+            # Processo encerrado: a redistribuição fica com _check_workers
+            worker.events_open = False
+            return
+        self._handle_event(*event)
+
+    def _drain_worker(self, worker: _Worker) -> None:
+        """Trata os eventos que a sessão já enviou"""
+        try:
+            while worker.events_open and worker.events.poll():
+                self._receive(worker)
+        except OSError:
+            worker.events_open = False
+
+    def _handle_event(self, kind: str, worker_id: int, payload: Any) -> None:
+        """Trata um evento de sessão"""
+        if kind == "started":
+            with self._lock:
+                if worker_id in self._workers:
+                    self._workers[worker_id].started = payload
+        elif kind == "result":
+            self._resolve(worker_id, *payload)
+        elif kind == "ready":
+            with self._lock:
+                if worker_id in self._workers:
+                    self._workers[worker_id].ready = True
+            logger.info(f"Sessão {worker_id} pronta")
+        elif kind == "qr":
+            if self.on_qr:
+                self.on_qr(worker_id, payload)
+        elif kind == "error":
+            logger.error(f"Sessão {worker_id} falhou ao conectar: {payload}")
+
+    def _resolve(self, worker_id: int, task_id: int, error: Optional[str]) -> None:
+        """Resolve o Future de uma tarefa concluída"""
+        with self._lock:
+            worker = self._workers.get(worker_id)
+            entry = worker.pending.pop(task_id, None) if worker else None
+            if entry is None:
+                return
+            if worker.started == task_id:
+                worker.started = None
+            if error is None:
+                self._sent += 1
+            else:
+                self._failed += 1
+
+        future = entry[2]
+        if error is None:
+            future.set_result(True)
+        else:
+            future.set_exception(MessageError(f"Falha ao enviar mensagem: {error}"))
+
+    def _check_workers(self) -> None:
+        """Remove sessões mortas do anel e trata suas tarefas pendentes
+
+        A tarefa em andamento falha com ``WorkerDied``; as que ainda estavam na
+        fila da sessão são redistribuídas.
+        """
+        with self._lock:
+            if self._closing:
+                return
+            dead = [w for w in self._workers.values() if not w.process.is_alive()]
+            for worker in dead:
+                # Resultados enviados antes da queda não devem ser reenviados
+                self._drain_worker(worker)
+                worker.events.close()
+                logger.warning(
+                    f"Sessão {worker.id} encerrada com "
+                    f"{len(worker.pending)} tarefas pendentes"
+                )
+                del self._workers[worker.id]
+                self._ring.remove(worker.id)
+
+                for task_id, (phone, content, future) in sorted(worker.pending.items()):
+                    if task_id == worker.started:
+                        self._failed += 1
+                        future.set_exception(WorkerDied(worker.id))
+                    elif self._workers:
+                        self._dispatch(task_id, phone, content, future)
+                    else:
+                        future.set_exception(
+                            ConnectionError("Nenhuma sessão disponível no pool")
+                        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Vazão agregada e profundidade das filas"""
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+            depths = {w.id: len(w.pending) for w in self._workers.values()}
+            return {
+                "workers": len(self._workers),
+                "ready": sum(1 for w in self._workers.values() if w.ready),
+                "sent": self._sent,
+                "failed": self._failed,
+                "throughput": self._sent / elapsed if elapsed else 0.0,
+                "queue_depth": sum(depths.values()),
+                "queue_depth_per_worker": depths,
+            }
+
+    def close(self, timeout: float = 10) -> None:
+        """Encerra as sessões após concluírem as tarefas já enfileiradas"""
+        with self._lock:
+            self._closing = True
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.tasks.put(None)
+
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+        # Parar o coletor e processar os resultados que restaram nos pipes
+        self._running = False
+        if self._collector:
+            self._collector.join(timeout)
+        self._drain_events()
+
+        with self._lock:
+            for worker in self._workers.values():
+                for _phone, _content, future in worker.pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("Pool encerrado"))
+            self._workers.clear()
+            self._ring = HashRing()
+            self._closing = False
+
+    def _drain_events(self) -> None:
+        """Processa eventos ainda não lidos de todas as sessões"""
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            self._drain_worker(worker)
+            worker.events.close()
+
+    def __enter__(self) -> "ClientPool":
+        """Context manager entry"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit"""
+        self.close()
+
+
+def _default_client_factory(config: Config) -> Any:
+    """Cria o cliente padrão de uma sessão"""
+    from .client import WhatsAppClient
+
+    return WhatsAppClient(config=config)
@@ -0,0 +1,149 @@
+"""
+Renderização e acompanhamento do QR Code de autenticação
+
+O WhatsApp Web troca o QR Code periodicamente; o ``QRWatcher`` compara o
+``data-ref`` lido da página com o último renderizado e só gera uma nova
+saída (e dispara ``on_qr``) quando ele realmente muda.
+"""
+
+import io
+import os
+import sys
+from typing import Any, Callable, List, Optional, TextIO
+
+# Modos de saída
+QR_PNG = "png"  # bytes PNG em memória
+QR_TERMINAL = "terminal"  # texto Unicode para terminais
+QR_FILE = "file"  # arquivo PNG por sessão
+QR_NONE = "none"  # nenhuma renderização
+
+QR_MODES = (QR_PNG, QR_TERMINAL, QR_FILE, QR_NONE)
+
+# Meio bloco superior/inferior: duas linhas de módulos por linha de texto
+_BLOCKS = {
+    (False, False): " ",
+    (True, False): "▀",
+    (False, True): "▄",
+    (True, True): "█",
+}
+
+
+def _qr_matrix(data: str, border: int = 2) -> List[List[bool]]:
+    """Matriz de módulos do QR Code (True = escuro)"""
+    import qrcode  # importado sob demanda; a matriz não precisa do PIL
+
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def render_terminal(data: str, invert: bool = True) -> str:
+    """QR Code em blocos Unicode (``invert`` para terminais de fundo escuro)"""
+    matrix = _qr_matrix(data)
+    if invert:
+        matrix = [[not module for module in row] for row in matrix]
+    if len(matrix) % 2:
+        matrix.append([False] * len(matrix[0]))
+
+    lines = []
+    for top, bottom in zip(matrix[::2], matrix[1::2]):
+        lines.append("".join(_BLOCKS[pair] for pair in zip(top, bottom)))
+    return "\n".join(lines)
+
+
+def render_png(data: str, box_size: int = 10, border: int = 4) -> bytes:
+    """QR Code como PNG em memória"""
+    import qrcode  # carrega PIL
+
+    qr = qrcode.QRCode(box_size=box_size, border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class QRRenderer:
+    """Gera a saída do QR Code no modo configurado"""
+
+    def __init__(
+        self,
+        mode: str = QR_FILE,
+        path: Optional[str] = None,
+        stream: Optional[TextIO] = None,
+    ):
+        """Inicializa o renderizador"""
+        if mode not in QR_MODES:
+            raise ValueError(
+                f"Modo de QR Code inválido: {mode} (use {', '.join(QR_MODES)})"
+            )
+        self.mode = mode
+        self.path = path or "whatsapp_qr.png"
+        self.stream = stream
+
+    @classmethod
+    def from_config(cls, config: Any) -> "QRRenderer":
+        """Renderizador a partir do Config (arquivo dentro do diretório da sessão)"""
+        path = config.qr_path or os.path.join(config.user_data_dir, "whatsapp_qr.png")
+        return cls(config.qr_output, path)
+
+    def render(self, data: str) -> Any:
+        """Renderiza: bytes (png), str (terminal), caminho (file) ou None"""
+        if self.mode == QR_PNG:
+            return render_png(data)
+
+        if self.mode == QR_TERMINAL:
+            text = render_terminal(data)
+            stream = self.stream or sys.stdout
+            stream.write(text + "\n")
+            stream.flush()
+            return text
+
+        if self.mode == QR_FILE:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(render_png(data))
+            os.replace(tmp_path, self.path)
+            return self.path
+
+        return None
+
+
+class QRWatcher:
+    """Renderiza o QR Code apenas quando o data-ref da página muda"""
+
+    def __init__(
+        self,
+        renderer: QRRenderer,
+        on_change: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """Inicializa o acompanhamento"""
+        self.renderer = renderer
+        self.on_change = on_change
+        self.ref: Optional[str] = None
+        self.output: Any = None
+        self.rotations = 0
+        self.skipped = 0
+
+    def update(self, ref: Optional[str]) -> bool:
+        """Processa um data-ref lido da página (True se era novo)"""
+        if not ref or ref == self.ref:
+            self.skipped += 1
+            return False
+
+        self.output = self.renderer.render(ref)
+        self.ref = ref
+        self.rotations += 1
+        if self.on_change:
+            self.on_change(ref, self.output)
+        return True
+
+    def reset(self) -> None:
+        """Esquece o último QR Code (ex.: nova sessão)"""
+        self.ref = None
+        self.output = None
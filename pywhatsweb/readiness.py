@@ -0,0 +1,234 @@
+"""
+Camada de prontidão do PyWhatsWeb
+
+Substitui pausas fixas por esperas baseadas em condições concretas do DOM,
+com polling curto e prazo por operação.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .selector_registry import css
+
+# Seletores usados nas condições de prontidão (com as alternativas do registro)
+CHAT_LIST = css("chat_list")
+CHAT_SEARCH = css("chat_search")
+COMPOSE_BOX = css("compose_box")
+SEND_BUTTON = css("send_button")
+MEDIA_CAPTION = css("media_caption")
+PROFILE_DRAWER = css("profile_drawer")
+QR_CANVAS = css("qr_canvas")
+UPLOAD_PENDING = css("upload_pending")
+
+# Lê o data-ref do QR Code em uma única chamada (canvas ou ancestral)
+QR_DATA_REF_SCRIPT = """
+var canvas = document.querySelector(arguments[0]);
+if (!canvas) { return null; }
+var node = canvas.closest('[data-ref]');
+return node ? node.getAttribute('data-ref') : null;
+"""
+
+# Última mensagem enviada no chat aberto: [data-id, envio pendente] ou null.
+# Ignora data-ids aninhados (ex.: mensagem citada dentro da bolha).
+LAST_OUTGOING_SCRIPT = """
+var nodes = document.querySelectorAll("#main [data-id^='true_']");
+for (var i = nodes.length - 1; i >= 0; i--) {
+    var parent = nodes[i].parentElement;
+    if (parent && parent.closest('[data-id]')) { continue; }
+    return [nodes[i].getAttribute('data-id'), !!nodes[i].querySelector(arguments[0])];
+}
+return null;
+"""
+
+# Se a mensagem enviada ainda mostra indicador de envio/upload
+# (null se ela não está na tela)
+MESSAGE_PENDING_SCRIPT = """
+var nodes = document.querySelectorAll("#main [data-id^='true_']");
+for (var i = nodes.length - 1; i >= 0; i--) {
+    if (nodes[i].getAttribute('data-id') === arguments[0]) {
+        return !!nodes[i].querySelector(arguments[1]);
+    }
+}
+return null;
+"""
+
+# Estados detectados na inicialização
+SESSION_AUTHENTICATED = "authenticated"
+SESSION_QR = "qr"
+
+# Decide em uma única chamada se a página mostra a lista de chats ou o QR Code
+SESSION_STATE_SCRIPT = """
+if (document.querySelector(arguments[0])) { return 'authenticated'; }
+var canvas = document.querySelector(arguments[1]);
+var node = canvas && canvas.closest('[data-ref]');
+return node && node.getAttribute('data-ref') ? 'qr' : null;
+"""
+
+Condition = Callable[[Any], Any]
+
+
+def element_present(selector: str) -> Condition:
+    """Condição: elemento presente no DOM"""
+
+    def _condition(driver: Any) -> Any:
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        return elements[0] if elements else False
+
+    return _condition
+
+
+def element_ready(selector: str) -> Condition:
+    """Condição: elemento presente, visível e habilitado"""
+
+    def _condition(driver: Any) -> Any:
+        for element in driver.find_elements(By.CSS_SELECTOR, selector):
+            if element.is_displayed() and element.is_enabled():
+                return element
+        return False
+
+    return _condition
+
+
+def element_absent(selector: str) -> Condition:
+    """Condição: nenhum elemento correspondente no DOM"""
+
+    def _condition(driver: Any) -> Any:
+        return not driver.find_elements(By.CSS_SELECTOR, selector)
+
+    return _condition
+
+
+def all_ready(*conditions: Condition) -> Condition:
+    """Condição: todas as condições satisfeitas (retorna o último resultado)"""
+
+    def _condition(driver: Any) -> Any:
+        result = False
+        for condition in conditions:
+            result = condition(driver)
+            if not result:
+                return False
+        return result
+
+    return _condition
+
+
+def qr_data_ref(selector: str = QR_CANVAS) -> Condition:
+    """Condição: canvas do QR Code com data-ref preenchido"""
+
+    def _condition(driver: Any) -> Any:
+        return driver.execute_script(QR_DATA_REF_SCRIPT, selector) or False
+
+    return _condition
+
+
+def chat_open(phone: str) -> Condition:
+    """Condição: conversa do número aberta e campo de texto pronto"""
+    # Mensagens da conversa aberta começam pelo JID do chat no data-id
+    # ("true_5511999999999@c.us_ID"); ancorar no início evita outro chat cujo
+    # número termine com os mesmos dígitos e grupos, cujos IDs terminam com o
+    # participante ("false_GRUPO@g.us_ID_5511999999999@c.us")
+    return all_ready(
+        element_present(
+            f"#main [data-id^='true_{phone}@'], #main [data-id^='false_{phone}@']"
+        ),
+        element_ready(COMPOSE_BOX),
+    )
+
+
+def last_outgoing(driver: Any) -> Optional[str]:
+    """ID (data-id) da última mensagem enviada no chat aberto"""
+    state = driver.execute_script(LAST_OUTGOING_SCRIPT, UPLOAD_PENDING)
+    return state[0] if state else None
+
+
+def outgoing_after(previous: Optional[str]) -> Condition:
+    """Condição: nova mensagem enviada após ``previous`` (retorna seu data-id)"""
+
+    def _condition(driver: Any) -> Any:
+        state = driver.execute_script(LAST_OUTGOING_SCRIPT, UPLOAD_PENDING)
+        return state[0] if state and state[0] != previous else False
+
+    return _condition
+
+
+def upload_complete(message_id: str) -> Condition:
+    """Condição: a mensagem enviada não tem mais indicador de envio/upload"""
+
+    def _condition(driver: Any) -> Any:
+        return (
+            driver.execute_script(MESSAGE_PENDING_SCRIPT, message_id, UPLOAD_PENDING)
+            is False
+        )
+
+    return _condition
+
+
+def session_state(driver: Any) -> Any:
+    """Condição: sessão autenticada (lista de chats) ou QR Code disponível"""
+    state = driver.execute_script(SESSION_STATE_SCRIPT, CHAT_LIST, QR_CANVAS)
+    return state if state in (SESSION_AUTHENTICATED, SESSION_QR) else False
+
+
+# Condições prontas para as operações do cliente
+compose_box_ready = element_ready(COMPOSE_BOX)
+send_button_ready = element_ready(SEND_BUTTON)
+upload_preview_ready = all_ready(element_present(MEDIA_CAPTION), send_button_ready)
+chat_list_present = element_present(CHAT_LIST)
+profile_loaded = element_present(PROFILE_DRAWER)
+
+
+class ReadinessWaiter:
+    """Aguarda condições do DOM com polling curto e prazo por operação"""
+
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(
+        self,
+        driver: Any,
+        poll_interval: float = 0.05,
+        report: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Inicializa o aguardador"""
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.report = report
+        self.logger = logger or logging.getLogger(__name__)
+        self.timings: Dict[str, float] = {}
+
+    def until(self, condition: Condition, operation: str, timeout: float) -> Any:
+        """Aguarda a condição até o prazo da operação
+
+        Registra o tempo efetivamente gasto em ``timings`` e, se ``report``
+        estiver ativo, informa no log. Propaga ``TimeoutException`` do Selenium
+        para que o cliente traduza no erro adequado.
+        """
+        wait = WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=self.poll_interval,
+            ignored_exceptions=self.IGNORED_EXCEPTIONS,
+        )
+        start = time.monotonic()
+        outcome = "ok"
+        try:
+            return wait.until(condition)
+        except TimeoutException:
+            outcome = "timeout"
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self.timings[operation] = elapsed
+            if self.report:
+                self.logger.info(
+                    f"Espera '{operation}' ({outcome}) levou {elapsed * 1000:.0f} ms"
+                )
@@ -0,0 +1,284 @@
+"""
+Agendador de envios do PyWhatsWeb
+
+Fila de saída com limites de taxa (token bucket global e por destinatário),
+classes de prioridade e espaçamento com jitter, executada em uma thread de
+fundo na frente de ``send_message``/``send_media``.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from . import phones
+from .models import MediaMessage
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Classes de prioridade (menor valor sai primeiro)"""
+
+    TRANSACTIONAL = 0
+    MARKETING = 1
+
+
+class TokenBucket:
+    """Token bucket: ``rate`` tokens por segundo, acumulando até ``capacity``"""
+
+    def __init__(
+        self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ):
+        """Inicializa o bucket cheio"""
+        if rate <= 0:
+            raise ValueError("A taxa deve ser positiva")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Repõe os tokens pelo tempo decorrido"""
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        """Consome tokens se houver saldo"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Segundos até haver saldo para ``tokens``"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class _Item:
+    """Mensagem na fila de saída"""
+
+    __slots__ = ("phone", "content", "priority", "future")
+
+    def __init__(
+        self,
+        phone: str,
+        content: Union[str, MediaMessage],
+        priority: Priority,
+        future: Future,
+    ):
+        self.phone = phone
+        self.content = content
+        self.priority = priority
+        self.future = future
+
+
+class OutboundScheduler:
+    """Agendador de envios com limites de taxa e prioridade
+
+    ``enqueue`` não bloqueia: retorna um ``Future`` resolvido quando a mensagem
+    é enviada. A thread de fundo sempre envia a mensagem de maior prioridade
+    cujo destinatário tem saldo, mantendo o envio no limite seguro sem
+    ultrapassá-lo.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        rate: float = 1.0,
+        burst: float = 5,
+        recipient_rate: float = 0.2,
+        recipient_burst: float = 2,
+        jitter: float = 0.2,
+    ):
+        """Inicializa o agendador
+
+        ``rate``/``burst`` limitam o envio global e ``recipient_rate``/
+        ``recipient_burst`` cada destinatário. ``jitter`` é a fração do
+        intervalo global adicionada aleatoriamente entre envios.
+        """
+        self.client = client
+        self.jitter = jitter
+        # Números sem código do país seguem o país do cliente
+        config = getattr(client, "config", None)
+        self.country: Optional[str] = getattr(config, "default_country", None)
+        self._global = TokenBucket(rate, burst)
+        self._recipient_rate = recipient_rate
+        self._recipient_burst = recipient_burst
+        self._recipients: Dict[str, TokenBucket] = {}
+
+        self._heap: List[Tuple[int, int, _Item]] = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self._sent = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """Inicia a thread de envio"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="pywhatsweb-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Para a thread de envio (por padrão após esvaziar a fila)
+
+        ``timeout`` limita a parada inteira (espera da fila e da thread); o que
+        não foi enviado até o prazo é cancelado.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            if drain:
+                while self._heap and self._running:
+                    remaining = (
+                        0.1
+                        if deadline is None
+                        else min(0.1, deadline - time.monotonic())
+                    )
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+
+        # Cancelar o que sobrou na fila
+        with self._condition:
+            for _priority, _seq, item in self._heap:
+                item.future.cancel()
+            self._heap.clear()
+
+    def enqueue(
+        self,
+        phone: str,
+        content: Union[str, MediaMessage],
+        priority: Priority = Priority.TRANSACTIONAL,
+    ) -> Future:
+        """Enfileira um envio sem bloquear"""
+        phone = phones.to_whatsapp(phone, self.country)
+        item = _Item(phone, content, Priority(priority), Future())
+        with self._condition:
+            heapq.heappush(self._heap, (item.priority, next(self._seq), item))
+            self._condition.notify()
+        return item.future
+
+    def stats(self) -> Dict[str, Any]:
+        """Profundidade da fila e contadores de envio"""
+        with self._condition:
+            by_priority = {p.name.lower(): 0 for p in Priority}
+            for priority, _seq, _item in self._heap:
+                by_priority[Priority(priority).name.lower()] += 1
+            return {
+                "queue_depth": len(self._heap),
+                "queue_depth_by_priority": by_priority,
+                "sent": self._sent,
+                "failed": self._failed,
+            }
+
+    def _bucket(self, phone: str) -> TokenBucket:
+        """Token bucket do destinatário"""
+        bucket = self._recipients.get(phone)
+        if bucket is None:
+            bucket = TokenBucket(self._recipient_rate, self._recipient_burst)
+            self._recipients[phone] = bucket
+        return bucket
+
+    def _next_item(self) -> Tuple[Optional[_Item], float]:
+        """Retira o próximo item elegível ou informa quanto esperar
+
+        Deve ser chamado com o lock adquirido.
+        """
+        global_wait = self._global.wait_time()
+        if global_wait > 0:
+            return None, global_wait
+
+        blocked = []
+        chosen = None
+        wait = float("inf")
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            bucket = self._bucket(entry[2].phone)
+            if bucket.try_consume():
+                chosen = entry[2]
+                break
+            wait = min(wait, bucket.wait_time())
+            blocked.append(entry)
+
+        for entry in blocked:
+            heapq.heappush(self._heap, entry)
+
+        if chosen is not None:
+            self._global.try_consume()
+            # Destinatários sem envio recente não precisam manter o bucket
+            if len(self._recipients) > 4 * max(len(self._heap), 256):
+                self._prune_recipients()
+        return chosen, wait
+
+    def _prune_recipients(self) -> None:
+        """Descarta buckets cheios (equivalentes a um bucket novo)"""
+        self._recipients = {
+            phone: bucket
+            for phone, bucket in self._recipients.items()
+            if bucket.wait_time(bucket.capacity) > 0
+        }
+
+    def _run(self) -> None:
+        """Laço da thread de envio"""
+        while True:
+            with self._condition:
+                while self._running:
+                    item, wait = self._next_item()
+                    if item is not None:
+                        break
+                    self._condition.wait(None if wait == float("inf") else wait)
+                else:
+                    return
+
+            if self.jitter:
+                time.sleep(random.uniform(0, self.jitter / self._global.rate))
+            self._send(item)
+
+    def _send(self, item: _Item) -> None:
+        """Envia um item e resolve o Future"""
+        if not item.future.set_running_or_notify_cancel():
+            return
+        try:
+            if isinstance(item.content, MediaMessage):
+                result = self.client.send_media(
+                    item.phone, item.content.file_path, item.content.caption or ""
+                )
+            else:
+                result = self.client.send_message(item.phone, item.content)
+        except Exception as e:
+            logger.error(f"Erro ao enviar para {item.phone}: {e}")
+            with self._condition:
+                self._failed += 1
+                self._condition.notify_all()
+            item.future.set_exception(e)
+            return
+
+        with self._condition:
+            self._sent += 1
+            self._condition.notify_all()
+        item.future.set_result(result)
@@ -0,0 +1,276 @@
+"""
+Scripts JavaScript injetados na página do WhatsApp Web
+"""
+
+# Instala (uma vez por carregamento da página) um MutationObserver que
+# extrai mensagens recebidas assim que são renderizadas e as acumula em
+# window.__pywhatsweb.buffer, já no formato compacto de pywhatsweb.extraction.
+# Mudanças na lista de chats marcam o estado como "sujo" para que o próximo
+# dreno calcule as diferenças. O histórico renderizado ao abrir outra conversa
+# (#main recriado ou com outro chat) e as mensagens antigas carregadas ao rolar
+# para cima (inseridas acima da última conhecida) não são tratados como novos.
+# Retorna true se o observer está ativo.
+INSTALL_MESSAGE_OBSERVER = """
+var state = window.__pywhatsweb = window.__pywhatsweb || {};
+if (state.observer) { return true; }
+
+state.buffer = [];
+state.waiters = [];
+state.seen = new Set();
+state.seenOrder = [];
+state.chats = {};
+state.chatsDirty = true;
+var SEEN_LIMIT = 5000;
+
+function remember(id) {
+    state.seen.add(id);
+    state.seenOrder.push(id);
+    if (state.seenOrder.length > SEEN_LIMIT) {
+        state.seen.delete(state.seenOrder.shift());
+    }
+}
+
+function messageType(node) {
+    if (node.querySelector('audio, [data-icon="audio-play"], [data-icon="ptt-play"]')) {
+        return 'audio';
+    }
+    if (node.querySelector('video, [data-icon="media-play"]')) { return 'video'; }
+    if (node.querySelector('[data-icon^="document"], [data-testid="document-thumb"]')) {
+        return 'document';
+    }
+    if (node.querySelector('[data-testid="sticker"]')) { return 'sticker'; }
+    if (node.querySelector('img[src^="blob:"]')) { return 'image'; }
+    if (node.querySelector('[data-testid="location"]')) { return 'location'; }
+    return 'text';
+}
+
+function mediaUrl(node) {
+    var media = node.querySelector(
+        'img[src^="blob:"], video[src^="blob:"], audio[src^="blob:"], a[href^="blob:"]'
+    );
+    return media ? (media.getAttribute('src') || media.getAttribute('href')) : null;
+}
+
+function chatOf(node) {
+    return node.getAttribute('data-id').split('_')[1] || null;
+}
+
+// Conversa aberta: tudo o que já está renderizado nela é histórico
+function seed(main) {
+    state.main = main;
+    state.chat = null;
+    state.last = null;
+    if (!main) { return; }
+    var nodes = main.querySelectorAll('[data-id]');
+    for (var i = 0; i < nodes.length; i++) {
+        remember(nodes[i].getAttribute('data-id'));
+    }
+    if (nodes.length) {
+        state.last = nodes[nodes.length - 1];
+        state.chat = chatOf(state.last);
+    }
+}
+
+// Última mensagem conhecida ainda presente em #main
+function lastKnown(main) {
+    if (state.last && state.last.isConnected) { return state.last; }
+    var nodes = main.querySelectorAll('[data-id]');
+    for (var i = nodes.length - 1; i >= 0; i--) {
+        if (state.seen.has(nodes[i].getAttribute('data-id'))) { return nodes[i]; }
+    }
+    return null;
+}
+
+function capture(node) {
+    var id = node.getAttribute('data-id');
+    if (!id || state.seen.has(id)) { return; }
+    var main = node.closest('#main');
+    if (main) {
+        if (main !== state.main || (state.chat && chatOf(node) !== state.chat)) {
+            seed(main);
+            return;
+        }
+        var last = lastKnown(main);
+        var position = last ? node.compareDocumentPosition(last) : 0;
+        if (position & Node.DOCUMENT_POSITION_FOLLOWING) {
+            // Inserida acima da última mensagem: histórico carregado ao rolar
+            remember(id);
+            return;
+        }
+        state.last = node;
+        state.chat = state.chat || chatOf(node);
+    }
+    remember(id);
+    // Apenas mensagens recebidas (as enviadas começam com "true_")
+    if (id.indexOf('false_') !== 0) { return; }
+
+    // data-id: "<from_me>_<chat>_<key>[_<participante>]"
+    var parts = id.split('_');
+    var text = node.querySelector('span.selectable-text');
+    var meta = node.querySelector('[data-pre-plain-text]');
+    var quoted = node.querySelector('[data-testid="quoted-message"] [data-id]');
+    state.buffer.push([
+        id,
+        parts[1],
+        parts.length > 3 ? parts[3] : parts[1],
+        messageType(node),
+        text ? text.innerText : '',
+        Date.now(),
+        quoted ? quoted.getAttribute('data-id') : null,
+        meta ? meta.getAttribute('data-pre-plain-text') : null,
+        mediaUrl(node)
+    ]);
+}
+
+function scan(node) {
+    if (node.nodeType !== 1) { return; }
+    if (node.hasAttribute('data-id')) { capture(node); }
+    var nodes = node.querySelectorAll('[data-id]');
+    for (var i = 0; i < nodes.length; i++) { capture(nodes[i]); }
+}
+
+// Mensagens já renderizadas não são novas
+seed(document.getElementById('main'));
+
+state.observer = new MutationObserver(function (mutations) {
+    for (var m = 0; m < mutations.length; m++) {
+        var target = mutations[m].target;
+        if (!state.chatsDirty && target.closest && target.closest('#pane-side')) {
+            state.chatsDirty = true;
+        }
+        var added = mutations[m].addedNodes;
+        for (var n = 0; n < added.length; n++) {
+            if (added[n].nodeType === 1 && added[n].closest('#pane-side')) { continue; }
+            scan(added[n]);
+        }
+    }
+    if ((state.buffer.length || state.chatsDirty) && state.waiters.length) {
+        var waiters = state.waiters;
+        state.waiters = [];
+        for (var w = 0; w < waiters.length; w++) { waiters[w](); }
+    }
+});
+state.observer.observe(
+    document.body, {childList: true, subtree: true, characterData: true}
+);
+return true;
+"""
+
+# Long-poll (execute_async_script): devolve {m: mensagens, c: diferenças da
+# lista de chats} assim que houver algo ou após arguments[0] ms. Devolve null
+# se o observer não está instalado (ex.: a página foi recarregada).
+DRAIN_MESSAGES = """
+var done = arguments[arguments.length - 1];
+var timeoutMs = arguments[0];
+var state = window.__pywhatsweb;
+if (!state || !state.observer) { done(null); return; }
+
+function chatJid(row) {
+    var node = row.querySelector('[data-id]');
+    if (node) { return node.getAttribute('data-id').split('_')[1] || null; }
+    var img = row.querySelector('img[src*="u="]');
+    if (img) {
+        var match = /[?&]u=([^&]+)/.exec(img.getAttribute('src'));
+        if (match) { return decodeURIComponent(match[1]); }
+    }
+    return null;
+}
+
+function chatDeltas() {
+    var deltas = [];
+    if (!state.chatsDirty) { return deltas; }
+    state.chatsDirty = false;
+    var rows = document.querySelectorAll(
+        '#pane-side [data-testid="cell-frame-container"]'
+    );
+    for (var i = 0; i < rows.length; i++) {
+        var jid = chatJid(rows[i]);
+        if (!jid) { continue; }
+        var title = rows[i].querySelector('span[title]');
+        var preview = rows[i].querySelector(
+            '[data-testid="last-msg-status"] span[title], '
+            + '[data-testid="cell-frame-secondary"] span[title]'
+        );
+        var unread = rows[i].querySelector('[data-testid="icon-unread-count"]');
+        var row = [
+            jid,
+            title ? title.getAttribute('title') : null,
+            unread ? (parseInt(unread.innerText, 10) || 0) : 0,
+            preview ? preview.getAttribute('title') : null
+        ];
+        var key = row.join('\\u0000');
+        if (state.chats[jid] !== key) {
+            state.chats[jid] = key;
+            deltas.push(row);
+        }
+    }
+    return deltas;
+}
+
+function flush() {
+    var items = state.buffer;
+    state.buffer = [];
+    done({m: items, c: chatDeltas()});
+}
+
+if (state.buffer.length || state.chatsDirty) { flush(); return; }
+
+var timer = setTimeout(function () {
+    state.waiters = state.waiters.filter(function (fn) { return fn !== wake; });
+    flush();
+}, timeoutMs);
+
+function wake() {
+    clearTimeout(timer);
+    flush();
+}
+state.waiters.push(wake);
+"""
+
+# Lê um bloco de uma mídia da página (execute_async_script): arguments =
+# [data-id da mensagem, URL blob capturada ou null, início, tamanho]. O Blob é
+# obtido uma vez e mantido em window.__pywhatsweb.blobs até RELEASE_MEDIA;
+# cada chamada devolve apenas a fatia pedida, em base64:
+# {d: dados, n: tamanho total, t: tipo MIME} ou {e: erro}.
+FETCH_MEDIA_CHUNK = """
+var done = arguments[arguments.length - 1];
+var key = arguments[0], url = arguments[1], offset = arguments[2], size = arguments[3];
+var state = window.__pywhatsweb = window.__pywhatsweb || {};
+var blobs = state.blobs = state.blobs || {};
+
+function locate() {
+    if (url) { return url; }
+    var node = document.querySelector('[data-id="' + CSS.escape(key) + '"]');
+    var media = node && node.querySelector(
+        'img[src^="blob:"], video[src^="blob:"], audio[src^="blob:"], a[href^="blob:"]'
+    );
+    return media ? (media.getAttribute('src') || media.getAttribute('href')) : null;
+}
+
+function send(blob) {
+    var reader = new FileReader();
+    reader.onload = function () {
+        var data = reader.result;
+        done({d: data.slice(data.indexOf(',') + 1), n: blob.size, t: blob.type});
+    };
+    reader.onerror = function () { done({e: String(reader.error)}); };
+    reader.readAsDataURL(blob.slice(offset, offset + size));
+}
+
+if (blobs[key]) { send(blobs[key]); return; }
+var source = locate();
+if (!source) { done({e: 'mídia não encontrada na página'}); return; }
+fetch(source).then(function (response) {
+    return response.blob();
+}).then(function (blob) {
+    blobs[key] = blob;
+    send(blob);
+}).catch(function (error) { done({e: String(error)}); });
+"""
+
+# Libera o Blob mantido por FETCH_MEDIA_CHUNK
+RELEASE_MEDIA = """
+var state = window.__pywhatsweb;
+if (state && state.blobs) { delete state.blobs[arguments[0]]; }
+return true;
+"""
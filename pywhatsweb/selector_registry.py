@@ -0,0 +1,185 @@
+"""
+Registro central de seletores do WhatsApp Web
+
+Cada elemento tem um nome e uma cadeia de seletores CSS alternativos, tentados
+em ordem, para sobreviver a mudanças no DOM do WhatsApp. Os elementos
+localizados ficam em cache por geração da página (recarga) ou do chat (troca
+de conversa) e são relocalizados de forma transparente quando ficam obsoletos.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+# Escopo do cache: "page" vale até a página recarregar, "chat" até trocar de conversa
+PAGE = "page"
+CHAT = "chat"
+
+# nome -> (escopo, seletores em ordem de preferência)
+SELECTORS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "chat_list": (
+        PAGE,
+        (
+            "[data-testid='chat-list']",
+            "#pane-side [role='grid']",
+        ),
+    ),
+    "chat_search": (
+        PAGE,
+        (
+            "[data-testid='chat-list-search']",
+            "#side [contenteditable='true'][data-tab='3']",
+        ),
+    ),
+    "menu_button": (
+        PAGE,
+        (
+            "[data-testid='menu-bar-menu']",
+            "#side header span[data-icon='menu']",
+        ),
+    ),
+    "new_group_button": (PAGE, ("[data-testid='new-group']",)),
+    "group_name_input": (PAGE, ("[data-testid='group-name-input']",)),
+    "group_create_button": (PAGE, ("[data-testid='group-create']",)),
+    "profile_drawer": (PAGE, ("[data-testid='profile-drawer']",)),
+    "qr_canvas": (PAGE, ("canvas",)),
+    "compose_box": (
+        CHAT,
+        (
+            "[data-testid='conversation-compose-box-input']",
+            "footer [contenteditable='true'][data-tab='10']",
+            "footer div[contenteditable='true']",
+        ),
+    ),
+    "send_button": (
+        CHAT,
+        (
+            "[data-testid='send']",
+            "span[data-icon='send']",
+            "button[aria-label='Send']",
+        ),
+    ),
+    "attach_button": (
+        CHAT,
+        (
+            "[data-testid='attach-button']",
+            "[data-testid='clip']",
+            "span[data-icon='plus']",
+            "span[data-icon='clip']",
+        ),
+    ),
+    "file_input": (CHAT, ("input[type='file']",)),
+    "media_caption": (
+        CHAT,
+        (
+            "[data-testid='media-caption']",
+            "[data-testid='media-caption-input-container'] [contenteditable='true']",
+        ),
+    ),
+    "location_button": (CHAT, ("[data-testid='location']",)),
+    # Procurado dentro da bolha da mensagem enviada (relógio ou upload em curso)
+    "upload_pending": (
+        CHAT,
+        (
+            "[data-icon='msg-time']",
+            "[data-testid='media-cancel']",
+            "[data-icon='media-cancel']",
+        ),
+    ),
+}
+
+
+def chain(name: str) -> Tuple[str, ...]:
+    """Cadeia de seletores de um elemento"""
+    return SELECTORS[name][1]
+
+
+def css(name: str) -> str:
+    """Seletor CSS único que casa com qualquer alternativa da cadeia"""
+    return ", ".join(chain(name))
+
+
+class SelectorRegistry:
+    """Localiza elementos por nome, com cache e tolerância a elementos obsoletos"""
+
+    def __init__(
+        self,
+        driver: Any,
+        selectors: Optional[Dict[str, Tuple[str, Tuple[str, ...]]]] = None,
+    ):
+        """Inicializa o registro para um driver"""
+        self.driver = driver
+        self.selectors = dict(SELECTORS)
+        if selectors:
+            self.selectors.update(selectors)
+        self.generation = {PAGE: 0, CHAT: 0}
+        self._cache: Dict[str, Tuple[int, Any]] = {}
+
+    def _scope(self, name: str) -> str:
+        return self.selectors[name][0]
+
+    def locate(self, name: str) -> Any:
+        """Localiza o elemento no DOM (sem cache), tentando a cadeia em ordem"""
+        for selector in self.selectors[name][1]:
+            elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+            if elements:
+                return elements[0]
+        raise NoSuchElementException(f"Elemento '{name}' não encontrado")
+
+    def cached(self, name: str) -> Optional[Any]:
+        """Elemento em cache na geração atual (None se não houver)"""
+        entry = self._cache.get(name)
+        if entry and entry[0] == self.generation[self._scope(name)]:
+            return entry[1]
+        return None
+
+    def remember(self, name: str, element: Any) -> Any:
+        """Guarda um elemento já localizado (ex.: por uma espera de prontidão)"""
+        self._cache[name] = (self.generation[self._scope(name)], element)
+        return element
+
+    def forget(self, name: str) -> None:
+        """Descarta o elemento em cache"""
+        self._cache.pop(name, None)
+
+    def find(self, name: str) -> Any:
+        """Elemento em cache ou localizado agora"""
+        element = self.cached(name)
+        if element is None:
+            element = self.remember(name, self.locate(name))
+        return element
+
+    def act(
+        self,
+        name: str,
+        action: Callable[[Any], Any],
+        resolve: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """Executa uma ação no elemento, relocalizando-o se estiver obsoleto
+
+        ``resolve`` localiza o elemento quando não há cache (por padrão,
+        ``locate``); útil para aguardar prontidão antes de agir.
+        """
+        resolve = resolve or (lambda: self.locate(name))
+        element = self.cached(name)
+        if element is None:
+            element = self.remember(name, resolve())
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            element = self.remember(name, resolve())
+            return action(element)
+
+    def invalidate(self, scope: str = PAGE) -> None:
+        """Avança a geração (PAGE invalida também os elementos de chat)"""
+        self.generation[CHAT] += 1
+        if scope == PAGE:
+            self.generation[PAGE] += 1
+
+    def names(self) -> List[str]:
+        """Nomes registrados"""
+        return sorted(self.selectors)
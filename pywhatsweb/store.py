@@ -0,0 +1,311 @@
+"""
+Armazenamento local de mensagens enviadas e recebidas
+
+As mensagens são gravadas em um log somente de acréscimo, dividido em
+segmentos (``segment-000001.log``, uma linha JSON compacta por mensagem). As
+mais recentes ficam também em um buffer circular em memória. Índices compactos
+(``array``) por chat e por horário permitem consultas como "últimas N do chat"
+e "desde T" sem varrer o log; registros fora do buffer são lidos dos
+segmentos por ``mmap``.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models import Message, MessageStatus, MessageType, contacts
+
+logger = logging.getLogger(__name__)
+
+_SEGMENT = re.compile(r"^segment-(\d{6})\.log$")
+_MESSAGE_TYPES = {member.value: member for member in MessageType}
+
+# Campos do registro:
+# [id, chat, sender, recipient, type, ts, content, reply_to_id, from_me]
+(
+    REC_ID,
+    REC_CHAT,
+    REC_SENDER,
+    REC_RECIPIENT,
+    REC_TYPE,
+    REC_TS,
+    REC_CONTENT,
+    REC_REPLY,
+    REC_FROM_ME,
+) = range(9)
+
+
+def chat_id(message: Message, from_me: bool = False) -> str:
+    """JID do chat da mensagem"""
+    chat = message.metadata.get("chat")
+    if chat:
+        return chat
+    other = (
+        message.recipient if from_me or message.recipient.is_group else message.sender
+    )
+    return f"{other.phone}@{'g.us' if other.is_group else 'c.us'}"
+
+
+def _jid(contact: Any) -> str:
+    return f"{contact.phone}@{'g.us' if contact.is_group else 'c.us'}"
+
+
+class MessageStore:
+    """Log segmentado de mensagens com buffer circular e índices por chat/horário"""
+
+    def __init__(
+        self,
+        directory: str,
+        ring_size: int = 10_000,
+        segment_size: int = 16 * 1024 * 1024,
+    ):
+        """Abre (ou cria) o armazenamento e reconstrói os índices a partir do log"""
+        self.directory = directory
+        self.ring_size = max(ring_size, 1)
+        self.segment_size = segment_size
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+
+        # Índices por número de registro (ordem de gravação)
+        self._segment = array("I")
+        self._offset = array("Q")
+        self._length = array("I")
+        self._ts = array("d")
+        self._ts_max = array("d")  # máximo acumulado: permite busca binária por horário
+        self._by_chat: Dict[str, array] = {}
+
+        self._ring: List[Optional[Message]] = [None] * self.ring_size
+        self._maps: Dict[int, Tuple[mmap.mmap, int]] = {}
+        self._file = None
+        self._active = 0
+        self._active_size = 0
+
+        self._load()
+
+    # Gravação
+
+    def append(self, message: Message, from_me: bool = False) -> int:
+        """Grava a mensagem e retorna o número do registro"""
+        if from_me:
+            # Igual ao que a leitura do disco devolve
+            message.metadata["from_me"] = True
+        chat = chat_id(message, from_me)
+        ts = message.timestamp.timestamp()
+        record = [
+            message.id,
+            chat,
+            _jid(message.sender),
+            _jid(message.recipient),
+            message.message_type.value,
+            ts,
+            message.content,
+            message.reply_to_id,
+            1 if from_me else 0,
+        ]
+        line = (
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+            + b"\n"
+        )
+
+        with self._lock:
+            if self._active_size and self._active_size + len(line) > self.segment_size:
+                self._roll()
+            offset = self._active_size
+            self._file.write(line)
+            self._file.flush()
+            self._active_size += len(line)
+
+            seq = self._index(self._active, offset, len(line), ts, chat)
+            self._ring[seq % self.ring_size] = message
+            return seq
+
+    def _index(
+        self, segment: int, offset: int, length: int, ts: float, chat: str
+    ) -> int:
+        """Registra a posição do registro nos índices"""
+        seq = len(self._offset)
+        self._segment.append(segment)
+        self._offset.append(offset)
+        self._length.append(length)
+        self._ts.append(ts)
+        self._ts_max.append(max(ts, self._ts_max[-1]) if seq else ts)
+        positions = self._by_chat.get(chat)
+        if positions is None:
+            positions = self._by_chat[chat] = array("Q")
+        positions.append(seq)
+        return seq
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"segment-{number:06d}.log")
+
+    def _roll(self) -> None:
+        """Fecha o segmento ativo e abre o próximo"""
+        if self._file:
+            self._file.close()
+        self._active += 1
+        self._file = open(self._segment_path(self._active), "ab")
+        self._active_size = 0
+
+    # Leitura
+
+    def _load(self) -> None:
+        """Reconstrói os índices lendo os segmentos existentes"""
+        segments = sorted(
+            int(match.group(1))
+            for match in map(_SEGMENT.match, os.listdir(self.directory))
+            if match
+        )
+        for number in segments:
+            offset = 0
+            with open(self._segment_path(number), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Gravação interrompida: descartar o final incompleto
+                        logger.warning(
+                            f"Registro incompleto ignorado no segmento {number}"
+                        )
+                        break
+                    try:
+                        record = json.loads(line)
+                        self._index(
+                            number, offset, len(line), record[REC_TS], record[REC_CHAT]
+                        )
+                    except (ValueError, IndexError, TypeError):
+                        logger.warning(
+                            f"Registro inválido ignorado no segmento {number}"
+                        )
+                    offset += len(line)
+            if number == segments[-1]:
+                self._active, self._active_size = number, offset
+
+        if segments:
+            # Truncar um eventual registro incompleto antes de continuar gravando
+            with open(self._segment_path(self._active), "r+b") as f:
+                f.truncate(self._active_size)
+            self._file = open(self._segment_path(self._active), "ab")
+        else:
+            self._roll()
+
+    def _read_record(self, seq: int) -> list:
+        """Lê um registro do disco via mmap"""
+        segment = self._segment[seq]
+        start = self._offset[seq]
+        end = start + self._length[seq]
+
+        cached = self._maps.get(segment)
+        if cached is None or cached[1] < end:
+            if cached:
+                cached[0].close()
+            with open(self._segment_path(segment), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                cached = (mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ), size)
+            self._maps[segment] = cached
+        return json.loads(cached[0][start:end])
+
+    def _message(self, seq: int) -> Message:
+        """Mensagem do buffer circular ou reconstruída do log"""
+        if seq >= len(self._offset) - self.ring_size:
+            message = self._ring[seq % self.ring_size]
+            if message is not None:
+                return message
+        return self._from_record(self._read_record(seq))
+
+    @staticmethod
+    def _from_record(record: list) -> Message:
+        """Converte um registro do log em Message"""
+        metadata = {"chat": record[REC_CHAT]}
+        if record[REC_REPLY]:
+            metadata["quoted_id"] = record[REC_REPLY]
+        if record[REC_FROM_ME]:
+            metadata["from_me"] = True
+        return Message(
+            id=record[REC_ID],
+            content=record[REC_CONTENT],
+            sender=contacts.get(record[REC_SENDER]),
+            recipient=contacts.get(record[REC_RECIPIENT]),
+            message_type=_MESSAGE_TYPES.get(record[REC_TYPE], MessageType.TEXT),
+            timestamp=datetime.fromtimestamp(record[REC_TS]),
+            status=MessageStatus.SENT if record[REC_FROM_ME] else MessageStatus.PENDING,
+            metadata=metadata,
+        )
+
+    def get(self, seq: int) -> Message:
+        """Mensagem pelo número do registro"""
+        with self._lock:
+            if not 0 <= seq < len(self._offset):
+                raise IndexError(seq)
+            return self._message(seq)
+
+    def last(self, chat: str, n: int = 20) -> List[Message]:
+        """Últimas ``n`` mensagens do chat (JID ou telefone), em ordem cronológica"""
+        if "@" not in chat:
+            chat = f"{chat}@c.us"
+        with self._lock:
+            positions = self._by_chat.get(chat)
+            if not positions or n <= 0:
+                return []
+            return [self._message(seq) for seq in positions[-n:]]
+
+    def since(
+        self,
+        timestamp: Union[datetime, float],
+        chat: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Message]:
+        """Mensagens com horário a partir de ``timestamp`` (opcionalmente de um chat)"""
+        ts = (
+            timestamp.timestamp()
+            if isinstance(timestamp, datetime)
+            else float(timestamp)
+        )
+        if chat and "@" not in chat:
+            chat = f"{chat}@c.us"
+
+        with self._lock:
+            # Antes deste ponto nenhum registro alcança o horário pedido
+            start = bisect_left(self._ts_max, ts)
+            if chat:
+                positions = self._by_chat.get(chat) or array("Q")
+                candidates = positions[bisect_left(positions, start) :]
+            else:
+                candidates = range(start, len(self._offset))
+
+            result = []
+            for seq in candidates:
+                if self._ts[seq] >= ts:
+                    result.append(self._message(seq))
+                    if limit is not None and len(result) >= limit:
+                        break
+            return result
+
+    def chats(self) -> List[str]:
+        """Chats com mensagens armazenadas"""
+        with self._lock:
+            return list(self._by_chat)
+
+    def __len__(self) -> int:
+        return len(self._offset)
+
+    def close(self) -> None:
+        """Fecha arquivos e mapeamentos"""
+        with self._lock:
+            for mapped, _size in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "MessageStore":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
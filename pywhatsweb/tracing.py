@@ -0,0 +1,334 @@
+"""
+Rastreamento das chamadas ao chromedriver
+
+O ``Tracer`` substitui ``driver.execute`` (por onde passam todos os comandos
+do Selenium, inclusive os de ``WebElement``: find_element, click, send_keys,
+get, execute_script...) e registra cada comando com sua duração. Os comandos
+são agrupados em spans, um por chamada de alto nível do ``WhatsAppClient``,
+mostrando quantas idas e voltas e quanto tempo custa cada ``send_message``
+(os totais incluem os spans internos, como ``open_chat``).
+Os spans concluídos vão para os exportadores (arquivo JSON lines, callback
+ou dicionário no formato do OpenTelemetry).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Exporter = Callable[["Span"], None]
+
+
+class Command:
+    """Comando enviado ao chromedriver"""
+
+    __slots__ = ("name", "start", "duration", "error")
+
+    def __init__(
+        self, name: str, start: float, duration: float, error: Optional[str] = None
+    ):
+        self.name = name
+        self.start = start  # epoch, em segundos
+        self.duration = duration  # segundos
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"name": self.name, "start": self.start, "duration": self.duration}
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class Span:
+    """Chamada de alto nível do cliente e os comandos executados nela
+
+    ``commands``, ``round_trips`` e ``driver_time`` contam só os comandos do
+    próprio span; ``total_round_trips`` e ``total_driver_time`` incluem os dos
+    spans internos.
+    """
+
+    def __init__(self, name: str, trace_id: str, parent: Optional["Span"] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration = 0.0
+        self.commands: List[Command] = []
+        self.total_round_trips = 0
+        self.total_driver_time = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def round_trips(self) -> int:
+        """Número de comandos enviados ao chromedriver"""
+        return len(self.commands)
+
+    @property
+    def driver_time(self) -> float:
+        """Tempo total gasto nos comandos (segundos)"""
+        return sum(command.duration for command in self.commands)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representação simples (JSON)"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "round_trips": self.round_trips,
+            "driver_time": self.driver_time,
+            "total_round_trips": self.total_round_trips,
+            "total_driver_time": self.total_driver_time,
+            "error": self.error,
+            "commands": [command.to_dict() for command in self.commands],
+        }
+
+    def to_otel(self) -> Dict[str, Any]:
+        """Span no formato JSON do OpenTelemetry (OTLP), comandos como eventos"""
+        start_ns = int(self.start * 1e9)
+
+        def attribute(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(self.duration * 1e9)),
+            "attributes": [
+                attribute("webdriver.round_trips", self.round_trips),
+                attribute("webdriver.time", self.driver_time),
+                attribute("webdriver.total_round_trips", self.total_round_trips),
+                attribute("webdriver.total_time", self.total_driver_time),
+            ],
+            "events": [
+                {
+                    "name": command.name,
+                    "timeUnixNano": str(int(command.start * 1e9)),
+                    "attributes": [attribute("duration", command.duration)]
+                    + ([attribute("error", command.error)] if command.error else []),
+                }
+                for command in self.commands
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class JsonLinesExporter:
+    """Grava cada span como uma linha JSON (``otel=True`` usa o formato OTLP)"""
+
+    def __init__(self, path: str, otel: bool = False):
+        self.path = path
+        self.otel = otel
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        line = json.dumps(
+            span.to_otel() if self.otel else span.to_dict(), ensure_ascii=False
+        )
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class CallbackExporter:
+    """Entrega o span (ou seu dicionário OTLP, com ``otel=True``) a uma função"""
+
+    def __init__(self, callback: Callable[[Any], None], otel: bool = False):
+        self.callback = callback
+        self.otel = otel
+
+    def __call__(self, span: Span) -> None:
+        self.callback(span.to_otel() if self.otel else span)
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "span")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer._open(self.name)
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.tracer._close(self.span, exc_val)
+
+
+class Tracer:
+    """Registra os comandos do driver agrupados em spans"""
+
+    enabled = True
+
+    def __init__(self, exporters: Optional[List[Exporter]] = None):
+        """Inicializa o rastreamento"""
+        self.exporters: List[Exporter] = list(exporters or [])
+        self.unscoped = 0  # comandos executados fora de qualquer span
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._summary: Dict[str, List[float]] = {}
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        self.exporters.append(exporter)
+
+    # Driver
+
+    def install(self, driver: Any) -> None:
+        """Passa a registrar os comandos do driver"""
+        if vars(driver).get("_pywhatsweb_execute") is not None:
+            return
+        execute = driver.execute
+        tracer = self
+
+        def execute_and_record(driver_command: str, params: Any = None) -> Any:
+            start, started = time.time(), time.perf_counter()
+            error = None
+            try:
+                return execute(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                tracer._record(
+                    driver_command, start, time.perf_counter() - started, error
+                )
+
+        driver._pywhatsweb_execute = execute
+        driver.execute = execute_and_record
+
+    @staticmethod
+    def uninstall(driver: Any) -> None:
+        """Restaura o ``execute`` original do driver"""
+        execute = vars(driver).get("_pywhatsweb_execute")
+        if execute is not None:
+            driver.execute = execute
+            driver._pywhatsweb_execute = None
+
+    def _record(
+        self, name: str, start: float, duration: float, error: Optional[str]
+    ) -> None:
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1].commands.append(Command(name, start, duration, error))
+            # Totais inclusivos: o comando conta para todos os spans abertos
+            for span in stack:
+                span.total_round_trips += 1
+                span.total_driver_time += duration
+        else:
+            self.unscoped += 1
+
+    # Spans
+
+    def span(self, name: str) -> _SpanContext:
+        """Context manager que agrupa os comandos executados nele"""
+        return _SpanContext(self, name)
+
+    def _open(self, name: str) -> Span:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        span = Span(name, parent.trace_id if parent else os.urandom(16).hex(), parent)
+        stack.append(span)
+        return span
+
+    def _close(self, span: Span, error: Optional[BaseException]) -> None:
+        span.finish(error)
+        self._local.stack.pop()
+
+        with self._lock:
+            totals = self._summary.get(span.name)
+            if totals is None:
+                totals = self._summary[span.name] = [0, 0.0, 0, 0.0]
+            totals[0] += 1
+            totals[1] += span.duration
+            totals[2] += span.total_round_trips
+            totals[3] += span.total_driver_time
+
+        for exporter in self.exporters:
+            try:
+                exporter(span)
+            except Exception as e:
+                logger.warning(f"Exportador de spans falhou: {e}")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Médias por tipo de span: chamadas, duração, idas e voltas, tempo no driver
+
+        Idas e voltas e tempo no driver incluem os spans internos.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "avg_duration": duration / calls,
+                    "avg_round_trips": round_trips / calls,
+                    "avg_driver_time": driver_time / calls,
+                }
+                for name, (
+                    calls,
+                    duration,
+                    round_trips,
+                    driver_time,
+                ) in self._summary.items()
+            }
+
+
+class _NullSpanContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpanContext()
+
+
+class NullTracer:
+    """Rastreamento desativado: mesma interface, sem custo"""
+
+    enabled = False
+    exporters: List[Exporter] = []
+    unscoped = 0
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        raise RuntimeError("Rastreamento desativado (use Config(trace=True))")
+
+    def install(self, driver: Any) -> None:
+        pass
+
+    @staticmethod
+    def uninstall(driver: Any) -> None:
+        pass
+
+    def span(self, name: str) -> _NullSpanContext:
+        return _NULL_SPAN
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {}
@@ -0,0 +1,84 @@
+"""
+Testes para o cliente assíncrono
+"""
+
+import asyncio
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from pywhatsweb import AsyncWhatsAppClient, Config, WhatsAppClient
+from pywhatsweb.exceptions import TimeoutError
+
+
+def _client(**kwargs):
+    sync_client = WhatsAppClient(
+        config=Config(poll_interval=0.01, receive_interval=0.01, **kwargs)
+    )
+    sync_client.driver = Mock()
+    return AsyncWhatsAppClient(client=sync_client)
+
+
+class TestAsyncWhatsAppClient:
+    """Testes para a classe AsyncWhatsAppClient"""
+
+    def test_calls_run_on_session_thread(self):
+        """Testa que as chamadas ao driver usam a thread da sessão"""
+        client = _client()
+        threads = []
+
+        def send_message(phone, text):
+            threads.append(threading.current_thread().name)
+            return True
+
+        client.client.send_message = send_message
+
+        async def run():
+            return await asyncio.gather(
+                client.send_message("5511999999999", "um"),
+                client.send_message("5511999999999", "dois"),
+            )
+
+        assert asyncio.run(run()) == [True, True]
+        assert all(name.startswith("pywhatsweb") for name in threads)
+
+    def test_wait_for_qr_polls_until_available(self):
+        """Testa que o QR Code é aguardado sem bloquear o loop"""
+        client = _client()
+        client.client._poll_qr = Mock(side_effect=[None, None, "2@abc"])
+        client.client._handle_qr = Mock()
+
+        assert asyncio.run(client.wait_for_qr(timeout=1)) == "2@abc"
+        client.client._handle_qr.assert_called_once_with("2@abc")
+
+    def test_wait_for_qr_timeout(self):
+        """Testa timeout aguardando QR Code"""
+        client = _client()
+        client.client._poll_qr = Mock(return_value=None)
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(client.wait_for_qr(timeout=0.05))
+
+    def test_wait_forever_delivers_messages(self):
+        """Testa entrega de mensagens a handlers assíncronos"""
+        client = _client()
+        client.client.is_connected = True
+        received = []
+
+        def get_new_messages(timeout=None):
+            # Leitura sem espera: a thread da sessão fica livre entre leituras
+            assert timeout == 0
+            if len(received) >= 2:
+                client.client.is_connected = False
+                return []
+            return ["m1", "m2"]
+
+        async def on_message(message):
+            received.append(message)
+
+        client.client._get_new_messages = get_new_messages
+        client.on_message = on_message
+        asyncio.run(client.wait_forever())
+
+        assert received == ["m1", "m2"]
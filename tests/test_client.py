@@ -5,6 +5,8 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pywhatsweb import WhatsAppClient, Config
+from pywhatsweb import phones, readiness
+from pywhatsweb.readiness import ReadinessWaiter
 from pywhatsweb.exceptions import ConnectionError, AuthenticationError
 
 
@@ -51,6 +53,23 @@ def test_connect_success(self):
             assert client.wait is not None
             mock_driver.get.assert_called_once_with("https://web.whatsapp.com/")
     
+    def test_connect_uses_chrome_binary(self):
+        """Testa que o Chrome é iniciado pelo binário configurado"""
+        from pywhatsweb.driver import DriverResolution
+        
+        config = Config(chrome_binary="/opt/chrome/chrome", warm_start=False)
+        client = WhatsAppClient(config)
+        resolution = DriverResolution(
+            "/usr/bin/chromedriver", "cache", "120.0.0.0", 0.0
+        )
+        
+        with patch("pywhatsweb.client.resolve_driver", return_value=resolution), \
+                patch("selenium.webdriver.Chrome") as mock_chrome:
+            client.connect()
+        
+        options = mock_chrome.call_args.kwargs["options"]
+        assert options.binary_location == "/opt/chrome/chrome"
+    
     def test_connect_failure(self):
         """Testa falha na conexão"""
         client = WhatsAppClient()
@@ -91,6 +110,316 @@ def test_context_manager(self):
             mock_driver.quit.assert_called_once()
 
 
+class TestChatNavigation:
+    """Testes para a troca de chats dentro da aplicação"""
+    
+    def _client(self, **kwargs):
+        client = WhatsAppClient(config=Config(**kwargs))
+        client.driver = Mock()
+        client._load_chat = Mock()
+        client._switch_chat = Mock(return_value=True)
+        return client
+    
+    def test_unknown_chat_uses_deep_link(self):
+        """Testa que números nunca vistos recarregam pelo deep link"""
+        client = self._client()
+        client._open_chat("5511999999999")
+        
+        client._load_chat.assert_called_once_with("5511999999999")
+        client._switch_chat.assert_not_called()
+        assert client.known_chats == ["5511999999999"]
+    
+    def test_known_chat_switches_in_app(self):
+        """Testa que chats conhecidos são abertos sem recarregar"""
+        client = self._client()
+        client._open_chat("5511999999999")
+        client._open_chat("5511888888888")
+        client._load_chat.reset_mock()
+        
+        client._open_chat("5511999999999")
+        
+        client._switch_chat.assert_called_once_with("5511999999999")
+        client._load_chat.assert_not_called()
+    
+    def test_failed_switch_falls_back_to_reload(self):
+        """Testa fallback para deep link quando a troca não se confirma"""
+        client = self._client()
+        client._remember_chat("5511999999999")
+        client._remember_chat("5511888888888")
+        client._switch_chat.return_value = False
+        
+        client._open_chat("5511999999999")
+        
+        client._load_chat.assert_called_once_with("5511999999999")
+    
+    def test_reload_mode_and_cache_limit(self):
+        """Testa modo reload e limite do cache de chats"""
+        client = self._client(navigation_mode="reload", chat_cache_size=2)
+        for phone in ["5511111111111", "5511222222222", "5511333333333"]:
+            client._open_chat(phone)
+        client._open_chat("5511333333333")
+        
+        client._switch_chat.assert_not_called()
+        assert client._load_chat.call_count == 4
+        assert client.known_chats == ["5511222222222", "5511333333333"]
+    
+    def test_base_url_for_deep_links(self):
+        """Testa que o deep link usa a base_url configurada (ex.: simulador)"""
+        client = WhatsAppClient(config=Config(base_url="http://127.0.0.1:8765"))
+        client.driver = Mock()
+        client.selectors = Mock()
+        client.waiter = Mock()
+        
+        client._load_chat("5511999999999")
+        
+        assert client.whatsapp_url == "http://127.0.0.1:8765/"
+        client.driver.get.assert_called_once_with(
+            "http://127.0.0.1:8765/send?phone=5511999999999"
+        )
+
+
+class TestSendMessages:
+    """Testes para o envio em lote"""
+    
+    def _client(self):
+        client = WhatsAppClient(config=Config())
+        client.is_connected = True
+        client._open_chat = Mock()
+        client._send_text_in_chat = Mock()
+        client._send_media_in_chat = Mock()
+        return client
+    
+    def test_groups_by_recipient(self):
+        """Testa que cada chat é aberto uma única vez"""
+        client = self._client()
+        results = client.send_messages([
+            ("11999999999", "um"),
+            ("5511888888888", "dois"),
+            ("(11) 99999-9999", "três"),
+        ])
+        
+        assert client._open_chat.call_count == 2
+        assert [r.success for r in results] == [True, True, True]
+        assert [r.phone for r in results] == [
+            "5511999999999", "5511888888888", "5511999999999"
+        ]
+        sent = [c.args[0] for c in client._send_text_in_chat.call_args_list]
+        assert sent == ["um", "três", "dois"]
+    
+    def test_default_country_comes_from_config(self):
+        """Testa que o país padrão vem do Config do próprio cliente"""
+        client = self._client()
+        client.config.default_country = "PT"
+        WhatsAppClient(config=Config())  # outro cliente não altera o país
+        
+        results = client.send_messages([("912 345 678", "olá")])
+        
+        assert results[0].phone == "351912345678"
+        client._open_chat.assert_called_once_with("351912345678")
+        assert phones.get_default_country() == "BR"
+    
+    def test_failures_are_reported_per_item(self):
+        """Testa que falhas não interrompem o lote"""
+        from pywhatsweb.exceptions import MessageError
+        
+        client = self._client()
+        client._send_text_in_chat.side_effect = [Exception("falhou"), None]
+        results = client.send_messages([
+            ("", "sem telefone"),
+            ("5511999999999", "um"),
+            ("5511999999999", "dois"),
+        ])
+        
+        assert [r.success for r in results] == [False, False, True]
+        assert isinstance(results[0].error, ValueError)
+        assert isinstance(results[1].error, MessageError)
+    
+    def test_open_chat_failure_fails_chat_items(self):
+        """Testa que falha ao abrir o chat marca todos os itens do chat"""
+        from pywhatsweb.exceptions import MessageError
+        
+        client = self._client()
+        client._open_chat.side_effect = [MessageError("erro"), None]
+        results = client.send_messages([
+            ("5511999999999", "um"),
+            ("5511888888888", "dois"),
+            ("5511999999999", "três"),
+        ])
+        
+        assert [r.success for r in results] == [False, True, False]
+    
+    def test_media_is_prepared_before_sending(self, tmp_path):
+        """Testa que as mídias do lote passam pela preparação"""
+        from pywhatsweb.models import MediaMessage
+        
+        document = tmp_path / "doc.pdf"
+        document.write_bytes(b"%PDF")
+        prepared = tmp_path / "pronto.pdf"
+        prepared.write_bytes(b"%PDF")
+        
+        client = self._client()
+        client.prepare_media = Mock(return_value=Mock(
+            result=Mock(return_value=MediaMessage.from_file(str(prepared), "oi"))
+        ))
+        media = MediaMessage.from_file(str(document), "oi")
+        results = client.send_messages([("5511999999999", media)])
+        
+        assert results[0].success
+        client._send_media_in_chat.assert_called_once_with(str(prepared), "oi")
+    
+    def test_handlers_do_not_interleave_on_driver(self):
+        """Testa que envios de handlers em threads diferentes não se intercalam"""
+        import threading
+        import time
+        from pywhatsweb.dispatcher import MessageDispatcher
+        from pywhatsweb.models import Message, Contact
+        
+        client = self._client()
+        calls = []
+        lock = threading.Lock()
+        
+        def record(step):
+            def call(value):
+                with lock:
+                    calls.append((step, threading.current_thread().name))
+                time.sleep(0.02)
+            return call
+        
+        client._open_chat.side_effect = record("open")
+        client._send_text_in_chat.side_effect = record("type")
+        client.on_message = lambda message: client.send_message(
+            message.sender.phone, "resposta"
+        )
+        
+        dispatcher = MessageDispatcher(client._handle_message, workers=4)
+        for i in range(8):
+            phone = f"55119{i:08d}"
+            dispatcher.submit(Message(
+                id=str(i), content="oi", sender=Contact(phone=phone),
+                recipient=Contact(phone="5511000000000"),
+                metadata={"chat": f"{phone}@c.us"},
+            ))
+        assert dispatcher.join(timeout=10)
+        dispatcher.close()
+        
+        assert len(calls) == 16
+        assert len({thread for _step, thread in calls}) > 1
+        for (first, thread), (second, other) in zip(calls[::2], calls[1::2]):
+            assert (first, second) == ("open", "type")
+            assert thread == other
+
+
+class TestMessageIngestion:
+    """Testes para a captura de mensagens recebidas"""
+    
+    def _client(self, records):
+        client = WhatsAppClient(config=Config())
+        client.driver = Mock()
+        client.driver.execute_async_script.return_value = records
+        return client
+    
+    def test_reinstalls_observer_after_reload(self):
+        """Testa que o observer é reinstalado quando a página recarrega"""
+        client = self._client(None)
+        
+        assert client._get_new_messages() == []
+        client.driver.execute_script.assert_called_once()
+    
+    def test_parses_drained_payload(self):
+        """Testa a conversão do payload drenado em mensagens e chats"""
+        client = self._client({
+            "m": [
+                ["false_5511999999999@c.us_3EB0AA", "5511999999999@c.us",
+                 "5511999999999@c.us", "text", "oi", 1700000000000, None,
+                 "[10:15, 18/10/2026] Fulano: "],
+                ["false_120363000000000001@g.us_3EB0BB_5511888888888@c.us",
+                 "120363000000000001@g.us", "5511888888888@c.us", "image", "",
+                 1700000000000, "false_120363000000000001@g.us_3EB0AA", None],
+                ["invalido"],
+            ],
+            "c": [["5511999999999@c.us", "Fulano", 2, "oi"]],
+        })
+        updates = []
+        client.on_chat_update = updates.append
+        
+        direct, group = client._get_new_messages()
+        
+        assert direct.id == "false_5511999999999@c.us_3EB0AA"
+        assert direct.sender.phone == "5511999999999"
+        assert direct.timestamp.year == 2026 and direct.timestamp.hour == 10
+        assert not direct.is_group_message()
+        assert group.sender.phone == "5511888888888"
+        assert group.is_group_message()
+        assert group.message_type.value == "image"
+        assert group.metadata["quoted_id"] == "false_120363000000000001@g.us_3EB0AA"
+        assert updates[0].unread_count == 2
+        assert client.chats["5511999999999@c.us"].contact.name == "Fulano"
+    
+    def test_drops_recaptured_messages(self):
+        """Testa que mensagens recapturadas (ex.: após reconexão) são descartadas"""
+        record = ["false_5511999999999@c.us_3EB0AA", "5511999999999@c.us",
+                  "5511999999999@c.us", "text", "oi", 1700000000000, None, None]
+        client = self._client({"m": [record], "c": []})
+        
+        assert len(client._get_new_messages()) == 1
+        assert client._get_new_messages() == []
+
+
+class TestWarmStart:
+    """Testes para a retomada de sessões já autenticadas"""
+    
+    def _client(self, state):
+        client = WhatsAppClient(config=Config())
+        client.driver = Mock()
+        client.driver.execute_script.return_value = state
+        client.waiter = ReadinessWaiter(client.driver, poll_interval=0.01)
+        client._mark_connected = Mock(
+            side_effect=lambda: setattr(client, "is_connected", True)
+        )
+        return client
+    
+    def test_authenticated_profile_skips_qr(self):
+        """Testa que a lista de chats conecta sem passar pelo QR Code"""
+        client = self._client(readiness.SESSION_AUTHENTICATED)
+        client._detect_session()
+        
+        assert client.startup_report["path"] == "warm"
+        client._mark_connected.assert_called_once()
+        client.driver.execute_script.reset_mock()
+        assert client.wait_for_qr() == ""
+        assert client.wait_for_connection() is True
+        client.driver.execute_script.assert_not_called()
+    
+    def test_qr_page_keeps_qr_flow(self):
+        """Testa que a página de QR Code mantém o fluxo normal"""
+        client = self._client(readiness.SESSION_QR)
+        client._detect_session()
+        
+        assert client.startup_report["path"] == "qr"
+        assert client.is_connected is False
+        client._mark_connected.assert_not_called()
+
+
+class TestQRRefresh:
+    """Testes para o acompanhamento do QR Code durante a conexão"""
+    
+    def test_rotated_qr_is_reemitted(self):
+        """Testa que on_qr só é chamado de novo quando o QR Code muda"""
+        client = WhatsAppClient(config=Config(qr_output="none", qr_refresh_interval=0))
+        client.driver = Mock()
+        client.driver.find_elements.return_value = []
+        client.driver.execute_script.side_effect = ["2@a", "2@a", "2@b"]
+        emitted = []
+        client.on_qr = emitted.append
+        
+        client._handle_qr(client._poll_qr())
+        assert client._check_connection() is False
+        assert client._check_connection() is False
+        
+        assert emitted == ["2@a", "2@b"]
+        assert client.qr_code == "2@b"
+
+
 class TestConfig:
     """Testes para a classe Config"""
     
@@ -208,6 +537,57 @@ def test_group_operations(self):
         assert not group.is_admin(contact)
         group.admins.append(contact)
         assert group.is_admin(contact)
+    
+    def test_group_sync_participants(self):
+        """Testa o índice de participantes e a sincronização em lote"""
+        from pywhatsweb.models import Group, Contact
+        
+        a, b, c = (Contact(phone=f"551199999999{i}") for i in range(3))
+        group = Group(id="test", name="Teste", participants=[a, b], admins=[b])
+        
+        assert Contact(phone=a.phone, name="Outro nome") in group.participants
+        assert b.phone in group.admins
+        
+        added, removed = group.sync_participants([c, a])
+        
+        assert (added, removed) == ([c], [b])
+        assert group.participants == [a, c]
+        assert not group.is_admin(b)
+        with pytest.raises(ValueError):
+            group.participants.remove(b)
+    
+    def test_contact_table_shares_contacts(self):
+        """Testa que a tabela de contatos reaproveita instâncias"""
+        from pywhatsweb.models import ContactTable
+        
+        table = ContactTable()
+        contact = table.get("5511999999999@c.us")
+        
+        assert table.get("5511999999999@c.us") is contact
+        assert table.get("120363000000000001@g.us").is_group
+        assert len(table) == 1
+    
+    def test_compact_message(self):
+        """Testa a conversão para a mensagem compacta e de volta"""
+        import pickle
+        from pywhatsweb.models import Message, Contact, CompactMessage
+        
+        sender = Contact(phone="5511999999999")
+        message = Message(
+            id="false_5511999999999@c.us_3EB0AA", content="oi", sender=sender,
+            recipient=sender, metadata={"chat": "5511999999999@c.us", "quoted_id": "x"},
+        )
+        compact = message.compact()
+        
+        assert not hasattr(compact, "__dict__")
+        assert compact.reply_to_id == message.reply_to_id == "x"
+        assert compact.metadata == {"chat": "5511999999999@c.us"}
+        assert compact.timestamp == message.timestamp
+        assert compact.to_message() == message
+        assert pickle.loads(pickle.dumps(compact)) == compact
+        
+        bare = CompactMessage(id="a", content="oi", sender=sender, recipient=sender)
+        assert bare._metadata is None
 
 
 if __name__ == "__main__":
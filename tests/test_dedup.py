@@ -0,0 +1,59 @@
+"""
+Testes para a deduplicação de mensagens recebidas
+"""
+
+import subprocess
+import sys
+from datetime import datetime
+
+from pywhatsweb.dedup import SeenSet
+from pywhatsweb.models import Contact, Message
+
+
+class TestDedup:
+    """Testes para SeenSet e IDs estáveis"""
+
+    def test_seen_set_is_bounded(self):
+        """Testa descarte de repetidas e limite de capacidade (LRU)"""
+        seen = SeenSet(capacity=2)
+
+        assert seen.add("a") and seen.add("b")
+        assert not seen.add("a")
+        assert seen.add("c")
+        assert "b" not in seen and "a" in seen
+        assert len(seen) == 2 and seen.duplicates == 1
+
+    def test_fallback_id_is_stable(self):
+        """Testa que o ID sem chave do WhatsApp é igual entre processos"""
+        code = (
+            "from datetime import datetime\n"
+            "from pywhatsweb.models import Contact, Message\n"
+            "c = Contact(phone='5511999999999')\n"
+            "print(Message(id='', content='oi', sender=c, recipient=c,"
+            " timestamp=datetime(2026, 10, 18, 10, 15)).id)"
+        )
+        ids = {
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True
+            ).stdout.strip()
+            for _ in range(2)
+        }
+
+        contact = Contact(phone="5511999999999")
+        local = Message(
+            id="",
+            content="oi",
+            sender=contact,
+            recipient=contact,
+            timestamp=datetime(2026, 10, 18, 10, 15),
+        )
+        assert ids == {local.id}
+
+        other = Message(
+            id="",
+            content="oi",
+            sender=contact,
+            recipient=contact,
+            timestamp=datetime(2026, 10, 18, 10, 15, 1),
+        )
+        assert other.id != local.id
@@ -0,0 +1,104 @@
+"""
+Testes para o despacho de mensagens
+"""
+
+import threading
+import time
+
+from pywhatsweb.dispatcher import BackpressurePolicy, MessageDispatcher
+from pywhatsweb.models import Contact, Message
+
+
+def _message(chat, index):
+    sender = Contact(phone=chat)
+    return Message(
+        id=f"{chat}_{index}",
+        content=str(index),
+        sender=sender,
+        recipient=sender,
+        metadata={"chat": f"{chat}@c.us"},
+    )
+
+
+class TestMessageDispatcher:
+    """Testes para a classe MessageDispatcher"""
+
+    def test_per_chat_order(self):
+        """Testa que a ordem é preservada dentro de cada chat"""
+        received = {}
+        lock = threading.Lock()
+
+        def handler(message):
+            with lock:
+                received.setdefault(message.metadata["chat"], []).append(
+                    int(message.content)
+                )
+
+        dispatcher = MessageDispatcher(handler, workers=3, queue_size=30)
+        chats = [f"55119{i:08d}" for i in range(5)]
+        for index in range(50):
+            for chat in chats:
+                dispatcher.submit(_message(chat, index))
+        dispatcher.close()
+
+        assert all(values == list(range(50)) for values in received.values())
+        assert dispatcher.stats()["handled"] == 250
+
+    def test_submit_does_not_wait_on_handler(self):
+        """Testa que um handler lento não bloqueia o produtor (spill)"""
+        release = threading.Event()
+        received = []
+
+        def handler(message):
+            release.wait()
+            received.append(int(message.content))
+
+        dispatcher = MessageDispatcher(
+            handler, workers=1, queue_size=2, policy=BackpressurePolicy.SPILL
+        )
+        start = time.monotonic()
+        for index in range(20):
+            dispatcher.submit(_message("5511999999999", index))
+        assert time.monotonic() - start < 1
+        assert dispatcher.stats()["spilled"] > 0
+
+        release.set()
+        dispatcher.close()
+        assert received == list(range(20))
+
+    def test_drop_oldest(self):
+        """Testa descarte da mensagem mais antiga com a fila cheia"""
+        release = threading.Event()
+        received = []
+
+        def handler(message):
+            release.wait()
+            received.append(int(message.content))
+
+        dispatcher = MessageDispatcher(
+            handler, workers=1, queue_size=2, policy="drop_oldest"
+        )
+        dispatcher.submit(_message("5511999999999", 0))
+        while dispatcher.queue_depth():
+            time.sleep(0.001)
+        results = [dispatcher.submit(_message("5511999999999", i)) for i in range(1, 5)]
+
+        release.set()
+        dispatcher.close()
+        assert results == [True, True, False, False]
+        assert received == [0, 3, 4]
+        assert dispatcher.stats()["dropped"] == 2
+
+    def test_handler_errors_are_counted(self):
+        """Testa que erros no handler não param o despacho"""
+
+        def handler(message):
+            raise RuntimeError("falhou")
+
+        dispatcher = MessageDispatcher(handler, workers=1)
+        dispatcher.submit(_message("5511999999999", 0))
+        dispatcher.close()
+
+        stats = dispatcher.stats()
+        assert stats["errors"] == 1
+        assert stats["handled"] == 1
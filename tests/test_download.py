@@ -0,0 +1,147 @@
+"""
+Testes para o download de mídias recebidas
+"""
+
+import base64
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from pywhatsweb import Config, WhatsAppClient
+from pywhatsweb.download import MediaDownloader, caption_of, file_name
+from pywhatsweb.exceptions import MediaDownloadError
+from pywhatsweb.models import Contact, Message, MessageType
+
+MESSAGE_ID = "false_5511999999999@c.us_3EB0AA"
+
+
+class FakePage:
+    """Driver falso que serve uma mídia em fatias, como FETCH_MEDIA_CHUNK"""
+
+    def __init__(self, data, mime_type="image/jpeg", fail_at=None):
+        self.data = data
+        self.mime_type = mime_type
+        self.fail_at = fail_at
+        self.reads = []
+        self.released = []
+
+    def execute_async_script(self, script, key, url, offset, size):
+        if self.fail_at is not None and offset >= self.fail_at:
+            return {"e": "blob expirado"}
+        self.reads.append(size)
+        chunk = self.data[offset : offset + size]
+        return {
+            "d": base64.b64encode(chunk).decode(),
+            "n": len(self.data),
+            "t": self.mime_type,
+        }
+
+    def execute_script(self, script, key):
+        self.released.append(key)
+
+
+def _message(message_type=MessageType.IMAGE, content="[IMAGE]"):
+    return Message(
+        id=MESSAGE_ID,
+        content=content,
+        sender=Contact(phone="5511999999999"),
+        recipient=Contact(phone="5511900000000"),
+        message_type=message_type,
+        metadata={
+            "chat": "5511999999999@c.us",
+            "media_url": "blob:https://web.whatsapp.com/x",
+        },
+    )
+
+
+class TestMediaDownloader:
+    """Testes para a classe MediaDownloader"""
+
+    def test_downloads_in_chunks(self, tmp_path):
+        """Testa que a mídia é gravada bloco a bloco e associada à mensagem"""
+        data = os.urandom(10_000)
+        page = FakePage(data)
+        received = []
+        downloader = MediaDownloader(
+            page, str(tmp_path), chunk_size=4096, on_media=received.append
+        )
+        message = _message()
+
+        media = downloader.submit(message).result(timeout=10)
+        downloader.close()
+
+        assert media.file_path == os.path.join(
+            str(tmp_path), file_name(MESSAGE_ID) + ".jpg"
+        )
+        assert open(media.file_path, "rb").read() == data
+        assert media.mime_type == "image/jpeg"
+        assert media.caption is None
+        assert page.reads == [4096, 4096, 4096]
+        assert page.released == [MESSAGE_ID]
+        assert message.media is media
+        assert received == [message]
+        assert downloader.active == 0
+
+    def test_failure_removes_partial_file(self, tmp_path):
+        """Testa que uma falha no meio do download não deixa arquivo parcial"""
+        page = FakePage(os.urandom(10_000), fail_at=4096)
+        downloader = MediaDownloader(page, str(tmp_path), chunk_size=4096)
+        message = _message()
+
+        with pytest.raises(MediaDownloadError):
+            downloader.submit(message).result(timeout=10)
+        downloader.close()
+
+        assert os.listdir(str(tmp_path)) == []
+        assert message.media is None
+        assert page.released == [MESSAGE_ID]
+
+    def test_caption(self):
+        """Testa que o marcador do tipo não vira legenda"""
+        assert caption_of(_message()) is None
+        assert caption_of(_message(content="olha isso")) == "olha isso"
+
+
+class TestClientDownloads:
+    """Testes para o download automático no cliente"""
+
+    def test_media_messages_are_downloaded(self, tmp_path):
+        """Testa que mensagens com mídia são baixadas sem bloquear a recepção"""
+        client = WhatsAppClient(
+            config=Config(download_media=True, media_dir=str(tmp_path))
+        )
+        client.driver = Mock()
+        client.driver.execute_async_script.return_value = {
+            "m": [
+                [
+                    "false_5511999999999@c.us_3EB0AA",
+                    "5511999999999@c.us",
+                    "5511999999999@c.us",
+                    "image",
+                    "",
+                    1700000000000,
+                    None,
+                    None,
+                    "blob:https://web.whatsapp.com/x",
+                ],
+                [
+                    "false_5511999999999@c.us_3EB0BB",
+                    "5511999999999@c.us",
+                    "5511999999999@c.us",
+                    "text",
+                    "oi",
+                    1700000000000,
+                    None,
+                    None,
+                    None,
+                ],
+            ],
+            "c": [],
+        }
+        client.download_media = Mock()
+
+        image, text = client._get_new_messages()
+
+        assert image.metadata["media_url"] == "blob:https://web.whatsapp.com/x"
+        client.download_media.assert_called_once_with(image)
@@ -0,0 +1,72 @@
+"""
+Testes para a resolução do chromedriver
+"""
+
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+
+from pywhatsweb import Config, driver
+from pywhatsweb.driver import DriverCache, resolve_driver
+from pywhatsweb.exceptions import ConnectionError
+
+
+def _fake_driver(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+class TestDriverResolution:
+    """Testes para resolve_driver e DriverCache"""
+
+    def _config(self, tmp_path, **kwargs):
+        return Config(
+            user_data_dir=str(tmp_path / "data"),
+            driver_cache_path=str(tmp_path / "cache.json"),
+            **kwargs,
+        )
+
+    def test_explicit_path(self, tmp_path):
+        """Testa que o caminho do Config é usado sem detectar versão"""
+        path = _fake_driver(tmp_path / "chromedriver")
+        with patch.object(driver, "chrome_version") as version:
+            resolution = resolve_driver(self._config(tmp_path, chromedriver_path=path))
+
+        assert (resolution.path, resolution.source) == (path, driver.SOURCE_CONFIG)
+        version.assert_not_called()
+
+    def test_explicit_path_missing(self, tmp_path):
+        """Testa erro para caminho explícito inexistente"""
+        config = self._config(tmp_path, chromedriver_path=str(tmp_path / "nada"))
+        with pytest.raises(ConnectionError):
+            resolve_driver(config)
+
+    def test_download_once_then_cache(self, tmp_path):
+        """Testa que o webdriver-manager só é usado na falta de cache"""
+        path = _fake_driver(tmp_path / "chromedriver")
+        config = self._config(tmp_path)
+
+        with patch.object(
+            driver, "chrome_version", return_value="120.0.6099.109"
+        ), patch.object(driver, "_download_driver", return_value=path) as download:
+            first = resolve_driver(config)
+            second = resolve_driver(config)
+
+        assert first.source == driver.SOURCE_DOWNLOAD
+        assert (second.path, second.source) == (path, driver.SOURCE_CACHE)
+        download.assert_called_once()
+
+    def test_cache_validation(self, tmp_path):
+        """Testa que entradas inválidas são ignoradas e a versão principal é aceita"""
+        path = _fake_driver(tmp_path / "chromedriver")
+        cache = DriverCache(str(tmp_path / "cache.json"))
+        cache.put("120.0.6099.109", path)
+
+        assert cache.get("120.0.6099.200") == path
+        assert cache.get("121.0.6167.85") is None
+
+        os.remove(path)
+        assert cache.get("120.0.6099.109") is None
@@ -0,0 +1,71 @@
+"""
+Testes para a conversão dos dados extraídos da página
+"""
+
+from datetime import datetime
+
+from pywhatsweb.extraction import parse_payload, parse_timestamp
+
+
+class TestExtraction:
+    """Testes para pywhatsweb.extraction"""
+
+    def test_parse_timestamp_formats(self):
+        """Testa formatos de data de data-pre-plain-text"""
+        assert parse_timestamp("[10:15, 18/10/2026] A: ", None) == datetime(
+            2026, 10, 18, 10, 15
+        )
+        assert parse_timestamp("[3:05 PM, 10/18/2026] A: ", None) == datetime(
+            2026, 10, 18, 15, 5
+        )
+        assert parse_timestamp("[10:15, 03/04/2026] A: ", None) == datetime(
+            2026, 4, 3, 10, 15
+        )
+        assert parse_timestamp(
+            "[10:15, 03/04/2026] A: ", None, day_first=False
+        ) == datetime(2026, 3, 4, 10, 15)
+        assert parse_timestamp(None, 0) is not None
+        assert parse_timestamp("lixo", 1700000000000) == datetime.fromtimestamp(
+            1700000000
+        )
+
+    def test_contacts_are_shared_within_payload(self):
+        """Testa que o mesmo JID gera um único Contact por payload"""
+        record = [
+            "false_5511999999999@c.us_{}",
+            "5511999999999@c.us",
+            "5511999999999@c.us",
+            "text",
+            "oi",
+            1700000000000,
+            None,
+            None,
+        ]
+        messages, chats = parse_payload(
+            {
+                "m": [[record[0].format(i)] + record[1:] for i in range(3)],
+                "c": [["5511999999999@c.us", "Fulano", 0, None]],
+            }
+        )
+
+        assert len(messages) == 3
+        assert messages[0].sender is messages[2].sender
+        assert chats[0].contact is messages[0].sender
+
+    def test_parse_payload_date_order(self):
+        """Testa que a ordem das datas do Config chega às mensagens"""
+        record = [
+            "false_5511999999999@c.us_1",
+            "5511999999999@c.us",
+            "5511999999999@c.us",
+            "text",
+            "oi",
+            1700000000000,
+            None,
+            "[10:15, 03/04/2026] Fulano: ",
+        ]
+        day_first, _ = parse_payload({"m": [record]})
+        month_first, _ = parse_payload({"m": [record]}, day_first=False)
+
+        assert day_first[0].timestamp == datetime(2026, 4, 3, 10, 15)
+        assert month_first[0].timestamp == datetime(2026, 3, 4, 10, 15)
@@ -0,0 +1,59 @@
+"""
+Testes de tempo de importação (dependências pesadas carregadas sob demanda)
+"""
+
+import subprocess
+import sys
+
+
+def _loaded_modules(code):
+    """Executa o código em um interpretador limpo e retorna sys.modules"""
+    output = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports:
+    """Testes para a importação preguiçosa do pacote"""
+
+    def test_models_do_not_load_selenium(self):
+        """Testa que modelos, config e exceções não carregam Selenium"""
+        modules = _loaded_modules(
+            "import pywhatsweb\n"
+            "from pywhatsweb import Config, Contact, WhatsAppError, __version__\n"
+            "from pywhatsweb.models import Message"
+        )
+
+        for heavy in (
+            "selenium",
+            "webdriver_manager",
+            "qrcode",
+            "PIL",
+            "pywhatsweb.client",
+        ):
+            assert heavy not in modules
+
+    def test_client_does_not_load_qrcode(self):
+        """Testa que a renderização do QR Code só é carregada quando usada"""
+        modules = _loaded_modules("from pywhatsweb import WhatsAppClient")
+
+        assert "pywhatsweb.client" in modules
+        assert "qrcode" not in modules and "PIL" not in modules
+
+    def test_cli_help_does_not_load_selenium(self):
+        """Testa que --help não carrega o cliente"""
+        modules = _loaded_modules(
+            "import sys\n"
+            "sys.argv = ['pywhatsweb', '--help']\n"
+            "from pywhatsweb import cli\n"
+            "try:\n"
+            "    cli.main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+
+        assert "selenium" not in modules
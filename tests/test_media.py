@@ -0,0 +1,106 @@
+"""
+Testes para a preparação de mídias
+"""
+
+import os
+
+from PIL import Image
+
+from pywhatsweb.media import MediaPipeline
+from pywhatsweb.models import MediaMessage
+
+
+def _image(path, size=(3000, 2000), mode="RGB"):
+    Image.new(mode, size, (200, 30, 30)).save(path)
+    return str(path)
+
+
+class TestMediaPipeline:
+    """Testes para a classe MediaPipeline"""
+
+    def test_downscales_and_reuses_cache(self, tmp_path):
+        """Testa a redução da imagem e o reaproveitamento pelo hash do conteúdo"""
+        source = _image(tmp_path / "foto.png")
+        copy = _image(tmp_path / "copia.png")
+        pipeline = MediaPipeline(str(tmp_path / "cache"), max_dimension=800, workers=1)
+        try:
+            first = pipeline.prepare(source, "legenda").result(timeout=60)
+            second = pipeline.prepare(MediaMessage.from_file(copy)).result(timeout=60)
+        finally:
+            pipeline.close()
+
+        assert first.file_path.endswith(".jpg")
+        assert first.mime_type == "image/jpeg"
+        assert first.caption == "legenda"
+        with Image.open(first.file_path) as image:
+            assert max(image.size) == 800
+
+        # Mesmo conteúdo em outro arquivo: processado uma única vez
+        assert second.file_path == first.file_path
+        assert second.caption is None
+        assert pipeline.processed == 1
+        assert pipeline.hits == 1
+
+    def test_keeps_alpha_as_png(self, tmp_path):
+        """Testa que imagens com transparência continuam PNG"""
+        source = _image(tmp_path / "logo.png", size=(2000, 2000), mode="RGBA")
+        pipeline = MediaPipeline(str(tmp_path / "cache"), max_dimension=500, workers=1)
+        try:
+            media = pipeline.prepare(source).result(timeout=60)
+        finally:
+            pipeline.close()
+
+        assert media.file_path.endswith(".png")
+        with Image.open(media.file_path) as image:
+            assert image.mode == "RGBA"
+            assert image.size == (500, 500)
+
+    def test_non_images_pass_through(self, tmp_path):
+        """Testa que documentos seguem sem alteração e sem subir o pool"""
+        document = tmp_path / "contrato.pdf"
+        document.write_bytes(b"%PDF-1.4 conteudo")
+        pipeline = MediaPipeline(str(tmp_path / "cache"))
+
+        media = pipeline.prepare(str(document), "segue").result()
+
+        assert media.file_path == str(document)
+        assert media.mime_type == "application/pdf"
+        assert media.file_size == os.path.getsize(document)
+        assert pipeline._executor is None
+
+    def test_invalid_image_falls_back_to_original(self, tmp_path):
+        """Testa que falhas no processamento enviam o arquivo original"""
+        broken = tmp_path / "quebrada.jpg"
+        broken.write_bytes(b"nao e uma imagem")
+        pipeline = MediaPipeline(str(tmp_path / "cache"), workers=1)
+        try:
+            media = pipeline.prepare(str(broken)).result(timeout=60)
+        finally:
+            pipeline.close()
+
+        assert media.file_path == str(broken)
+
+    def test_default_runs_in_thread(self, tmp_path):
+        """Testa que, sem pool, a imagem é preparada na thread chamadora"""
+        source = _image(tmp_path / "foto.png")
+        pipeline = MediaPipeline(str(tmp_path / "cache"), max_dimension=800)
+
+        future = pipeline.prepare(source)
+        again = pipeline.prepare(source)
+
+        assert future.done()
+        assert pipeline._executor is None
+        assert again.result().file_path == future.result().file_path
+        assert pipeline.processed == 1
+        assert pipeline.hits == 1
+
+    def test_hash_cache_is_bounded(self, tmp_path):
+        """Testa que o cache de hashes descarta os arquivos menos recentes"""
+        paths = [_image(tmp_path / f"foto{i}.png", size=(10, 10)) for i in range(3)]
+        pipeline = MediaPipeline(str(tmp_path / "cache"), hash_cache_size=2)
+
+        for path in paths:
+            pipeline.prepare(path).result()
+
+        cached = [key[0] for key in pipeline._hashes]
+        assert cached == [os.path.abspath(path) for path in paths[1:]]
@@ -0,0 +1,102 @@
+"""
+Testes para as métricas do cliente
+"""
+
+import urllib.request
+from unittest.mock import Mock
+
+import pytest
+
+from pywhatsweb import Config, WhatsAppClient
+from pywhatsweb.exceptions import MessageError
+from pywhatsweb.metrics import Metrics, MetricsServer, NullMetrics
+
+
+class TestMetrics:
+    """Testes para a classe Metrics"""
+
+    def test_histogram_and_errors(self):
+        """Testa buckets acumulados e contagem de erros por classe"""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe("send_message", 0.05)
+        metrics.observe("send_message", 0.5)
+        metrics.observe("send_message", 5.0)
+        with pytest.raises(MessageError):
+            with metrics.time("send_media"):
+                raise MessageError("falhou")
+
+        snapshot = metrics.snapshot()
+        send = snapshot["operations"]["send_message"]
+        assert send["count"] == 3
+        assert list(send["buckets"].values()) == [1, 2, 3]
+        assert snapshot["operations"]["send_media"]["count"] == 1
+        assert snapshot["errors"]["MessageError"] == 1
+        assert snapshot["errors"]["ConnectionError"] == 0
+
+    def test_prometheus_text(self):
+        """Testa o formato texto do Prometheus"""
+        metrics = Metrics(buckets=(0.1,))
+        metrics.observe("connect", 0.05)
+        metrics.inc("messages_sent_total", 2)
+
+        text = metrics.render()
+
+        assert "# TYPE pywhatsweb_operation_seconds histogram" in text
+        assert (
+            'pywhatsweb_operation_seconds_bucket{operation="connect",le="0.1"} 1'
+            in text
+        )
+        assert (
+            'pywhatsweb_operation_seconds_bucket{operation="connect",le="+Inf"} 1'
+            in text
+        )
+        assert 'pywhatsweb_operation_seconds_count{operation="connect"} 1' in text
+        assert 'pywhatsweb_errors_total{exception="TimeoutError"} 0' in text
+        assert "pywhatsweb_messages_sent_total 2" in text
+
+    def test_http_endpoint(self):
+        """Testa o endpoint HTTP local"""
+        metrics = Metrics()
+        metrics.observe("receive_poll", 0.2)
+        server = MetricsServer(metrics, port=0).start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.close()
+
+        assert 'operation="receive_poll"' in body
+
+
+class TestClientMetrics:
+    """Testes para a instrumentação do cliente"""
+
+    def _client(self, **kwargs):
+        client = WhatsAppClient(config=Config(**kwargs))
+        client.is_connected = True
+        client.driver = Mock()
+        client._load_chat = Mock()
+        client._send_text_in_chat = Mock()
+        return client
+
+    def test_records_operations_and_errors(self):
+        """Testa que envios e falhas aparecem no snapshot"""
+        client = self._client(metrics_enabled=True)
+        client.send_message("5511999999999", "oi")
+        client._send_text_in_chat.side_effect = Exception("falhou")
+        with pytest.raises(MessageError):
+            client.send_message("5511999999999", "oi")
+
+        snapshot = client.metrics()
+        assert snapshot["operations"]["send_message"]["count"] == 2
+        assert snapshot["operations"]["open_chat"]["count"] == 2
+        assert snapshot["errors"]["MessageError"] == 1
+        assert snapshot["counters"]["messages_sent_total"] == 1
+
+    def test_disabled_by_default(self):
+        """Testa que, desativadas, as métricas não registram nada"""
+        client = self._client()
+        client.send_message("5511999999999", "oi")
+
+        assert isinstance(client._metrics, NullMetrics)
+        assert client.metrics() == {"operations": {}, "counters": {}, "errors": {}}
@@ -0,0 +1,88 @@
+"""
+Testes para o outbox persistente
+"""
+
+import sqlite3
+import time
+from unittest.mock import Mock
+
+from pywhatsweb.outbox import Outbox, OutboxState
+
+
+class TestOutbox:
+    """Testes para a classe Outbox"""
+
+    def test_idempotency_key(self, tmp_path):
+        """Testa que chaves repetidas são ignoradas"""
+        with Outbox(str(tmp_path / "outbox.db")) as outbox:
+            outbox.add("5511999999999", "oi", key="pedido-1")
+            outbox.add("5511999999999", "oi de novo", key="pedido-1")
+
+            entries = outbox.claim()
+            assert [(e.key, e.content) for e in entries] == [("pedido-1", "oi")]
+
+    def test_process_records_states(self, tmp_path):
+        """Testa transições de estado ao processar pelo cliente"""
+        client = Mock()
+        client.send_message.side_effect = [True, Exception("falhou")]
+
+        with Outbox(str(tmp_path / "outbox.db")) as outbox:
+            outbox.add("5511999999999", "um", key="a")
+            outbox.add("5511999999999", "dois", key="b")
+
+            assert outbox.process(client) == {"sent": 1, "failed": 1}
+            assert outbox.get("a").state == OutboxState.SENT
+            assert outbox.get("b").state == OutboxState.FAILED
+            assert outbox.get("b").error == "falhou"
+
+            assert outbox.retry_failed() == 1
+            assert outbox.stats()["pending"] == 1
+
+    def test_recovery_after_crash(self, tmp_path):
+        """Testa que envios interrompidos voltam e enviados são ignorados"""
+        path = str(tmp_path / "outbox.db")
+        outbox = Outbox(path)
+        outbox.add_many(
+            [
+                ("5511999999999", "um", "a"),
+                ("5511999999999", "dois", "b"),
+            ]
+        )
+        entries = outbox.claim()
+        outbox.mark_sent(entries[0].key)
+        outbox.flush()
+        # Simula queda: conexão abandonada sem close()
+
+        reopened = Outbox(path)
+        reopened.add("5511999999999", "um", key="a")
+        pending = reopened.claim()
+
+        assert [e.key for e in pending] == ["b"]
+        assert pending[0].attempts == 2
+        reopened.close()
+
+    def test_writes_without_further_calls(self, tmp_path):
+        """Testa que add() grava na hora e as confirmações saem pelo timer"""
+        path = str(tmp_path / "outbox.db")
+        outbox = Outbox(path, flush_interval=0.05)
+        key = outbox.add("5511999999999", "oi")
+
+        def state():
+            conn = sqlite3.connect(path)
+            try:
+                row = conn.execute(
+                    "SELECT state FROM outbox WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else None
+
+        assert state() == "pending"
+
+        outbox.claim()
+        outbox.mark_sent(key)
+        deadline = time.monotonic() + 5
+        while state() != "sent" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert state() == "sent"
+        outbox.close()
@@ -0,0 +1,63 @@
+"""
+Testes para a normalização de telefones
+"""
+
+import pytest
+
+from pywhatsweb import phones
+from pywhatsweb.exceptions import InvalidPhoneError
+from pywhatsweb.models import Contact
+
+
+class TestPhones:
+    """Testes para normalize e normalize_many"""
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("5511999999999", "+5511999999999"),
+            ("11999999999", "+5511999999999"),
+            ("(11) 99999-9999", "+5511999999999"),
+            ("011 99999-9999", "+5511999999999"),
+            ("+1 (212) 555-1234", "+12125551234"),
+            ("0044 20 7946 0958", "+442079460958"),
+            ("351 912 345 678", "+351912345678"),
+        ],
+    )
+    def test_normalize(self, raw, expected):
+        """Testa a conversão para E.164 com o país padrão (BR)"""
+        assert phones.normalize(raw) == expected
+
+    def test_default_country(self):
+        """Testa números nacionais de outro país"""
+        assert phones.normalize("(212) 555-1234", country="US") == "+12125551234"
+        assert phones.to_whatsapp("912 345 678", country="pt") == "351912345678"
+        with pytest.raises(ValueError):
+            phones.normalize("912345678", country="XX")
+
+    @pytest.mark.parametrize(
+        "raw", ["", "abc", "+123", "999999999", "+1234567890123456"]
+    )
+    def test_invalid(self, raw):
+        """Testa números inválidos"""
+        with pytest.raises(InvalidPhoneError):
+            phones.normalize(raw)
+
+    def test_normalize_many_reports_errors(self):
+        """Testa que erros são reportados por linha, sem interromper"""
+        result = phones.normalize_many(
+            ["11999999999", "x", None, "+12125551234"], whatsapp=True
+        )
+
+        assert result.numbers == ["5511999999999", None, None, "12125551234"]
+        assert sorted(result.errors) == [1, 2]
+
+    def test_contact_uses_normalization(self):
+        """Testa que Contact usa a normalização e aceita IDs de grupo"""
+        assert Contact(phone="+1 212 555 1234").phone == "12125551234"
+        assert (
+            Contact(phone="120363000000000001", is_group=True).phone
+            == "120363000000000001"
+        )
+        with pytest.raises(ValueError):
+            Contact(phone="abc")
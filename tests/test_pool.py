@@ -0,0 +1,99 @@
+"""
+Testes para o pool de sessões
+"""
+
+import os
+
+import pytest
+
+from pywhatsweb import Config
+from pywhatsweb.exceptions import WorkerDied
+from pywhatsweb.pool import ClientPool, HashRing
+
+
+class FakeClient:
+    """Cliente falso usado nos processos de sessão dos testes"""
+
+    def __init__(self, config):
+        self.config = config
+        self.is_connected = False
+        self.on_qr = None
+
+    def connect(self):
+        self.is_connected = True
+
+    def send_message(self, phone, text):
+        # A sessão 0 morre ao receber "die" (simula queda do Chrome)
+        if text == "die" and self.config.user_data_dir.endswith("session_0"):
+            os._exit(1)
+        if text == "fail":
+            raise RuntimeError("falhou")
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+
+class TestHashRing:
+    """Testes para o anel de hash consistente"""
+
+    def test_routing_is_stable(self):
+        """Testa que o mesmo telefone sempre vai para a mesma sessão"""
+        ring = HashRing([0, 1, 2])
+        other = HashRing([2, 1, 0])
+        phones = [f"55119{i:08d}" for i in range(200)]
+
+        assert [ring.get(p) for p in phones] == [other.get(p) for p in phones]
+        assert set(ring.get(p) for p in phones) == {0, 1, 2}
+
+    def test_remove_only_moves_removed_keys(self):
+        """Testa que remover uma sessão só move os telefones dela"""
+        ring = HashRing([0, 1, 2])
+        phones = [f"55119{i:08d}" for i in range(200)]
+        before = {p: ring.get(p) for p in phones}
+
+        ring.remove(1)
+
+        for phone, node in before.items():
+            if node != 1:
+                assert ring.get(phone) == node
+        assert ring.nodes == [0, 2]
+
+
+class TestClientPool:
+    """Testes para a classe ClientPool"""
+
+    def test_session_config(self, tmp_path):
+        """Testa diretório de dados próprio por sessão"""
+        pool = ClientPool(2, config=Config(user_data_dir=str(tmp_path)))
+        assert pool.session_config(1).user_data_dir == os.path.join(
+            str(tmp_path), "session_1"
+        )
+
+    def test_sends_and_rebalances(self, tmp_path):
+        """Testa envio, erros por item e a queda de uma sessão"""
+        config = Config(user_data_dir=str(tmp_path))
+        with ClientPool(2, config=config, client_factory=FakeClient) as pool:
+            phones = [f"55119{i:08d}" for i in range(20)]
+            futures = [pool.send_message(phone, "oi") for phone in phones]
+            assert all(f.result(timeout=30) for f in futures)
+
+            failed = pool.send_message(phones[0], "fail")
+            with pytest.raises(Exception):
+                failed.result(timeout=30)
+
+            victim = next(p for p in phones if pool._ring.get(p) == 0)
+            died, queued = [
+                pool.send_message(victim, text) for text in ["die", "depois"]
+            ]
+            # Em andamento: entrega incerta, não é reenviada
+            with pytest.raises(WorkerDied):
+                died.result(timeout=30)
+            # Ainda na fila da sessão: vai para outra sessão
+            assert queued.result(timeout=30) is True
+
+            stats = pool.stats()
+            assert stats["workers"] == 1
+            assert stats["sent"] == 21
+            assert stats["failed"] == 2
+            assert stats["queue_depth"] == 0
@@ -0,0 +1,56 @@
+"""
+Testes para a renderização e o acompanhamento do QR Code
+"""
+
+import io
+from unittest.mock import Mock
+
+import pytest
+
+from pywhatsweb.qr import QRRenderer, QRWatcher, render_terminal
+
+
+class TestQR:
+    """Testes para QRRenderer e QRWatcher"""
+
+    def test_png_in_memory(self):
+        """Testa a saída PNG em memória"""
+        output = QRRenderer("png").render("2@abc")
+        assert output.startswith(b"\x89PNG")
+
+    def test_terminal(self):
+        """Testa a saída em blocos Unicode"""
+        stream = io.StringIO()
+        text = QRRenderer("terminal", stream=stream).render("2@abc")
+
+        assert stream.getvalue() == text + "\n"
+        assert set(text) <= set(" ▀▄█\n")
+        assert text == render_terminal("2@abc")
+
+    def test_file_per_session(self, tmp_path):
+        """Testa a gravação no caminho da sessão"""
+        path = tmp_path / "sessao" / "qr.png"
+        assert QRRenderer("file", str(path)).render("2@abc") == str(path)
+        assert path.read_bytes().startswith(b"\x89PNG")
+
+    def test_invalid_mode(self):
+        """Testa erro para modo desconhecido"""
+        with pytest.raises(ValueError):
+            QRRenderer("gif")
+
+    def test_watcher_renders_only_on_change(self):
+        """Testa que o QR Code só é renderizado quando o data-ref muda"""
+        renderer = Mock(**{"render.side_effect": lambda ref: f"img:{ref}"})
+        changes = []
+        watcher = QRWatcher(
+            renderer, on_change=lambda ref, output: changes.append(output)
+        )
+
+        assert watcher.update("2@a") is True
+        assert watcher.update("2@a") is False
+        assert watcher.update(None) is False
+        assert watcher.update("2@b") is True
+
+        assert changes == ["img:2@a", "img:2@b"]
+        assert renderer.render.call_count == 2
+        assert (watcher.rotations, watcher.skipped) == (2, 2)
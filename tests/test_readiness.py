@@ -0,0 +1,96 @@
+"""
+Testes para a camada de prontidão
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from pywhatsweb import readiness
+from pywhatsweb.readiness import ReadinessWaiter
+
+
+class TestReadiness:
+    """Testes para condições e ReadinessWaiter"""
+
+    def test_element_ready_skips_disabled(self):
+        """Testa que elementos desabilitados não satisfazem a condição"""
+        disabled = Mock(
+            **{"is_displayed.return_value": True, "is_enabled.return_value": False}
+        )
+        enabled = Mock(
+            **{"is_displayed.return_value": True, "is_enabled.return_value": True}
+        )
+        driver = Mock(**{"find_elements.return_value": [disabled, enabled]})
+
+        assert readiness.element_ready("x")(driver) is enabled
+
+        driver.find_elements.return_value = [disabled]
+        assert readiness.element_ready("x")(driver) is False
+
+    def test_until_records_timing(self):
+        """Testa que o tempo da espera é registrado"""
+        driver = Mock(**{"execute_script.return_value": "2@abc"})
+        waiter = ReadinessWaiter(driver, poll_interval=0.01)
+
+        assert waiter.until(readiness.qr_data_ref(), "qr_code", 1) == "2@abc"
+        assert "qr_code" in waiter.timings
+
+    def test_until_timeout(self):
+        """Testa que o prazo da operação é respeitado"""
+        driver = Mock(**{"find_elements.return_value": []})
+        waiter = ReadinessWaiter(driver, poll_interval=0.01)
+
+        with pytest.raises(TimeoutException):
+            waiter.until(readiness.compose_box_ready, "compose_box", 0.05)
+        assert waiter.timings["compose_box"] < 1
+
+    def test_session_state(self):
+        """Testa a detecção de sessão autenticada x QR Code"""
+        driver = Mock(**{"execute_script.return_value": None})
+        assert readiness.session_state(driver) is False
+
+        driver.execute_script.return_value = readiness.SESSION_QR
+        assert readiness.session_state(driver) == readiness.SESSION_QR
+
+    def test_chat_open_matches_whole_number(self):
+        """Testa que o chat aberto não é confundido com número de mesmo final"""
+        compose = Mock(
+            **{"is_displayed.return_value": True, "is_enabled.return_value": True}
+        )
+        data_id = "true_155511999999999@c.us_3EB0"
+
+        def find_elements(by, selector):
+            if selector.startswith("#main [data-id"):
+                prefixes = [
+                    part.split("^='", 1)[1].rstrip("']")
+                    for part in selector.split(", ")
+                ]
+                return [Mock()] if data_id.startswith(tuple(prefixes)) else []
+            return [compose]
+
+        driver = Mock(**{"find_elements.side_effect": find_elements})
+
+        assert readiness.chat_open("5511999999999")(driver) is False
+        # Grupo aberto com mensagem do número (participante no fim do ID)
+        data_id = "false_120363012345678901@g.us_3EB0_5511999999999@c.us"
+        assert readiness.chat_open("5511999999999")(driver) is False
+        data_id = "false_5511999999999@c.us_3EB0"
+        assert readiness.chat_open("5511999999999")(driver) is compose
+        data_id = "true_5511999999999@c.us_3EB1"
+        assert readiness.chat_open("5511999999999")(driver) is compose
+
+    def test_upload_waits_for_new_bubble(self):
+        """Testa que o upload só conta a partir da bolha da nova mídia"""
+        driver = Mock(**{"execute_script.return_value": ["true_x@c.us_T1", True]})
+        assert readiness.last_outgoing(driver) == "true_x@c.us_T1"
+        assert readiness.outgoing_after("true_x@c.us_T1")(driver) is False
+
+        driver.execute_script.return_value = ["true_x@c.us_M1", True]
+        assert readiness.outgoing_after("true_x@c.us_T1")(driver) == "true_x@c.us_M1"
+
+        complete = readiness.upload_complete("true_x@c.us_M1")
+        for pending, expected in [(True, False), (None, False), (False, True)]:
+            driver.execute_script.return_value = pending
+            assert complete(driver) is expected
@@ -0,0 +1,146 @@
+"""
+Testes para o agendador de envios
+"""
+
+import threading
+import time
+
+import pytest
+
+from pywhatsweb.scheduler import OutboundScheduler, Priority, TokenBucket
+
+
+class FakeClock:
+    """Relógio controlado manualmente"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingClient:
+    """Cliente falso que registra os envios"""
+
+    def __init__(self):
+        self.sent = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def send_message(self, phone, text):
+        self.started.set()
+        self.release.wait()
+        if text == "fail":
+            raise RuntimeError("falhou")
+        self.sent.append((phone, text))
+        return True
+
+
+class TestTokenBucket:
+    """Testes para o token bucket"""
+
+    def test_consume_and_refill(self):
+        """Testa consumo até o limite e reposição pelo tempo"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+        assert bucket.try_consume()
+        assert bucket.try_consume()
+        assert not bucket.try_consume()
+        assert bucket.wait_time() == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.try_consume()
+
+
+class TestOutboundScheduler:
+    """Testes para a classe OutboundScheduler"""
+
+    def test_priority_order(self):
+        """Testa que mensagens transacionais saem antes das de marketing"""
+        client = RecordingClient()
+        client.release.clear()
+        scheduler = OutboundScheduler(
+            client,
+            rate=1000,
+            burst=1000,
+            recipient_rate=1000,
+            recipient_burst=1000,
+            jitter=0,
+        )
+        scheduler.start()
+
+        first = scheduler.enqueue("5511000000000", "primeira", Priority.MARKETING)
+        assert client.started.wait(timeout=5)
+        scheduler.enqueue("5511111111111", "promo", Priority.MARKETING)
+        scheduler.enqueue("5511222222222", "codigo", Priority.TRANSACTIONAL)
+        client.release.set()
+        scheduler.stop(timeout=5)
+
+        assert first.result(timeout=5) is True
+        assert [text for _phone, text in client.sent][1:] == ["codigo", "promo"]
+
+    def test_recipient_limit_does_not_block_others(self):
+        """Testa que um destinatário limitado não trava a fila"""
+        client = RecordingClient()
+        scheduler = OutboundScheduler(
+            client,
+            rate=1000,
+            burst=1000,
+            recipient_rate=0.01,
+            recipient_burst=1,
+            jitter=0,
+        )
+        scheduler.start()
+
+        blocked = [scheduler.enqueue("5511000000000", f"m{i}") for i in range(2)]
+        others = [scheduler.enqueue(f"55119{i:08d}", "oi") for i in range(5)]
+        for future in [blocked[0]] + others:
+            assert future.result(timeout=5) is True
+
+        assert not blocked[1].done()
+        assert scheduler.stats()["queue_depth"] == 1
+        scheduler.stop(drain=False)
+        assert blocked[1].cancelled()
+
+    def test_stop_timeout_bounds_drain(self):
+        """Testa que o prazo de stop() vale também para esvaziar a fila"""
+        client = RecordingClient()
+        scheduler = OutboundScheduler(
+            client,
+            rate=1000,
+            burst=1000,
+            recipient_rate=0.01,
+            recipient_burst=1,
+            jitter=0,
+        )
+        scheduler.start()
+
+        futures = [scheduler.enqueue("5511000000000", f"m{i}") for i in range(2)]
+        assert futures[0].result(timeout=5) is True
+
+        start = time.monotonic()
+        scheduler.stop(timeout=0.3)
+        assert time.monotonic() - start < 2
+        assert futures[1].cancelled()
+
+    def test_failures_resolve_future(self):
+        """Testa que falhas são entregues pelo Future"""
+        client = RecordingClient()
+        scheduler = OutboundScheduler(
+            client,
+            rate=1000,
+            burst=1000,
+            recipient_rate=1000,
+            recipient_burst=1000,
+            jitter=0,
+        )
+        scheduler.start()
+
+        future = scheduler.enqueue("5511000000000", "fail")
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+        scheduler.stop()
+        assert scheduler.stats()["failed"] == 1
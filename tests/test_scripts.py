@@ -0,0 +1,271 @@
+"""
+Testes para os scripts injetados na página (executados no Node.js)
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from pywhatsweb import readiness, scripts
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="Node.js não disponível"
+)
+
+# DOM mínimo: elementos, seletores CSS simples e um MutationObserver síncrono
+DOM = r"""
+var Node = {DOCUMENT_POSITION_PRECEDING: 2, DOCUMENT_POSITION_FOLLOWING: 4};
+var pending = [], observers = [];
+
+function Element(tag, attrs, text) {
+    this.nodeType = 1;
+    this.tagName = tag;
+    this.attrs = attrs || {};
+    this.text = text || '';
+    this.children = [];
+    this.parentNode = null;
+}
+Element.prototype.getAttribute = function (name) {
+    return name in this.attrs ? this.attrs[name] : null;
+};
+Element.prototype.hasAttribute = function (name) { return name in this.attrs; };
+Object.defineProperty(Element.prototype, 'innerText', {get: function () {
+    return this.text + this.children.map(function (c) { return c.innerText; }).join('');
+}});
+Object.defineProperty(Element.prototype, 'parentElement', {get: function () {
+    return this.parentNode && this.parentNode.nodeType === 1 ? this.parentNode : null;
+}});
+Object.defineProperty(Element.prototype, 'isConnected', {get: function () {
+    var node = this;
+    while (node.parentNode) { node = node.parentNode; }
+    return node === document.root;
+}});
+Element.prototype.insertBefore = function (child, ref) {
+    if (child.parentNode) { child.parentNode.removeChild(child); }
+    var index = ref ? this.children.indexOf(ref) : this.children.length;
+    this.children.splice(index, 0, child);
+    child.parentNode = this;
+    pending.push({target: this, addedNodes: [child]});
+    return child;
+};
+Element.prototype.appendChild = function (child) {
+    return this.insertBefore(child, null);
+};
+Element.prototype.removeChild = function (child) {
+    this.children.splice(this.children.indexOf(child), 1);
+    child.parentNode = null;
+    pending.push({target: this, addedNodes: []});
+    return child;
+};
+function descendants(root) {
+    var out = [];
+    (function walk(node) {
+        node.children.forEach(function (c) { out.push(c); walk(c); });
+    })(root);
+    return out;
+}
+Element.prototype.querySelectorAll = function (selector) {
+    return descendants(this).filter(function (e) { return matches(e, selector); });
+};
+Element.prototype.querySelector = function (selector) {
+    return this.querySelectorAll(selector)[0] || null;
+};
+Element.prototype.closest = function (selector) {
+    for (var node = this; node; node = node.parentNode) {
+        if (matches(node, selector)) { return node; }
+    }
+    return null;
+};
+Element.prototype.compareDocumentPosition = function (other) {
+    var order = descendants(document.root);
+    return order.indexOf(other) > order.indexOf(this)
+        ? Node.DOCUMENT_POSITION_FOLLOWING : Node.DOCUMENT_POSITION_PRECEDING;
+};
+
+function matchCompound(el, compound) {
+    var m, re = new RegExp(
+        /^([a-z][\w-]*)|#([\w-]+)|\.([\w-]+)|/.source
+        + /\[([\w-]+)(?:([\^*$]?=)(["'])(.*?)\6)?\]/.source, 'g'
+    );
+    while ((m = re.exec(compound))) {
+        if (m[1] && el.tagName !== m[1]) { return false; }
+        if (m[2] && el.getAttribute('id') !== m[2]) { return false; }
+        var classes = (el.getAttribute('class') || '').split(' ');
+        if (m[3] && classes.indexOf(m[3]) < 0) { return false; }
+        if (m[4]) {
+            var value = el.getAttribute(m[4]);
+            if (value === null) { return false; }
+            if (m[5] === '=' && value !== m[7]) { return false; }
+            if (m[5] === '^=' && value.indexOf(m[7]) !== 0) { return false; }
+            if (m[5] === '*=' && value.indexOf(m[7]) < 0) { return false; }
+        }
+    }
+    return true;
+}
+function matches(el, selectors) {
+    return selectors.split(',').some(function (selector) {
+        var parts = selector.trim().split(/\s+/);
+        if (!matchCompound(el, parts.pop())) { return false; }
+        for (var node = el.parentNode; node && parts.length; node = node.parentNode) {
+            if (matchCompound(node, parts[parts.length - 1])) { parts.pop(); }
+        }
+        return !parts.length;
+    });
+}
+
+function MutationObserver(callback) { this.callback = callback; }
+MutationObserver.prototype.observe = function () { observers.push(this); };
+function flush() {
+    var mutations = pending;
+    pending = [];
+    observers.forEach(function (o) { o.callback(mutations); });
+}
+
+var window = globalThis;
+var document = {root: new Element('html')};
+document.body = document.root.appendChild(new Element('body'));
+document.getElementById = function (id) {
+    return document.root.querySelector('#' + id);
+};
+document.querySelectorAll = function (selector) {
+    return document.root.querySelectorAll(selector);
+};
+
+function bubble(id, text) {
+    var node = new Element('div', {'data-id': id});
+    node.appendChild(new Element('span', {'class': 'selectable-text'}, text));
+    return node;
+}
+function chat(jid, keys) {
+    var main = new Element('div', {id: 'main'});
+    var list = main.appendChild(new Element('div'));
+    keys.forEach(function (key) {
+        list.appendChild(bubble('false_' + jid + '_' + key, key));
+    });
+    return main;
+}
+function run(script, args) {
+    return new Function(script).apply(null, args);
+}
+function received() {
+    flush();
+    var ids = window.__pywhatsweb.buffer.map(function (record) { return record[0]; });
+    window.__pywhatsweb.buffer = [];
+    return ids;
+}
+"""
+
+
+def run_node(scenario: str) -> dict:
+    """Executa o cenário no DOM mínimo (JSON na saída)"""
+    result = subprocess.run(
+        ["node"], input=DOM + scenario, capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def run_observer(scenario: str) -> dict:
+    """Instala o observer no DOM mínimo e executa o cenário"""
+    return run_node(
+        f"var installed = (function () {{ {scripts.INSTALL_MESSAGE_OBSERVER} }})();\n"
+        + scenario
+    )
+
+
+class TestMessageObserver:
+    """Testes para o observer de mensagens recebidas"""
+
+    def test_history_is_not_reported(self):
+        """Testa que trocar de chat e rolar para cima não geram mensagens"""
+        result = run_observer(r"""
+            var A = '5511111111111@c.us', B = '5522222222222@c.us';
+            var C = '5533333333333@c.us';
+            document.body.appendChild(new Element('div', {id: 'pane-side'}));
+            var main = document.body.appendChild(chat(A, ['A1', 'A2']));
+            flush();
+            var out = {};
+
+            // Mensagem nova no chat aberto
+            main.children[0].appendChild(bubble('false_' + A + '_A3', 'nova'));
+            out.new_in_a = received();
+
+            // Histórico carregado ao rolar para cima
+            var list = main.children[0];
+            list.insertBefore(bubble('false_' + A + '_A0', 'antiga'), list.children[0]);
+            out.scroll_up = received();
+
+            // Troca de chat recriando #main
+            document.body.removeChild(main);
+            main = document.body.appendChild(chat(B, ['B1', 'B2']));
+            out.switch_main = received();
+
+            main.children[0].appendChild(bubble('false_' + B + '_B3', 'nova'));
+            out.new_in_b = received();
+
+            // Troca de chat reaproveitando #main
+            main.removeChild(main.children[0]);
+            main.appendChild(chat(C, ['C1', 'C2']).children[0]);
+            out.switch_chat = received();
+
+            main.children[0].appendChild(bubble('false_' + C + '_C3', 'nova'));
+            out.new_in_c = received();
+            console.log(JSON.stringify(out));
+        """)
+
+        assert result == {
+            "new_in_a": ["false_5511111111111@c.us_A3"],
+            "scroll_up": [],
+            "switch_main": [],
+            "new_in_b": ["false_5522222222222@c.us_B3"],
+            "switch_chat": [],
+            "new_in_c": ["false_5533333333333@c.us_C3"],
+        }
+
+
+class TestUploadScripts:
+    """Testes para os scripts de acompanhamento do upload de mídia"""
+
+    def test_waits_for_own_bubble(self):
+        """Testa que só o indicador da bolha da mídia enviada é considerado"""
+        constants = (
+            f"var LAST = {json.dumps(readiness.LAST_OUTGOING_SCRIPT)};\n"
+            f"var PENDING = {json.dumps(readiness.MESSAGE_PENDING_SCRIPT)};\n"
+            f"var SELECTOR = {json.dumps(readiness.UPLOAD_PENDING)};\n"
+        )
+        result = run_node(constants + r"""
+            var X = '5511111111111@c.us';
+            var main = document.body.appendChild(new Element('div', {id: 'main'}));
+            // Texto ainda sem confirmação (relógio) antes do envio da mídia
+            var text = main.appendChild(bubble('true_' + X + '_T1', 'oi'));
+            var clock = new Element('span', {'data-icon': 'msg-time'});
+            text.appendChild(clock);
+            var out = {before: run(LAST, [SELECTOR])};
+
+            var media = main.appendChild(bubble('true_' + X + '_M1', ''));
+            var quoted = new Element('div', {'data-testid': 'quoted-message'});
+            media.appendChild(quoted);
+            quoted.appendChild(new Element('div', {'data-id': 'true_' + X + '_T1'}));
+            var upload = new Element('span', {'data-icon': 'media-cancel'});
+            media.appendChild(upload);
+            out.after = run(LAST, [SELECTOR]);
+
+            text.removeChild(clock);
+            out.uploading = run(PENDING, ['true_' + X + '_M1', SELECTOR]);
+
+            text.appendChild(clock);
+            media.removeChild(upload);
+            out.uploaded = run(PENDING, ['true_' + X + '_M1', SELECTOR]);
+            out.missing = run(PENDING, ['true_' + X + '_M2', SELECTOR]);
+            console.log(JSON.stringify(out));
+        """)
+
+        assert result == {
+            "before": ["true_5511111111111@c.us_T1", True],
+            "after": ["true_5511111111111@c.us_M1", True],
+            "uploading": True,
+            "uploaded": False,
+            "missing": None,
+        }
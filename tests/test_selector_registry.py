@@ -0,0 +1,67 @@
+"""
+Testes para o registro de seletores
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+
+from pywhatsweb.selector_registry import CHAT, PAGE, SelectorRegistry, chain
+
+
+def _driver(matches):
+    """Driver falso: ``matches`` mapeia seletor -> lista de elementos"""
+    driver = Mock()
+    driver.find_elements.side_effect = lambda by, selector: matches.get(selector, [])
+    return driver
+
+
+class TestSelectorRegistry:
+    """Testes para a classe SelectorRegistry"""
+
+    def test_fallback_chain(self):
+        """Testa que a cadeia de alternativas é tentada em ordem"""
+        element = Mock()
+        registry = SelectorRegistry(_driver({chain("send_button")[1]: [element]}))
+
+        assert registry.locate("send_button") is element
+        with pytest.raises(NoSuchElementException):
+            registry.locate("attach_button")
+
+    def test_cache_per_generation(self):
+        """Testa reaproveitamento do elemento até a troca de chat"""
+        element = Mock()
+        driver = _driver(
+            {chain("compose_box")[0]: [element], chain("chat_list")[0]: [Mock()]}
+        )
+        registry = SelectorRegistry(driver)
+
+        registry.find("compose_box")
+        registry.find("compose_box")
+        registry.find("chat_list")
+        assert driver.find_elements.call_count == 2
+
+        registry.invalidate(CHAT)
+        registry.find("compose_box")
+        registry.find("chat_list")
+        assert driver.find_elements.call_count == 3
+
+        registry.invalidate(PAGE)
+        registry.find("chat_list")
+        assert driver.find_elements.call_count == 4
+
+    def test_act_relocates_stale_element(self):
+        """Testa que elementos obsoletos são relocalizados de forma transparente"""
+        stale = Mock(**{"click.side_effect": StaleElementReferenceException("stale")})
+        fresh = Mock()
+        registry = SelectorRegistry(_driver({chain("send_button")[0]: [fresh]}))
+        registry.remember("send_button", stale)
+
+        registry.act("send_button", lambda button: button.click())
+
+        fresh.click.assert_called_once()
+        assert registry.cached("send_button") is fresh
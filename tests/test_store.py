@@ -0,0 +1,119 @@
+"""
+Testes para o armazenamento local de mensagens
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from pywhatsweb import Config, WhatsAppClient
+from pywhatsweb.models import Contact, Message
+from pywhatsweb.store import MessageStore
+
+BASE = datetime(2026, 10, 18, 10, 0)
+
+
+def _message(i, phone="5511999999999", minutes=None):
+    contact = Contact(phone=phone)
+    return Message(
+        id=f"false_{phone}@c.us_{i}",
+        content=f"msg {i}",
+        sender=contact,
+        recipient=Contact(phone="5511900000000"),
+        timestamp=BASE + timedelta(minutes=i if minutes is None else minutes),
+        metadata={"chat": f"{phone}@c.us"},
+    )
+
+
+class TestMessageStore:
+    """Testes para a classe MessageStore"""
+
+    def test_last_and_since(self, tmp_path):
+        """Testa consultas por chat e por horário"""
+        with MessageStore(str(tmp_path), ring_size=4) as store:
+            for i in range(10):
+                store.append(
+                    _message(i, phone="5511999999999" if i % 2 else "5511888888888")
+                )
+
+            assert [m.id[-1] for m in store.last("5511999999999", 3)] == ["5", "7", "9"]
+            assert [m.content for m in store.since(BASE + timedelta(minutes=7))] == [
+                "msg 7",
+                "msg 8",
+                "msg 9",
+            ]
+            since_chat = store.since(
+                BASE + timedelta(minutes=3), chat="5511888888888@c.us"
+            )
+            assert [m.content for m in since_chat] == ["msg 4", "msg 6", "msg 8"]
+
+    def test_segments_and_reopen(self, tmp_path):
+        """Testa rotação de segmentos, leitura do disco e reconstrução dos índices"""
+        with MessageStore(str(tmp_path), ring_size=2, segment_size=300) as store:
+            for i in range(12):
+                store.append(_message(i))
+
+        assert len(list(tmp_path.glob("segment-*.log"))) > 1
+
+        # Registro incompleto (queda durante a gravação) é descartado
+        last_segment = sorted(tmp_path.glob("segment-*.log"))[-1]
+        with open(last_segment, "ab") as f:
+            f.write(b'["incompleto"')
+
+        with MessageStore(str(tmp_path), ring_size=2, segment_size=300) as store:
+            assert len(store) == 12
+            first = store.get(0)
+            assert (first.id, first.sender.phone, first.timestamp) == (
+                "false_5511999999999@c.us_0",
+                "5511999999999",
+                BASE,
+            )
+            store.append(_message(12))
+            assert [m.content for m in store.last("5511999999999", 2)] == [
+                "msg 11",
+                "msg 12",
+            ]
+
+    def test_out_of_order_timestamps(self, tmp_path):
+        """Testa que 'since' não perde mensagens gravadas fora de ordem"""
+        with MessageStore(str(tmp_path)) as store:
+            for i, minutes in enumerate([0, 10, 5, 20]):
+                store.append(_message(i, minutes=minutes))
+
+            assert [m.content for m in store.since(BASE + timedelta(minutes=5))] == [
+                "msg 1",
+                "msg 2",
+                "msg 3",
+            ]
+
+    def test_client_records_inbound_and_sent(self, tmp_path):
+        """Testa que o cliente grava mensagens recebidas e enviadas"""
+        client = WhatsAppClient(config=Config(store_dir=str(tmp_path)))
+        client.driver = Mock()
+        client.driver.execute_async_script.return_value = {
+            "m": [
+                [
+                    "false_5511999999999@c.us_3EB0AA",
+                    "5511999999999@c.us",
+                    "5511999999999@c.us",
+                    "text",
+                    "oi",
+                    1700000000000,
+                    None,
+                    None,
+                ]
+            ],
+            "c": [],
+        }
+        client.is_connected = True
+        client.phone_number = "5511900000000"
+        client._open_chat = Mock()
+        client._send_text_in_chat = Mock()
+
+        client._get_new_messages()
+        client.send_message("5511999999999", "olá")
+
+        history = client.store.last("5511999999999")
+        assert [m.content for m in history] == ["oi", "olá"]
+        assert history[1].sender.phone == "5511900000000"
+        assert history[1].metadata["from_me"] is True
+        client.store.close()
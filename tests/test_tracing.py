@@ -0,0 +1,116 @@
+"""
+Testes para o rastreamento dos comandos do driver
+"""
+
+import json
+
+import pytest
+
+from pywhatsweb import Config, WhatsAppClient
+from pywhatsweb.tracing import CallbackExporter, JsonLinesExporter, Tracer
+
+
+class FakeDriver:
+    """Driver mínimo: todo comando passa por execute, como no Selenium"""
+
+    def execute(self, driver_command, params=None):
+        if driver_command == "fail":
+            raise RuntimeError("falhou")
+        return {"value": None}
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})
+
+
+class TestTracer:
+    """Testes para a classe Tracer"""
+
+    def test_groups_commands_in_spans(self):
+        """Testa que os comandos ficam no span aberto (o mais interno)"""
+        spans = []
+        tracer = Tracer([spans.append])
+        driver = FakeDriver()
+        tracer.install(driver)
+        tracer.install(driver)  # idempotente
+
+        driver.execute("get")
+        with tracer.span("send_message") as outer:
+            driver.find_element("css selector", "footer")
+            with tracer.span("open_chat") as inner:
+                driver.execute("executeScript")
+                driver.execute("clickElement")
+            with pytest.raises(RuntimeError):
+                driver.execute("fail")
+
+        assert tracer.unscoped == 1
+        assert [span.name for span in spans] == ["open_chat", "send_message"]
+        assert inner.round_trips == 2
+        assert inner.parent_id == outer.span_id and inner.trace_id == outer.trace_id
+        assert [c.name for c in outer.commands] == ["findElement", "fail"]
+        assert outer.commands[1].error == "RuntimeError"
+        assert outer.duration >= outer.driver_time
+        assert (inner.total_round_trips, outer.total_round_trips) == (2, 4)
+        assert outer.total_driver_time == pytest.approx(
+            outer.driver_time + inner.driver_time
+        )
+        assert tracer.summary()["open_chat"]["avg_round_trips"] == 2
+        assert tracer.summary()["send_message"]["avg_round_trips"] == 4
+
+        Tracer.uninstall(driver)
+        driver.execute("get")
+        assert tracer.unscoped == 1
+
+    def test_exporters(self, tmp_path):
+        """Testa a exportação em JSON lines e no formato OTLP"""
+        path = tmp_path / "trace.jsonl"
+        received = []
+        tracer = Tracer(
+            [JsonLinesExporter(str(path)), CallbackExporter(received.append, otel=True)]
+        )
+        driver = FakeDriver()
+        tracer.install(driver)
+
+        with pytest.raises(ValueError):
+            with tracer.span("connect"):
+                driver.execute("get")
+                raise ValueError("erro")
+
+        record = json.loads(path.read_text().splitlines()[0])
+        assert record["name"] == "connect"
+        assert record["round_trips"] == 1
+        assert record["error"] == "ValueError: erro"
+
+        otel = received[0]
+        assert otel["name"] == "connect"
+        assert len(otel["traceId"]) == 32 and len(otel["spanId"]) == 16
+        assert otel["events"][0]["name"] == "get"
+        assert otel["status"]["code"] == 2
+        assert int(otel["endTimeUnixNano"]) >= int(otel["startTimeUnixNano"])
+
+
+class TestClientTracing:
+    """Testes para os spans das chamadas do cliente"""
+
+    def test_send_message_span(self):
+        """Testa que send_message gera um span com os comandos executados"""
+        client = WhatsAppClient(config=Config(trace=True))
+        spans = []
+        client.tracer.add_exporter(spans.append)
+        client.driver = FakeDriver()
+        client.tracer.install(client.driver)
+        client.is_connected = True
+        client._load_chat = lambda phone: client.driver.execute("get")
+        client._send_text_in_chat = lambda text: client.driver.execute(
+            "sendKeysToElement"
+        )
+
+        client.send_message("5511999999999", "oi")
+
+        assert [span.name for span in spans] == ["open_chat", "send_message"]
+        open_chat, send_message = spans
+        assert [c.name for c in open_chat.commands][-1] == "get"
+        assert [c.name for c in send_message.commands] == ["sendKeysToElement"]
+        # O deep link (e demais comandos do open_chat) conta no send_message
+        assert send_message.total_round_trips == open_chat.total_round_trips + 1
+        summary = client.tracer.summary()["send_message"]
+        assert summary["avg_round_trips"] == send_message.total_round_trips